@@ -2,6 +2,15 @@
 ASGI config for club_management project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+
+The /events/stream/ endpoint is an async view: served through this module
+(e.g. ``uvicorn club_management.asgi:application``) an idle SSE connection
+costs a coroutine instead of a worker thread. Under WSGI the same endpoint
+answers with the current state and closes, and browsers poll it every
+``EVENT_STREAM_POLL_SECONDS``. With several worker processes
+set ``PUBSUB_BACKEND = 'clubs.pubsub.PostgresBroker'`` so events reach every
+worker. Outside DEBUG the in-process ``LocalBroker`` is refused at startup:
+events published by WSGI workers and ``run_workers`` would never reach it.
 """
 
 import os
@@ -10,4 +19,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'club_management.settings')
 
-application = get_asgi_application()
\ No newline at end of file
+application = get_asgi_application()
+
+from clubs.pubsub import ensure_shared_broker  # noqa: E402
+
+ensure_shared_broker()
\ No newline at end of file
@@ -3,6 +3,7 @@ Django settings for club_management project.
 """
 
 import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -11,6 +12,8 @@ SECRET_KEY = 'django-insecure-club-management-system-2024-university'
 
 DEBUG = True
 
+TESTING = sys.argv[1:2] == ['test']
+
 ALLOWED_HOSTS = []
 
 INSTALLED_APPS = [
@@ -26,7 +29,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'clubs.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'clubs.middleware.StaticAssetsMiddleware',
+    'clubs.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -55,6 +61,9 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'club_management.wsgi.application'
+# /events/stream/ тек ASGI арқылы (uvicorn club_management.asgi:application) тұрақты ағын береді;
+# WSGI-де ол EVENT_STREAM_POLL_SECONDS сайын қайталанатын қысқа жауапқа айналады
+ASGI_APPLICATION = 'club_management.asgi.application'
 
 DATABASES = {
     'default': {
@@ -64,9 +73,29 @@ DATABASES = {
         'PASSWORD': '1234',
         'HOST': 'localhost',
         'PORT': '5432',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Ортақ кэш: снапшоттар, фрагмент нұсқалары мен сессиялар барлық воркерлерге бірдей
+# болуы керек. Әдепкі LocMemCache әр процесске бөлек, онда бір воркердегі
+# инвалидация басқаларына жетпейді. RedisCache `redis` пакетін талап етеді.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1',
+    }
+}
+
+# Оқу репликалары: DATABASES-тегі алиастар. Бос болса, барлығы default-та. Мысалы:
+# DATABASES['replica'] = {**DATABASES['default'], 'HOST': 'replica.local', 'TEST': {'MIRROR': 'default'}}
+# DATABASE_REPLICAS = ['replica']
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['clubs.routers.ReplicaRouter']
+# Жазудан кейін сол браузердің оқулары негізгі базада қалатын уақыт (репликация кешігуінен ұзақ)
+REPLICA_PIN_SECONDS = 5
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -90,6 +119,20 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATIC_SERVE = not DEBUG
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        # Манифест тек collectstatic-тен кейін бар: DEBUG пен тесттерде қарапайым қойма
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG or TESTING
+            else 'clubs.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -102,5 +145,31 @@ LOGOUT_REDIRECT_URL = 'home'
 
 AUTH_USER_MODEL = 'users.CustomUser'
 
+# Сессия кэштен оқылады, ДҚ-ға тек жазылғанда түседі; пайдаланушы жолы да кэштеледі.
+# Ауысқанда бұрынғы ModelBackend сессиялары бір рет қайта кіруді талап етеді.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+AUTH_USER_CACHE_TIMEOUT = 15 * 60
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
-CRISPY_TEMPLATE_PACK = "bootstrap5"
\ No newline at end of file
+CRISPY_TEMPLATE_PACK = "bootstrap5"
+
+REQUEST_METRICS_ENABLED = DEBUG
+REQUEST_METRICS_DEFAULT_BUDGET = {'queries': 30, 'wall_ms': 500}
+REQUEST_METRICS_BUDGETS = {
+    'club_list': {'queries': 10, 'wall_ms': 300},
+    'club_detail': {'queries': 12, 'wall_ms': 300},
+    'dashboard': {'queries': 15, 'wall_ms': 300},
+}
+
+PUBSUB_BACKEND = 'clubs.pubsub.LocalBroker'
+EVENT_STREAM_KEEPALIVE = 15
+# Дашборд сұрауларын қатар орындайтын ағындар (әрқайсысы бір DB қосылымын ұстайды)
+DASHBOARD_QUERY_WORKERS = 4
+EVENT_STREAM_POLL_SECONDS = 30
+
+# Фондық тапсырмаларды `manage.py run_workers` орындайды (clubs/management/commands/run_workers.py);
+# JOBS_EAGER = True оларды commit-тен кейін осы процесте орындайды. Әзірлеуде жұмысшы
+# іске қосылмайды, сондықтан DEBUG кезінде eager; тесттер кезекке жазылған жолдарды тексереді
+JOBS_EAGER = DEBUG and not TESTING
+JOBS_MAX_ATTEMPTS = 5
\ No newline at end of file
@@ -14,13 +14,21 @@ urlpatterns = [
 
     path('dashboard/', user_views.dashboard, name='dashboard'),
     path('profile/', user_views.profile, name='profile'),
+    path('profile/calendar/reset/', user_views.reset_calendar_token, name='reset_calendar_token'),
 
     path('admin/', user_views.admin_dashboard, name='admin_dashboard'),
     path('admin/users/', user_views.user_management, name='user_management'),
     path('admin/users/create/', user_views.create_user, name='create_user'),
+    path('admin/users/import/', user_views.import_users, name='import_users'),
+    path('admin/users/import/<int:import_id>/', user_views.import_detail, name='import_detail'),
+    path('admin/users/export/', user_views.export_users, name='export_users'),
     path('admin/users/<int:user_id>/', user_views.user_detail, name='user_detail'),
     path('admin/users/<int:user_id>/delete/', user_views.delete_user, name='delete_user'),
     path('admin/statistics/', club_views.admin_statistics, name='admin_statistics'),
+    path('admin/metrics/', club_views.request_metrics, name='request_metrics'),
+    path('admin/jobs/', club_views.job_queue, name='job_queue'),
+    path('admin/messages/export/', club_views.export_messages, name='export_messages'),
+    path('admin/statistics/trends/', club_views.admin_statistics_trends, name='admin_statistics_trends'),
     
     path('', include('clubs.urls')),
 ]
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Club, Membership, Notification, Event
+from .models import Club, Membership, Notification, Event, Job
 
 @admin.register(Club)
 class ClubAdmin(admin.ModelAdmin):
@@ -22,6 +22,12 @@ class NotificationAdmin(admin.ModelAdmin):
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ('title', 'club', 'date', 'location')
+    list_display = ('title', 'club', 'date', 'location', 'capacity', 'attendees_count')
     list_filter = ('club', 'date')
-    search_fields = ('title', 'description')
\ No newline at end of file
+    search_fields = ('title', 'description')
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_at', 'started_at', 'finished_at', 'worker')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ClubsConfig(AppConfig):
     name = 'clubs'
+
+    def ready(self):
+        from . import signals, tasks  # noqa: F401
@@ -0,0 +1,77 @@
+import gzip
+import json
+import mimetypes
+import os
+from email.utils import formatdate
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.map', '.ico')
+MANIFEST_NAME = 'staticfiles.json'
+
+def compress_file(path):
+    """Файлдың .gz (және brotli бар болса .br) нұсқаларын жазу; тек кішірейсе ғана"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    written = []
+    variants = [('.gz', lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', lambda raw: brotli.compress(raw, quality=11)))
+    for suffix, compress in variants:
+        compressed = compress(data)
+        if len(compressed) < len(data) * 0.95:
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            written.append(path + suffix)
+    return written
+
+class StaticAsset:
+    def __init__(self, path, immutable):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.immutable = immutable
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        self.encodings = {}
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if os.path.exists(path + suffix):
+                self.encodings[encoding] = (path + suffix, os.path.getsize(path + suffix))
+
+    def etag_for(self, encoding):
+        """Күшті ETag әр денеге бөлек: сығылған нұсқаларға кодтау жұрнағы қосылады"""
+        return f'{self.etag[:-1]}-{encoding}"' if encoding else self.etag
+
+    def variant(self, accept_encoding):
+        """Клиент қабылдайтын ең кіші нұсқа: (жол, өлшем, кодтау)"""
+        for encoding in ('br', 'gzip'):
+            if encoding in self.encodings and encoding in accept_encoding:
+                path, size = self.encodings[encoding]
+                return path, size, encoding
+        return self.path, self.size, None
+
+def hashed_names(root):
+    manifest = os.path.join(root, MANIFEST_NAME)
+    if not os.path.exists(manifest):
+        return set()
+    with open(manifest, encoding='utf-8') as f:
+        return set(json.load(f).get('paths', {}).values())
+
+def scan_static_root(root):
+    """STATIC_ROOT ішіндегі файлдар индексі: URL жолы -> StaticAsset"""
+    assets = {}
+    if not root or not os.path.isdir(root):
+        return assets
+    immutable = hashed_names(root)
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(('.gz', '.br')) or filename == MANIFEST_NAME:
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            assets[name] = StaticAsset(path, name in immutable)
+    return assets
@@ -0,0 +1,106 @@
+import random
+import statistics
+import time
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, URLResolver, get_resolver, reverse
+from .metrics import percentile
+from .models import Club, Membership, Message
+from users.models import CustomUser, UserImport
+
+SKIPPED_URL_NAMES = {'logout', 'apply_membership', 'event_stream'}
+
+def url_patterns(patterns=None):
+    """Барлық атаулы URL үлгілерін (аты, параметрлер) түрінде қайтару"""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from url_patterns(pattern.url_patterns)
+        elif pattern.name and pattern.name not in SKIPPED_URL_NAMES:
+            yield pattern.name, tuple(getattr(pattern.pattern, 'converters', {}))
+
+def sample_users(role, count, rng):
+    users = CustomUser.objects.filter(role=role, is_active=True)
+    if role == 'leader':
+        users = users.filter(led_clubs__isnull=False).distinct()
+    elif role == 'member':
+        users = users.filter(club_memberships__status='approved').distinct()
+    ids = list(users.order_by('pk').values_list('pk', flat=True)[:1000])
+    return list(CustomUser.objects.filter(pk__in=rng.sample(ids, min(count, len(ids)))))
+
+def url_kwargs(user, params, rng):
+    """Пайдаланушыға сәйкес URL параметрлерін таңдау"""
+    kwargs = {}
+    if 'pk' in params:
+        club_id = (
+            Club.objects.filter(leader=user).values_list('pk', flat=True).first()
+            or Membership.objects.filter(user=user, status='approved').values_list('club_id', flat=True).first()
+            or Club.objects.order_by('-members_count').values_list('pk', flat=True).first()
+        )
+        kwargs['pk'] = club_id
+    if 'user_id' in params:
+        kwargs['user_id'] = user.pk
+    if 'message_id' in params:
+        kwargs['message_id'] = Message.objects.filter(receiver=user).values_list('pk', flat=True).first()
+    if 'import_id' in params:
+        kwargs['import_id'] = UserImport.objects.order_by('-pk').values_list('pk', flat=True).first()
+    if 'token' in params:
+        kwargs['token'] = user.calendar_token
+    # Толтыра алмайтын параметрі бар үлгілер өткізіледі
+    if set(params) - set(kwargs) or any(value is None for value in kwargs.values()):
+        return None
+    return kwargs
+
+def run_benchmark(roles, samples, iterations, seed=0, stdout=None):
+    rng = random.Random(seed)
+    results = {}
+    for role in roles:
+        users = sample_users(role, samples, rng)
+        if not users:
+            if stdout:
+                stdout.write(f'{role}: пайдаланушы табылмады, өткізілді')
+            continue
+        timings = {}
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            for name, params in url_patterns():
+                kwargs = url_kwargs(user, params, rng)
+                if kwargs is None:
+                    continue
+                try:
+                    url = reverse(name, kwargs=kwargs)
+                except NoReverseMatch:
+                    continue
+                client.get(url)
+                entry = timings.setdefault(name, {'latency': [], 'queries': [], 'statuses': set()})
+                for _ in range(iterations):
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        response = client.get(url)
+                        entry['latency'].append((time.perf_counter() - start) * 1000)
+                    entry['queries'].append(len(queries))
+                    entry['statuses'].add(response.status_code)
+        for name, entry in timings.items():
+            results[f'{role}:{name}'] = {
+                'p50_ms': round(percentile(entry['latency'], 0.50), 2),
+                'p99_ms': round(percentile(entry['latency'], 0.99), 2),
+                'queries': statistics.median(entry['queries']),
+                'statuses': sorted(entry['statuses']),
+                'samples': len(entry['latency']),
+            }
+    return results
+
+def compare(results, baseline):
+    """Базалық нәтижемен салыстыру: (кілт, p50 өзгерісі %, сұраулар айырмасы)"""
+    rows = []
+    for key, current in sorted(results.items()):
+        previous = baseline.get(key)
+        if previous is None:
+            rows.append((key, None, None))
+            continue
+        p50_change = (current['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100 if previous['p50_ms'] else 0
+        rows.append((key, round(p50_change, 1), current['queries'] - previous['queries']))
+    return rows
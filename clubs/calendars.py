@@ -0,0 +1,129 @@
+import hashlib
+import time
+from datetime import timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from .fragments import get_versions, version_key
+from .models import Event
+
+CALENDAR_VERSION = 1
+CALENDAR_CACHE_TIMEOUT = getattr(settings, 'CALENDAR_CACHE_TIMEOUT', 60 * 60)
+CALENDAR_TOKEN_TIMEOUT = getattr(settings, 'CALENDAR_TOKEN_TIMEOUT', 300)
+CALENDAR_PAST_DAYS = getattr(settings, 'CALENDAR_PAST_DAYS', 90)
+CALENDAR_EVENT_MINUTES = getattr(settings, 'CALENDAR_EVENT_MINUTES', 120)
+CALENDAR_MAX_AGE = getattr(settings, 'CALENDAR_MAX_AGE', 300)
+
+def token_key(token):
+    return f'clubs:calendar_token:{hashlib.sha256(token.encode()).hexdigest()}'
+
+def resolve_token(token):
+    """Күнтізбе токені бойынша (user_id, рөл) жұбын алу, кэштен немесе бір сұраумен"""
+    key = token_key(token)
+    owner = cache.get(key)
+    if owner is None:
+        owner = get_user_model().objects.filter(
+            calendar_token=token, is_active=True
+        ).values_list('pk', 'role', 'is_superuser').first() or ()
+        cache.set(key, owner, CALENDAR_TOKEN_TIMEOUT)
+    return owner or None
+
+def forget_token(token):
+    cache.delete(token_key(token))
+
+def feed_validators(scope, club_ids, host):
+    """Клубтардың іс-шара нұсқаларынан әлсіз ETag пен кэш кілтін құру (ДҚ сұрауынсыз).
+
+    ETag әлсіз: дене прокси немесе GZipMiddleware арқылы әртүрлі кодталуы мүмкін.
+    """
+    club_ids = sorted(set(club_ids))
+    versions = get_versions([version_key('events', club_id) for club_id in club_ids])
+    raw = '|'.join(
+        [scope, host] + [f'{club_id}.{versions[version_key("events", club_id)]}' for club_id in club_ids]
+    )
+    digest = hashlib.sha256(raw.encode()).hexdigest()[:32]
+    return f'W/"{digest}"', f'clubs:calendar:v{CALENDAR_VERSION}:{digest}'
+
+def escape_text(value):
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+def fold(line):
+    """RFC 5545: 75 октеттен ұзын жолдарды бүктеу"""
+    data = line.encode()
+    if len(data) <= 75:
+        return line
+    parts, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1  # UTF-8 таңбасын ортасынан бөлмеу
+        parts.append(data[start:end].decode())
+        start, limit = end, 74
+    return '\r\n '.join(parts)
+
+def ical_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+def render_calendar(name, club_ids, base_url):
+    """Клубтардың іс-шараларынан VCALENDAR мәтінін құру"""
+    stamp = ical_datetime(timezone.now())
+    duration = timedelta(minutes=CALENDAR_EVENT_MINUTES)
+    events = Event.objects.filter(
+        club_id__in=club_ids,
+        date__gte=timezone.now() - timedelta(days=CALENDAR_PAST_DAYS),
+    ).order_by('date').values_list('pk', 'title', 'description', 'location', 'date', 'club_id', 'club__name')
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//University Clubs//Events//KK',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(name)}',
+        f'REFRESH-INTERVAL;VALUE=DURATION:PT{max(CALENDAR_MAX_AGE // 60, 1)}M',
+    ]
+    for pk, title, description, location, date, club_id, club_name in events:
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:event-{pk}@{base_url.split("://", 1)[-1]}',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART:{ical_datetime(date)}',
+            f'DTEND:{ical_datetime(date + duration)}',
+            f'SUMMARY:{escape_text(title)}',
+            f'DESCRIPTION:{escape_text(description)}',
+            f'LOCATION:{escape_text(location)}',
+            f'CATEGORIES:{escape_text(club_name)}',
+            f'URL:{base_url}{reverse("club_detail", args=[club_id])}',
+            'END:VEVENT',
+        ]
+    lines.append('END:VCALENDAR')
+    return ''.join(fold(line) + '\r\n' for line in lines)
+
+def calendar_response(request, scope, name, club_ids):
+    """ETag/Last-Modified тексеріп, 304 немесе кэштелген .ics денесін қайтару"""
+    base_url = f'{request.scheme}://{request.get_host()}'
+    etag, key = feed_validators(scope, club_ids, base_url)
+    cached = cache.get(key)
+    last_modified = cached[1] if cached else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if cached is None:
+            cached = (render_calendar(name, club_ids, base_url).encode(), int(time.time()))
+            cache.set(key, cached, CALENDAR_CACHE_TIMEOUT)
+        response = HttpResponse(cached[0], content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = f'inline; filename="{scope}.ics"'
+
+    response['ETag'] = etag
+    if cached:
+        response['Last-Modified'] = http_date(cached[1])
+    patch_cache_control(response, private=True, max_age=CALENDAR_MAX_AGE)
+    return response
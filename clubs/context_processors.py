@@ -1,22 +1,21 @@
-from .models import Message
+from django.utils.functional import SimpleLazyObject
+from .models import Club
+from .snapshots import get_user_snapshot
 
 def user_clubs(request):
     context = {}
     if request.user.is_authenticated:
-        from clubs.models import Club, Membership
-        
-        user_clubs = Club.objects.filter(
-            members__user=request.user,
-            members__status='approved'
-        ).distinct()
+        user_id = request.user.pk
+        snapshot = SimpleLazyObject(lambda: get_user_snapshot(user_id))
+
+        user_clubs = SimpleLazyObject(
+            lambda: Club.objects.filter(pk__in=snapshot['approved_club_ids'])
+        )
+        unread_messages = SimpleLazyObject(lambda: snapshot['unread_messages'])
 
-        unread_messages = Message.objects.filter(
-            receiver=request.user,
-            is_read=False
-        ).count()
-        
         context = {
+            'user_snapshot': snapshot,
             'user_clubs': user_clubs,
             'unread_messages': unread_messages,
         }
-    return context
\ No newline at end of file
+    return context
@@ -0,0 +1,238 @@
+import csv
+import datetime
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .models import EventAttendance, Membership, Message
+from users.models import CustomUser
+
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+EXPORT_BUFFER_SIZE = getattr(settings, 'EXPORT_BUFFER_SIZE', 64 * 1024)
+ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+def filter_users(queryset, search='', role='', active=''):
+    """user_management көрінісі мен экспорт үшін ортақ сүзгілер"""
+    if search:
+        queryset = queryset.filter(
+            Q(username__icontains=search) |
+            Q(email__icontains=search) |
+            Q(first_name__icontains=search) |
+            Q(last_name__icontains=search)
+        )
+    if role:
+        queryset = queryset.filter(role=role)
+    if active == 'active':
+        queryset = queryset.filter(is_active=True)
+    elif active == 'inactive':
+        queryset = queryset.filter(is_active=False)
+    return queryset
+
+def user_rows(params):
+    queryset = filter_users(
+        CustomUser.objects.all(), params.get('search', ''), params.get('role', ''), params.get('active', '')
+    ).order_by('-date_joined', '-id')
+    header = ['id', 'username', 'email', 'first_name', 'last_name', 'role', 'student_id', 'phone', 'is_active', 'date_joined']
+    return header, queryset.values_list(*header)
+
+def membership_rows(params):
+    queryset = Membership.objects.filter(club_id=params['club'])
+    if params.get('status'):
+        queryset = queryset.filter(status=params['status'])
+    header = ['user_id', 'username', 'email', 'first_name', 'last_name', 'status', 'applied_at', 'approved_at']
+    return header, queryset.order_by('applied_at', 'id').values_list(
+        'user_id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+        'status', 'applied_at', 'approved_at',
+    )
+
+def attendance_rows(params):
+    queryset = EventAttendance.objects.filter(event__club_id=params['club'])
+    if params.get('event'):
+        queryset = queryset.filter(event_id=params['event'])
+    header = ['event_id', 'event', 'event_date', 'user_id', 'username', 'email', 'status', 'registered_at']
+    return header, queryset.order_by('event__date', 'event_id', 'id').values_list(
+        'event_id', 'event__title', 'event__date', 'user_id', 'user__username', 'user__email',
+        'status', 'registered_at',
+    )
+
+def message_rows(params):
+    """Хабарлардың метадеректері; мазмұны экспортталмайды"""
+    queryset = Message.objects.all()
+    if params.get('user'):
+        queryset = queryset.filter(Q(sender__username=params['user']) | Q(receiver__username=params['user']))
+    since = parse_date(params.get('since') or '')
+    until = parse_date(params.get('until') or '')
+    if since:
+        queryset = queryset.filter(sent_at__date__gte=since)
+    if until:
+        queryset = queryset.filter(sent_at__date__lte=until)
+    header = ['id', 'sender', 'receiver', 'subject', 'sent_at', 'is_read']
+    return header, queryset.order_by('sent_at', 'id').values_list(
+        'id', 'sender__username', 'receiver__username', 'subject', 'sent_at', 'is_read',
+    )
+
+DATASETS = {
+    'users': user_rows,
+    'memberships': membership_rows,
+    'attendance': attendance_rows,
+    'messages': message_rows,
+}
+
+def cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+class StreamBuffer(io.RawIOBase):
+    """Жазылған байттарды жинап, генератор оларды бөліктермен беруі үшін.
+
+    seek() жоқ болғандықтан zipfile деректерді артқа оралмай жазады.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self.parts.append(data)
+        self.size += len(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        self.size = 0
+        return data
+
+def csv_stream(header, rows):
+    buffer = StreamBuffer()
+    text = io.TextIOWrapper(buffer, encoding='utf-8-sig', newline='', write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([cell(value) for value in row])
+        if buffer.size >= EXPORT_BUFFER_SIZE:
+            yield buffer.take()
+    text.detach()
+    yield buffer.take()
+
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+def xlsx_stream(header, rows, sheet_name='Export'):
+    """Минималды XLSX кітабын жолма-жол ZIP ағынына жазу.
+
+    Парақ inline жолдармен жазылады (sharedStrings жоқ), сондықтан бүкіл
+    кестені жадта ұстау қажет емес.
+    """
+    buffer = StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_PARTS.items():
+            archive.writestr(name, content)
+        archive.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{sheet_name[:31]}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ))
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            # Әр кішкене жазу zlib-ке жеке шақыру болар еді, сондықтан жолдарды бумалап жазамыз
+            pending = [
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>',
+                xlsx_row(header),
+            ]
+            for row in rows:
+                pending.append(xlsx_row([cell(value) for value in row]))
+                if len(pending) >= 1000:
+                    sheet.write(''.join(pending).encode('utf-8'))
+                    pending = []
+                    if buffer.size >= EXPORT_BUFFER_SIZE:
+                        yield buffer.take()
+            pending.append('</sheetData></worksheet>')
+            sheet.write(''.join(pending).encode('utf-8'))
+    yield buffer.take()
+
+def xlsx_row(values):
+    cells = []
+    for value in values:
+        if isinstance(value, (int, float)):
+            cells.append(f'<c><v>{value}</v></c>')
+        else:
+            cells.append(f'<c t="inlineStr"><is><t>{escape(ILLEGAL_XML_CHARS.sub("", str(value)))}</t></is></c>')
+    return f'<row>{"".join(cells)}</row>'
+
+def export_chunks(dataset, params, fmt):
+    header, rows = DATASETS[dataset](params)
+    rows = rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    if fmt == 'xlsx':
+        return xlsx_stream(header, rows, dataset)
+    return csv_stream(header, rows)
+
+async def async_chunks(chunks):
+    # ASGI синхронды итераторды толық жадқа жинайды, сондықтан бөліктерді
+    # бір ағында (курсор сол қосылымда қалады) бірте-бірте аламыз
+    iterator = iter(chunks)
+    while (chunk := await sync_to_async(next)(iterator, None)) is not None:
+        yield chunk
+
+def export_response(request, dataset, params, filename):
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in FORMATS:
+        fmt = 'csv'
+    chunks = export_chunks(dataset, params, fmt)
+    if isinstance(request, ASGIRequest):
+        chunks = async_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=FORMATS[fmt])
+    stamp = timezone.localdate().isoformat()
+    response['Content-Disposition'] = f'attachment; filename="{filename}-{stamp}.{fmt}"'
+    return response
@@ -0,0 +1,45 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from .fragments import bump_version, get_versions
+from .models import Club
+
+FACET_TIMEOUT = getattr(settings, 'FACET_CACHE_TIMEOUT', 5 * 60)
+CATALOG_VERSION_KEY = 'clubs:version:catalog'
+
+def bump_catalog_version():
+    bump_version(CATALOG_VERSION_KEY)
+
+def facet_key(signature):
+    version = get_versions([CATALOG_VERSION_KEY])[CATALOG_VERSION_KEY]
+    digest = hashlib.md5(repr(signature).encode(), usedforsecurity=False).hexdigest()
+    return f'clubs:facets:{version}:{digest}'
+
+def category_facets(queryset, signature, selected=''):
+    """Әр санаттағы клубтар саны бір GROUP BY сұрауымен.
+
+    ``queryset`` санат сүзгісінсіз беріледі, сонда басқа санаттардың
+    сандары да көрінеді. ``signature`` іздеу мен сүзгілерді сипаттайды
+    және кэш кілті ретінде қолданылады.
+    """
+    key = facet_key(signature)
+    counts = cache.get(key)
+    if counts is None:
+        counts = dict(
+            queryset.order_by().values('category').annotate(total=Count('pk')).values_list('category', 'total')
+        )
+        cache.set(key, counts, FACET_TIMEOUT)
+
+    return {
+        'categories': [
+            {
+                'id': category_id,
+                'name': category_name,
+                'count': counts.get(category_id, 0),
+                'selected': category_id == selected,
+            }
+            for category_id, category_name in Club.CATEGORY_CHOICES
+        ],
+        'total': sum(counts.values()),
+    }
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from .models import Club, Membership, Notification, UserFeedItem
+from .pagination import keyset_page
+
+FEED_BATCH_SIZE = getattr(settings, 'FEED_BATCH_SIZE', 1000)
+FEED_BACKFILL_LIMIT = getattr(settings, 'FEED_BACKFILL_LIMIT', 50)
+
+def notification_recipients(notification):
+    """Хабарландыруды алатын пайдаланушылардың id-лері"""
+    if notification.club_id is None:
+        yield from get_user_model().objects.filter(is_active=True).order_by().values_list(
+            'pk', flat=True
+        ).iterator(chunk_size=FEED_BATCH_SIZE)
+        return
+    yield from Membership.objects.filter(
+        club_id=notification.club_id, status='approved'
+    ).order_by().values_list('user_id', flat=True).iterator(chunk_size=FEED_BATCH_SIZE)
+    leader_id = Club.objects.filter(pk=notification.club_id).values_list('leader_id', flat=True).first()
+    if leader_id:
+        yield leader_id
+
+def fan_out_notification(notification):
+    """Хабарландыруды алушылардың лентасына бумалап жазу"""
+    batch = []
+    created = 0
+    for user_id in notification_recipients(notification):
+        batch.append(UserFeedItem(
+            user_id=user_id,
+            notification_id=notification.pk,
+            created_at=notification.created_at,
+        ))
+        if len(batch) >= FEED_BATCH_SIZE:
+            created += len(UserFeedItem.objects.bulk_create(batch, ignore_conflicts=True))
+            batch = []
+    if batch:
+        created += len(UserFeedItem.objects.bulk_create(batch, ignore_conflicts=True))
+    return created
+
+def backfill_feed(user_ids, notifications, limit=FEED_BACKFILL_LIMIT):
+    notifications = list(
+        notifications.filter(is_active=True).order_by('-created_at').values_list('pk', 'created_at')[:limit]
+    )
+    UserFeedItem.objects.bulk_create([
+        UserFeedItem(user_id=user_id, notification_id=pk, created_at=created_at)
+        for user_id in user_ids
+        for pk, created_at in notifications
+    ], batch_size=FEED_BATCH_SIZE, ignore_conflicts=True)
+
+def backfill_member_feed(user_ids, club_id, limit=FEED_BACKFILL_LIMIT):
+    """Жаңа мүшелердің лентасына клубтың соңғы хабарландыруларын қосу"""
+    backfill_feed(user_ids, Notification.objects.filter(club_id=club_id), limit)
+
+def backfill_global_feed(user_ids, limit=FEED_BACKFILL_LIMIT):
+    """Жаңа пайдаланушылардың лентасына жалпы хабарландыруларды қосу"""
+    backfill_feed(user_ids, Notification.objects.filter(club__isnull=True), limit)
+
+def remove_member_feed(user_ids, club_id):
+    """Клубтан шыққан пайдаланушылардың лентасынан клуб жазбаларын бір сұраумен алып тастау"""
+    leader_id = Club.objects.filter(pk=club_id).values_list('leader_id', flat=True).first()
+    user_ids = [user_id for user_id in user_ids if user_id != leader_id]
+    if user_ids:
+        UserFeedItem.objects.filter(user_id__in=user_ids, notification__club_id=club_id).delete()
+
+def user_feed(user, cursor=None, per_page=20):
+    """Пайдаланушының лентасы: (user, -created_at) индексі бойынша бір сұрау"""
+    page = keyset_page(
+        UserFeedItem.objects.filter(user=user, notification__is_active=True)
+        .select_related('notification__club', 'notification__created_by'),
+        cursor=cursor,
+        per_page=per_page,
+        field='created_at',
+    )
+    page.notifications = [item.notification for item in page]
+    return page
@@ -33,13 +33,22 @@ class NotificationForm(forms.ModelForm):
 class EventForm(forms.ModelForm):
     class Meta:
         model = Event
-        fields = ['title', 'description', 'club', 'date', 'location']
+        fields = ['title', 'description', 'club', 'date', 'location', 'capacity']
         widgets = {
             'description': forms.Textarea(attrs={'rows': 4, 'class': 'form-control'}),
             'title': forms.TextInput(attrs={'class': 'form-control'}),
             'location': forms.TextInput(attrs={'class': 'form-control'}),
+            'capacity': forms.NumberInput(attrs={'class': 'form-control', 'min': 1}),
             'date': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
         }
+    
+    def clean_capacity(self):
+        capacity = self.cleaned_data.get('capacity')
+        if capacity is not None and capacity < self.instance.attendees_count:
+            raise forms.ValidationError(
+                f'Іс-шараға {self.instance.attendees_count} адам тіркеліп қойған, орын саны одан аз болмауы керек'
+            )
+        return capacity
 
 class MessageForm(forms.ModelForm):
     class Meta:
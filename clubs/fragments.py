@@ -0,0 +1,98 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from .metrics import registry
+from .models import Club, Event, Notification
+
+FRAGMENT_VERSION = 1
+FRAGMENT_TIMEOUT = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 60 * 60)
+VERSION_KINDS = ('members', 'events')
+
+def version_key(kind, club_id):
+    return f'clubs:version:{kind}:{club_id}'
+
+def initial_version():
+    # Уақытқа негізделген бастапқы мән: кэштен өшірілген санағыш бұрынғы кілттерді қайталамайды
+    return time.time_ns() // 1000
+
+def get_versions(keys):
+    """Нұсқа санағыштарын бір сұраумен алу, жоқтарын жаңадан бастау"""
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, initial_version(), None)
+            found[key] = cache.get(key)
+    return found
+
+def bump_version(key):
+    """Санағышты транзакция сәтті аяқталғаннан кейін арттыру"""
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, initial_version(), None)
+    transaction.on_commit(bump)
+
+def club_versions(club_id):
+    """Клубтың мүшелік және іс-шара нұсқалары"""
+    keys = {kind: version_key(kind, club_id) for kind in VERSION_KINDS}
+    found = get_versions(list(keys.values()))
+    return {kind: found[key] for kind, key in keys.items()}
+
+def bump_club_version(kind, club_id):
+    """Клуб фрагменттерін ескірген деп белгілеу"""
+    if club_id:
+        bump_version(version_key(kind, club_id))
+
+def key_part(value):
+    if isinstance(value, Club):
+        versions = club_versions(value.pk)
+        return (
+            f'club{value.pk}.{value.updated_at.timestamp()}.leader{value.leader_id}'
+            f'.{versions["members"]}.{versions["events"]}'
+        )
+    if isinstance(value, Event):
+        return f'event{value.pk}.{key_part(value.club)}'
+    if isinstance(value, Notification):
+        club = key_part(value.club) if value.club_id else 'global'
+        return f'notification{value.pk}.{club}'
+    return str(value)
+
+def viewer_role(user):
+    if user is None or not user.is_authenticated:
+        return 'anonymous'
+    return user.role
+
+def fragment_key(name, parts, role):
+    digest = hashlib.md5(
+        '|'.join(key_part(part) for part in parts).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'clubs:fragment:v{FRAGMENT_VERSION}:{name}:{role}:{digest}'
+
+def bypass_requested(request):
+    """Админ ?nocache арқылы кэшті айналып өте алады"""
+    if request is None or 'nocache' not in request.GET:
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.is_admin())
+
+def cached_fragment(name, parts, render, request=None, timeout=None):
+    """Фрагментті кэштен алу немесе render() арқылы жасап сақтау"""
+    user = getattr(request, 'user', None)
+    key = fragment_key(name, parts, viewer_role(user))
+
+    if bypass_requested(request):
+        outcome = 'bypassed'
+    else:
+        html = cache.get(key)
+        if html is not None:
+            registry.record_fragment(name, 'hits')
+            return html
+        outcome = 'misses'
+
+    html = render()
+    cache.set(key, html, FRAGMENT_TIMEOUT if timeout is None else timeout)
+    registry.record_fragment(name, outcome)
+    return html
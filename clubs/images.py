@@ -0,0 +1,86 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+from users.backends import invalidate_cached_users
+from .renditions import render_renditions
+
+logger = logging.getLogger(__name__)
+
+RENDITION_WIDTHS = getattr(settings, 'IMAGE_RENDITION_WIDTHS', (64, 128, 320, 640))
+IMAGE_WORKERS = getattr(settings, 'IMAGE_WORKERS', 2)
+IMAGE_FIELDS = {
+    'clubs.Club': 'logo',
+    settings.AUTH_USER_MODEL: 'profile_image',
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def create_executor(workers=IMAGE_WORKERS):
+    # spawn: веб-процестің ағындары мен DB қосылымдары балаға көшірілмейді
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = create_executor()
+    return _executor
+
+def image_fields():
+    """(модель, өріс аты) жұптары"""
+    return [(apps.get_model(label), field_name) for label, field_name in IMAGE_FIELDS.items()]
+
+def renditions_field(field_name):
+    return f'{field_name}_renditions'
+
+def needs_renditions(instance, field_name):
+    image = getattr(instance, field_name)
+    renditions = getattr(instance, renditions_field(field_name)) or {}
+    return bool(image) and renditions.get('source') != image.name
+
+def submit_renditions(executor, source_name):
+    return executor.submit(render_renditions, str(settings.MEDIA_ROOT), source_name, RENDITION_WIDTHS)
+
+def update_renditions(model, pk, values, **filters):
+    """Нұсқалар өрісін UPDATE-пен жазу; сигналсыз өтетіндіктен кэштегі пайдаланушыны тазалау"""
+    updated = model.objects.filter(pk=pk, **filters).update(**values)
+    if updated and model is get_user_model():
+        invalidate_cached_users(pk)
+    return updated
+
+def store_renditions(model, pk, field_name, source_name, renditions):
+    """Нұсқаларды жазу; сурет осы аралықта ауысса, ештеңе өзгертпеу"""
+    values = {renditions_field(field_name): {'source': source_name, **renditions}}
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        values['updated_at'] = timezone.now()
+    return update_renditions(model, pk, values, **{field_name: source_name})
+
+def finish_renditions(model, pk, field_name, source_name, future):
+    try:
+        store_renditions(model, pk, field_name, source_name, future.result())
+    except Exception:
+        logger.exception('%s #%s суретінің нұсқаларын жасау сәтсіз аяқталды', model.__name__, pk)
+    finally:
+        connection.close()
+
+def sync_renditions(instance, field_name):
+    """Сурет ауысса, нұсқаларды фондық процесте жасауға жіберу"""
+    model = type(instance)
+    if needs_renditions(instance, field_name):
+        source_name = getattr(instance, field_name).name
+
+        def submit():
+            future = submit_renditions(get_executor(), source_name)
+            future.add_done_callback(partial(finish_renditions, model, instance.pk, field_name, source_name))
+        transaction.on_commit(submit)
+    elif not getattr(instance, field_name) and getattr(instance, renditions_field(field_name)):
+        update_renditions(model, instance.pk, {renditions_field(field_name): {}})
@@ -0,0 +1,177 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+from .metrics import percentile
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOBS_DEFAULTS = {
+    'JOBS_EAGER': False,
+    'JOBS_MAX_ATTEMPTS': 5,
+    'JOBS_RETRY_BASE': 10,
+    'JOBS_RETRY_MAX': 3600,
+    'JOBS_STALE_TIMEOUT': 600,
+    'JOBS_RETENTION_DAYS': 7,
+    'JOBS_STATS_SAMPLE': 1000,
+}
+
+def job_setting(name):
+    """Кезек баптауын шақыру сәтінде оқу (override_settings тестте де әсер етеді)"""
+    return getattr(settings, name, JOBS_DEFAULTS[name])
+
+handlers = {}
+
+def job(name):
+    """Функцияны кезектегі тапсырма ретінде тіркеу"""
+    def register(func):
+        handlers[name] = func
+        return func
+    return register
+
+def enqueue(name, delay=0, max_attempts=None, **payload):
+    """Тапсырманы кезекке қою.
+
+    Жол ағымдағы транзакциямен бірге жазылады, сондықтан жұмысшы оны
+    тек commit-тен кейін көреді. JOBS_EAGER кезінде commit-тен кейін
+    бірден осы процесте орындалады.
+    """
+    if name not in handlers:
+        raise ValueError(f'Белгісіз тапсырма: {name}')
+    if job_setting('JOBS_EAGER'):
+        transaction.on_commit(lambda: handlers[name](**payload))
+        return None
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        max_attempts=max_attempts or job_setting('JOBS_MAX_ATTEMPTS'),
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+def claim_job(worker):
+    """Орындауға дайын бір тапсырманы алу.
+
+    PostgreSQL-де SKIP LOCKED басқа жұмысшылар құлыптаған жолдарды
+    өткізіп жібереді; шартты UPDATE құлып жоқ дерекқорларда да бір
+    тапсырманы екі жұмысшы алмауын қамтамасыз етеді.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        candidate = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status='queued', run_at__lte=now)
+            .order_by('run_at', 'id')
+            .first()
+        )
+        if candidate is None:
+            return None
+        claimed = Job.objects.filter(pk=candidate.pk, status='queued').update(
+            status='running',
+            started_at=now,
+            worker=worker,
+            attempts=F('attempts') + 1,
+        )
+    if not claimed:
+        return None
+    candidate.status = 'running'
+    candidate.started_at = now
+    candidate.worker = worker
+    candidate.attempts += 1
+    return candidate
+
+def retry_delay(attempts):
+    """Экспоненциалды кідіріс (секунд), жұмысшылар бір уақытта оянбауы үшін кездейсоқ қоспамен"""
+    delay = min(job_setting('JOBS_RETRY_MAX'), job_setting('JOBS_RETRY_BASE') * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+def run_job(job):
+    handler = handlers.get(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f'Белгісіз тапсырма: {job.name}')
+        handler(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            job.status = 'queued'
+            job.run_at = now + timedelta(seconds=retry_delay(job.attempts))
+            logger.warning('%s #%s сәтсіз (%s-әрекет), қайта қойылды', job.name, job.pk, job.attempts)
+        else:
+            job.status = 'failed'
+            job.finished_at = now
+            logger.error('%s #%s біржола сәтсіз аяқталды', job.name, job.pk)
+        job.last_error = error
+        Job.objects.filter(pk=job.pk).update(
+            status=job.status, run_at=job.run_at, finished_at=job.finished_at, last_error=error,
+        )
+        return False
+    job.status = 'done'
+    job.finished_at = timezone.now()
+    Job.objects.filter(pk=job.pk).update(status='done', finished_at=job.finished_at, last_error='')
+    return True
+
+def requeue_stale_jobs(timeout=None):
+    """Жұмысшысы құлаған, тым ұзақ 'running' күйіндегі тапсырмаларды кезекке қайтару.
+
+    Үзілген орындау сәтсіз әрекет болып саналады (attempts claim_job-та өскен):
+    жұмысшыны құлататын тапсырма max_attempts-тан кейін 'failed' болады.
+    """
+    now = timezone.now()
+    timeout = timeout or job_setting('JOBS_STALE_TIMEOUT')
+    stale = Job.objects.filter(status='running', started_at__lt=now - timedelta(seconds=timeout))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', finished_at=now, last_error='Жұмысшы тапсырманы аяқтамай тоқтады',
+    )
+    if failed:
+        logger.error('%s ілініп қалған тапсырма біржола сәтсіз аяқталды', failed)
+    return stale.update(status='queued', run_at=now)
+
+def retry_failed_jobs():
+    return Job.objects.filter(status='failed').update(
+        status='queued', attempts=0, run_at=timezone.now(), finished_at=None,
+    )
+
+def purge_finished_jobs(days=None):
+    cutoff = timezone.now() - timedelta(days=days or job_setting('JOBS_RETENTION_DAYS'))
+    deleted, _ = Job.objects.filter(status='done', finished_at__lt=cutoff).delete()
+    return deleted
+
+def queue_stats(sample=None):
+    """Кезек тереңдігі және соңғы тапсырмалардың күту/орындалу уақыты (мс)"""
+    now = timezone.now()
+    sample = sample or job_setting('JOBS_STATS_SAMPLE')
+    counts = dict(Job.objects.order_by().values_list('status').annotate(total=Count('pk')))
+    oldest = Job.objects.filter(status='queued', run_at__lte=now).aggregate(oldest=Min('run_at'))['oldest']
+
+    recent = Job.objects.filter(status='done').order_by('-finished_at').values_list(
+        'name', 'run_at', 'started_at', 'finished_at'
+    )[:sample]
+    by_name = {}
+    for name, run_at, started_at, finished_at in recent:
+        entry = by_name.setdefault(name, {'wait': [], 'run': []})
+        entry['wait'].append(max(0, (started_at - run_at).total_seconds() * 1000))
+        entry['run'].append((finished_at - started_at).total_seconds() * 1000)
+
+    return {
+        'counts': {status: counts.get(status, 0) for status, _ in Job.STATUS_CHOICES},
+        'ready': Job.objects.filter(status='queued', run_at__lte=now).count(),
+        'oldest_wait_s': round((now - oldest).total_seconds(), 1) if oldest else 0,
+        'jobs': [
+            {
+                'name': name,
+                'count': len(entry['run']),
+                'wait_p50': percentile(entry['wait'], 0.50),
+                'wait_p95': percentile(entry['wait'], 0.95),
+                'run_p50': percentile(entry['run'], 0.50),
+                'run_p95': percentile(entry['run'], 0.95),
+            }
+            for name, entry in sorted(by_name.items())
+        ],
+        'failures': Job.objects.filter(status='failed').order_by('-finished_at')[:20],
+    }
@@ -0,0 +1,83 @@
+import json
+import os
+import re
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from clubs.assets import MANIFEST_NAME, scan_static_root
+from users.models import CustomUser
+
+ASSET_URL_RE = re.compile(r'''(?:href|src|srcset)=["']([^"' ]+)''')
+
+class Command(BaseCommand):
+    help = 'Беттердің HTML және статикалық ресурстар көлемін (алғашқы және қайталама кіру) өлшеу'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['/', '/clubs/', '/events/'])
+        parser.add_argument('--user', help='Кіріп өлшейтін пайдаланушы аты')
+        parser.add_argument('--output', default='asset_report.json')
+        parser.add_argument('--compare', help='Салыстыруға арналған бұрынғы JSON файл')
+
+    def handle(self, *args, **options):
+        if not os.path.exists(os.path.join(settings.STATIC_ROOT, MANIFEST_NAME)):
+            raise CommandError('Манифест табылмады: алдымен collectstatic іске қосыңыз')
+        assets = scan_static_root(settings.STATIC_ROOT)
+        prefix = '/' + settings.STATIC_URL.strip('/') + '/'
+
+        client = Client()
+        if options['user']:
+            user = CustomUser.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f'Пайдаланушы табылмады: {options["user"]}')
+            client.force_login(user)
+
+        results = {}
+        with override_settings(DEBUG=False, ALLOWED_HOSTS=['testserver']):
+            for path in options['paths']:
+                response = client.get(path, follow=True)
+                html = response.content
+                urls = {url for url in ASSET_URL_RE.findall(html.decode('utf-8', 'replace')) if url.startswith(prefix)}
+                found = [assets[url[len(prefix):]] for url in sorted(urls) if url[len(prefix):] in assets]
+                raw = sum(asset.size for asset in found)
+                compressed = sum(asset.variant('br, gzip')[1] for asset in found)
+                # Immutable файлдар қайталама кіруде кэштен алынады
+                revalidated = [asset for asset in found if not asset.immutable]
+                results[path] = {
+                    'status': response.status_code,
+                    'html_bytes': len(html),
+                    'assets': len(found),
+                    'missing': len(urls) - len(found),
+                    'asset_bytes': raw,
+                    'compressed_bytes': compressed,
+                    'first_visit_bytes': len(html) + compressed,
+                    'repeat_visit_bytes': len(html) + sum(asset.variant('br, gzip')[1] for asset in revalidated),
+                    'repeat_requests': 1 + len(revalidated),
+                }
+
+        self.stdout.write(f'{"Бет":<25} {"HTML":>8} {"ресурс":>8} {"сығылған":>9} {"алғашқы":>9} {"қайталама":>10}')
+        for path, row in results.items():
+            self.stdout.write(
+                f'{path:<25} {row["html_bytes"]:>8} {row["asset_bytes"]:>8} {row["compressed_bytes"]:>9} '
+                f'{row["first_visit_bytes"]:>9} {row["repeat_visit_bytes"]:>10}'
+            )
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = json.load(f)['results']
+            self.stdout.write('')
+            self.stdout.write(f'{"Бет":<25} {"HTML Δ":>8} {"алғашқы Δ":>10} {"қайталама Δ":>12}')
+            for path, row in results.items():
+                previous = baseline.get(path)
+                if previous is None:
+                    self.stdout.write(f'{path:<25} {"жаңа":>8}')
+                    continue
+                self.stdout.write(
+                    f'{path:<25} {row["html_bytes"] - previous["html_bytes"]:>+8} '
+                    f'{row["first_visit_bytes"] - previous["first_visit_bytes"]:>+10} '
+                    f'{row["repeat_visit_bytes"] - previous["repeat_visit_bytes"]:>+12}'
+                )
+
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump({'meta': {'user': options['user']}, 'results': results}, f, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Нәтижелер {options["output"]} файлына сақталды'))
@@ -0,0 +1,53 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from clubs.benchmark import compare, run_benchmark
+
+class Command(BaseCommand):
+    help = 'Әр рөл үшін барлық URL-дерді аралап, p50/p99 кідірісі мен SQL санын өлшеу'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--roles', default='admin,leader,member')
+        parser.add_argument('--samples', type=int, default=3, help='Әр рөлден неше пайдаланушы')
+        parser.add_argument('--iterations', type=int, default=5, help='Әр URL-ді неше рет сұрау')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='bench_baseline.json')
+        parser.add_argument('--compare', help='Салыстыруға арналған бұрынғы JSON файл')
+
+    def handle(self, *args, **options):
+        roles = [role.strip() for role in options['roles'].split(',') if role.strip()]
+        with override_settings(ALLOWED_HOSTS=['testserver'], REQUEST_METRICS_ENABLED=False):
+            results = run_benchmark(roles, options['samples'], options['iterations'], options['seed'], self.stdout)
+        if not results:
+            raise CommandError('Нәтиже жоқ: алдымен seed_bench арқылы деректер жасаңыз')
+
+        self.stdout.write(f'{"URL":<45} {"p50 мс":>9} {"p99 мс":>9} {"SQL":>6}  статус')
+        for key, row in sorted(results.items()):
+            statuses = ','.join(str(status) for status in row['statuses'])
+            self.stdout.write(f'{key:<45} {row["p50_ms"]:>9} {row["p99_ms"]:>9} {row["queries"]:>6}  {statuses}')
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = json.load(f)['results']
+            self.stdout.write('')
+            self.stdout.write(f'{"URL":<45} {"p50 Δ%":>9} {"SQL Δ":>6}')
+            for key, p50_change, queries_change in compare(results, baseline):
+                if p50_change is None:
+                    self.stdout.write(f'{key:<45} {"жаңа":>9}')
+                else:
+                    self.stdout.write(f'{key:<45} {p50_change:>+9} {queries_change:>+6}')
+
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'vendor': connection.vendor,
+                    'created_at': timezone.now().isoformat(),
+                    'roles': roles,
+                    'samples': options['samples'],
+                    'iterations': options['iterations'],
+                },
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Нәтижелер {options["output"]} файлына сақталды'))
@@ -0,0 +1,37 @@
+from concurrent.futures import as_completed
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from clubs.images import (
+    IMAGE_WORKERS, create_executor, image_fields, needs_renditions, store_renditions, submit_renditions,
+)
+
+class Command(BaseCommand):
+    help = 'Бар суреттер (клуб логотиптері, профиль суреттері) үшін WebP/JPEG нұсқаларын жасау'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Нұсқалары бар суреттерді де қайта жасау')
+        parser.add_argument('--workers', type=int, default=IMAGE_WORKERS)
+
+    def handle(self, *args, **options):
+        done = failed = 0
+        with create_executor(options['workers']) as executor:
+            futures = {}
+            for model, field_name in image_fields():
+                instances = model.objects.exclude(Q(**{field_name: ''}) | Q(**{f'{field_name}__isnull': True}))
+                for instance in instances.iterator():
+                    if not options['force'] and not needs_renditions(instance, field_name):
+                        continue
+                    source_name = getattr(instance, field_name).name
+                    future = submit_renditions(executor, source_name)
+                    futures[future] = (model, instance.pk, field_name, source_name)
+
+            for future in as_completed(futures):
+                model, pk, field_name, source_name = futures[future]
+                try:
+                    store_renditions(model, pk, field_name, source_name, future.result())
+                    done += 1
+                except Exception as error:
+                    failed += 1
+                    self.stderr.write(f'{model.__name__} #{pk} ({source_name}): {error}')
+
+        self.stdout.write(self.style.SUCCESS(f'{done} сурет өңделді, {failed} қате'))
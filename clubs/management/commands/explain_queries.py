@@ -0,0 +1,81 @@
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from clubs.models import Club, Membership, Notification, Event, Message
+from users.models import CustomUser
+
+SEQ_SCAN_PATTERNS = (
+    r'Seq Scan on {table}\b',
+    r'\bSCAN {table}\b(?! USING)',
+)
+
+def main_queries(user, club):
+    """Негізгі көріністердің сұраулары: (аты, кесте, queryset)"""
+    now = timezone.now()
+    club_ids = Membership.objects.filter(user=user, status='approved').values('club_id')
+    return [
+        ('club_list', Club._meta.db_table, Club.objects.filter(is_active=True)),
+        ('my_clubs', Membership._meta.db_table, Membership.objects.filter(user=user, status='approved')),
+        ('manage_memberships', Membership._meta.db_table, Membership.objects.filter(club=club, status='pending')),
+        ('club_detail.members', Membership._meta.db_table, club.get_active_members()),
+        ('club_detail.notifications', Notification._meta.db_table,
+         club.notifications.filter(is_active=True).order_by('-created_at')[:10]),
+        ('home.notifications', Notification._meta.db_table,
+         Notification.objects.filter(is_active=True).order_by('-created_at')[:5]),
+        ('events', Event._meta.db_table,
+         Event.objects.filter(club__in=club_ids, date__gte=now).order_by('date')),
+        ('unread_messages', Message._meta.db_table, Message.objects.filter(receiver=user, is_read=False)),
+        ('inbox', Message._meta.db_table,
+         Message.objects.filter(receiver=user).order_by('-sent_at', '-id')[:21]),
+        ('inbox_sent', Message._meta.db_table,
+         Message.objects.filter(sender=user).order_by('-sent_at', '-id')[:21]),
+        ('user_management', CustomUser._meta.db_table, CustomUser.objects.order_by('-date_joined')[:50]),
+        ('admin_statistics.roles', CustomUser._meta.db_table, CustomUser.objects.filter(role='leader')),
+    ]
+
+def uses_index(plan, table):
+    return not any(re.search(pattern.format(table=table), plan) for pattern in SEQ_SCAN_PATTERNS)
+
+class Command(BaseCommand):
+    help = 'Негізгі сұраулардың EXPLAIN жоспарын тексеріп, индекс қолданылатынын көрсету'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Сұраулар орындалатын пайдаланушы аты')
+        parser.add_argument('--club', type=int, help='Клуб id')
+        parser.add_argument('--fail-on-seq-scan', action='store_true',
+                            help='Кемінде бір сұрау толық сканерлесе, қатемен аяқтау')
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.all()
+        if options['user']:
+            users = users.filter(username=options['user'])
+        else:
+            users = users.filter(club_memberships__status='approved')
+        user = users.first()
+
+        clubs = Club.objects.all()
+        if options['club']:
+            clubs = clubs.filter(pk=options['club'])
+        else:
+            clubs = clubs.order_by('-members_count')
+        club = clubs.first()
+
+        if user is None or club is None:
+            raise CommandError('Деректер жоқ: алдымен базаны толтырыңыз')
+
+        self.stdout.write(f'{connection.vendor}: user={user.username}, club={club.name}')
+        regressions = []
+        for name, table, queryset in main_queries(user, club):
+            plan = queryset.explain()
+            if uses_index(plan, table):
+                self.stdout.write(f'  {self.style.SUCCESS("INDEX")}  {name}')
+            else:
+                regressions.append(name)
+                self.stdout.write(f'  {self.style.WARNING("SEQ  ")}  {name}')
+            if options['verbosity'] > 1:
+                for line in plan.splitlines():
+                    self.stdout.write(f'         {line}')
+
+        if regressions and options['fail_on_seq_scan']:
+            raise CommandError(f'Индекссіз сұраулар: {", ".join(regressions)}')
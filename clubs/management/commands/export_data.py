@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from clubs.exports import DATASETS, export_chunks
+from clubs.routers import replica_reads
+
+class Command(BaseCommand):
+    help = 'Пайдаланушыларды, мүшеліктерді, қатысуды немесе хабар метадеректерін CSV/XLSX файлына ағынмен экспорттау'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('--format', choices=['csv', 'xlsx'], default='csv')
+        parser.add_argument('--output', help='Файл жолы (әдепкі: <dataset>.<format>)')
+        parser.add_argument('--club', type=int, help='memberships және attendance үшін міндетті')
+        parser.add_argument('--status', default='', help='Мүшелік мәртебесі')
+        parser.add_argument('--event', default='', help='Іс-шара id')
+        parser.add_argument('--search', default='')
+        parser.add_argument('--role', default='')
+        parser.add_argument('--active', default='', choices=['', 'active', 'inactive'])
+        parser.add_argument('--user', default='', help='Хабарлар: жіберуші немесе қабылдаушы аты')
+        parser.add_argument('--since', default='', help='Хабарлар: ЖЖЖЖ-АА-КК бастап')
+        parser.add_argument('--until', default='', help='Хабарлар: ЖЖЖЖ-АА-КК дейін')
+
+    def handle(self, *args, **options):
+        dataset = options['dataset']
+        if dataset in ('memberships', 'attendance') and not options['club']:
+            raise CommandError(f'{dataset} үшін --club көрсетіңіз')
+        output = options['output'] or f'{dataset}.{options["format"]}'
+
+        written = 0
+        with open(output, 'wb') as f, replica_reads():
+            for chunk in export_chunks(dataset, options, options['format']):
+                f.write(chunk)
+                written += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f'{output}: {written} байт жазылды'))
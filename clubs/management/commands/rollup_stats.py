@@ -0,0 +1,32 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from clubs.models import DailyClubStats, DailyPlatformStats
+from clubs.rollups import first_activity_date, get_watermark, rollup
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'Күн форматы қате: {value} (ЖЖЖЖ-АА-КК керек)')
+
+class Command(BaseCommand):
+    help = 'Күндік статистика кестелерін соңғы өңделген күннен бастап толтыру'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=parse_date, help='Осы күннен бастап қайта есептеу')
+        parser.add_argument('--until', type=parse_date, help='Осы күнге дейін есептеу (әдепкі: бүгін)')
+        parser.add_argument('--rebuild', action='store_true', help='Барлық кестелерді тазалап, басынан есептеу')
+
+    def handle(self, *args, **options):
+        since = options['since']
+        with transaction.atomic():
+            if options['rebuild']:
+                DailyClubStats.objects.all().delete()
+                DailyPlatformStats.objects.all().delete()
+                since = first_activity_date()
+            self.stdout.write(f'Соңғы өңделген күн: {get_watermark() or "жоқ"}')
+            platform_rows, club_rows = rollup(since=since, until=options['until'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Платформа: {platform_rows} күн, клубтар: {club_rows} жол жаңартылды'
+        ))
@@ -0,0 +1,98 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from clubs.jobs import claim_job, purge_finished_jobs, requeue_stale_jobs, run_job
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_INTERVAL = 300
+
+class Command(BaseCommand):
+    """Фондық тапсырмалар жұмысшысы.
+
+    Өндірісте веб-процестен бөлек, тұрақты сервис ретінде іске қосылады
+    (JOBS_EAGER = False болғанда онсыз тапсырмалар кезекте қала береді), мысалы systemd:
+
+        [Service]
+        ExecStart=/srv/app/venv/bin/python manage.py run_workers --concurrency 4
+        Restart=always
+        KillSignal=SIGTERM
+        TimeoutStopSec=60
+
+    SIGTERM ағымдағы тапсырмаларды аяқтап тоқтатады; бірнеше хостта қатар жұмыс
+    істей береді (claim_job бір тапсырманы бір жұмысшыға ғана береді). Cron үшін
+    `run_workers --once` дайын тапсырмаларды орындап шығады.
+    """
+    help = 'Дерекқордағы кезектен фондық тапсырмаларды орындау'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help='Параллель жұмысшы ағындар саны')
+        parser.add_argument('--poll', type=float, default=1.0, help='Кезек бос болғанда күту (секунд)')
+        parser.add_argument('--once', action='store_true', help='Дайын тапсырмалар біткенде тоқтау')
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f'{requeued} ілініп қалған тапсырма кезекке қайтарылды')
+
+        prefix = f'{socket.gethostname()}:{os.getpid()}'
+        threads = [
+            threading.Thread(target=self.work, args=(f'{prefix}:{index}', options), daemon=True)
+            for index in range(options['concurrency'])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f'{len(threads)} жұмысшы іске қосылды')
+
+        last_maintenance = time.monotonic()
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+            if time.monotonic() - last_maintenance > MAINTENANCE_INTERVAL:
+                requeue_stale_jobs()
+                purge_finished_jobs()
+                close_old_connections()
+                last_maintenance = time.monotonic()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Жұмысшылар тоқтады: {self.processed} орындалды, {self.failed} сәтсіз'
+        ))
+
+    def stop(self, signum, frame):
+        self.stdout.write('Тоқтату сигналы алынды, ағымдағы тапсырмалар аяқталуда...')
+        self.stopping.set()
+
+    def work(self, worker, options):
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                try:
+                    job = claim_job(worker)
+                except Exception:
+                    logger.exception('Кезектен тапсырма алу сәтсіз')
+                    connection.close()
+                    self.stopping.wait(options['poll'])
+                    continue
+                if job is None:
+                    if options['once']:
+                        return
+                    self.stopping.wait(options['poll'])
+                    continue
+                succeeded = run_job(job)
+                with self.lock:
+                    self.processed += 1
+                    self.failed += not succeeded
+        finally:
+            connection.close()
@@ -0,0 +1,244 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from clubs.feed import backfill_global_feed, fan_out_notification
+from clubs.models import Club, Membership, Notification, Event, Message, UserFeedItem
+from users.models import CustomUser
+
+SUFFIXES = {'k': 1000, 'm': 1000 * 1000}
+STATUS_WEIGHTS = (('approved', 70), ('pending', 20), ('rejected', 10))
+NOTIFICATION_TYPES = [choice for choice, _ in Notification.NOTIFICATION_TYPES]
+CATEGORIES = [choice for choice, _ in Club.CATEGORY_CHOICES]
+WORDS = (
+    'шахмат робот би музыка футбол волейбол кітап ғылым өнер театр '
+    'программалау дебат сурет фото кино туризм экология еріктілер тіл математика'
+).split()
+
+def parse_count(value):
+    """'100k', '1M', '5000' сияқты мәндерді санға айналдыру"""
+    value = value.strip().lower()
+    multiplier = SUFFIXES.get(value[-1:], 1)
+    if multiplier != 1:
+        value = value[:-1]
+    try:
+        return int(float(value) * multiplier)
+    except ValueError:
+        raise CommandError(f'Сан форматы қате: {value}')
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """bulk_create кезінде auto_now_add өрістерін уақытша өшіру"""
+    previous = [(field, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now_add in previous:
+            field.auto_now_add = auto_now_add
+
+class Command(BaseCommand):
+    help = 'Бенчмарк үшін детерминирленген үлкен деректер жиынын құру'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=parse_count, default=parse_count('10k'))
+        parser.add_argument('--clubs', type=parse_count, default=200)
+        parser.add_argument('--memberships', type=parse_count, default=parse_count('50k'))
+        parser.add_argument('--messages', type=parse_count, default=parse_count('100k'))
+        parser.add_argument('--events', type=parse_count, default=parse_count('5k'))
+        parser.add_argument('--notifications', type=parse_count, default=parse_count('10k'))
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='bench', help='Пайдаланушы аттары мен клуб аттарының префиксі')
+        parser.add_argument('--clear', action='store_true', help='Алдыңғы бенчмарк деректерін өшіру')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        self.now = timezone.now()
+
+        if options['clear']:
+            self.clear()
+        if CustomUser.objects.filter(username__startswith=f'{self.prefix}_').exists():
+            raise CommandError(f'"{self.prefix}" деректері бар: --clear қолданыңыз немесе басқа --prefix беріңіз')
+        if options['users'] < 2 or options['clubs'] < 1:
+            raise CommandError('Кемінде 2 пайдаланушы және 1 клуб керек')
+
+        user_ids = self.create_users(options['users'], options['clubs'])
+        club_ids, club_weights = self.create_clubs(options['clubs'], user_ids)
+        self.create_memberships(options['memberships'], user_ids, club_ids, club_weights)
+        self.create_events(options['events'], club_ids, club_weights)
+        self.create_notifications(options['notifications'], user_ids, club_ids, club_weights)
+        self.create_messages(options['messages'], user_ids)
+
+        CustomUser.objects.filter(
+            username__startswith=f'{self.prefix}_', role='user', club_memberships__status='approved',
+        ).update(role='member')
+        call_command('sync_member_counts', verbosity=0, stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS('Бенчмарк деректері дайын'))
+
+    def clear(self):
+        Club.objects.filter(name__startswith=f'{self.prefix}_').delete()
+        CustomUser.objects.filter(username__startswith=f'{self.prefix}_').delete()
+
+    def random_past(self, days=365):
+        return self.now - timedelta(seconds=self.rng.randint(0, days * 24 * 60 * 60))
+
+    def random_text(self, words):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words))
+
+    def in_batches(self, model, objects):
+        """Генераторды батчтармен bulk_create арқылы сақтау"""
+        ids = []
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                ids.extend(obj.pk for obj in model.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            ids.extend(obj.pk for obj in model.objects.bulk_create(batch))
+        self.stdout.write(f'{model._meta.verbose_name_plural}: {len(ids)}')
+        return ids
+
+    def create_users(self, count, clubs):
+        password = make_password(f'{self.prefix}-password')
+        admins = max(1, count // 20000)
+        leaders = min(count - admins, max(1, clubs // 2))
+
+        def users():
+            for index in range(count):
+                role = 'admin' if index < admins else 'leader' if index < admins + leaders else 'user'
+                yield CustomUser(
+                    username=f'{self.prefix}_{index}',
+                    email=f'{self.prefix}_{index}@bench.local',
+                    first_name=f'Студент{index}',
+                    role=role,
+                    student_id=f'{index:08d}',
+                    password=password,
+                    date_joined=self.random_past(),
+                )
+
+        return self.in_batches(CustomUser, users())
+
+    def create_clubs(self, count, user_ids):
+        leader_ids = list(
+            CustomUser.objects.filter(username__startswith=f'{self.prefix}_', role='leader').values_list('pk', flat=True)
+        )
+        created_at = Club._meta.get_field('created_at')
+
+        def clubs():
+            for index in range(count):
+                yield Club(
+                    name=f'{self.prefix}_{index} {self.random_text(2)}',
+                    description=self.random_text(30),
+                    category=self.rng.choice(CATEGORIES),
+                    leader_id=leader_ids[index % len(leader_ids)] if leader_ids else None,
+                    is_active=self.rng.random() > 0.05,
+                    created_at=self.random_past(),
+                )
+
+        with explicit_timestamps(created_at):
+            club_ids = self.in_batches(Club, clubs())
+        # Zipf тәрізді таралу: бірнеше клуб өте танымал, қалғандары аз
+        weights = list(accumulate(1 / (rank + 1) ** 1.1 for rank in range(len(club_ids))))
+        return club_ids, weights
+
+    def create_memberships(self, count, user_ids, club_ids, club_weights):
+        statuses = [status for status, _ in STATUS_WEIGHTS]
+        status_weights = list(accumulate(weight for _, weight in STATUS_WEIGHTS))
+        applied_at = Membership._meta.get_field('applied_at')
+
+        def memberships():
+            remaining = count
+            for index, user_id in enumerate(user_ids):
+                if remaining <= 0:
+                    return
+                per_user = remaining / (len(user_ids) - index)
+                wanted = min(remaining, len(club_ids), int(self.rng.expovariate(1 / per_user) + 0.5))
+                chosen = sorted(set(self.rng.choices(range(len(club_ids)), cum_weights=club_weights, k=wanted)))
+                remaining -= len(chosen)
+                for club_index in chosen:
+                    status = self.rng.choices(statuses, cum_weights=status_weights)[0]
+                    applied = self.random_past()
+                    yield Membership(
+                        user_id=user_id,
+                        club_id=club_ids[club_index],
+                        status=status,
+                        applied_at=applied,
+                        approved_at=applied + timedelta(days=self.rng.randint(0, 14)) if status == 'approved' else None,
+                    )
+
+        with explicit_timestamps(applied_at):
+            self.in_batches(Membership, memberships())
+
+    def create_events(self, count, club_ids, club_weights):
+        created_at = Event._meta.get_field('created_at')
+
+        def events():
+            for _ in range(count):
+                yield Event(
+                    title=self.random_text(3),
+                    description=self.random_text(20),
+                    club_id=self.rng.choices(club_ids, cum_weights=club_weights)[0],
+                    date=self.now + timedelta(days=self.rng.randint(-180, 180), hours=self.rng.randint(9, 20)),
+                    location=f'{self.rng.randint(100, 599)} аудитория',
+                    created_at=self.random_past(),
+                )
+
+        with explicit_timestamps(created_at):
+            self.in_batches(Event, events())
+
+    def create_notifications(self, count, user_ids, club_ids, club_weights):
+        created_at = Notification._meta.get_field('created_at')
+
+        def notifications():
+            for _ in range(count):
+                is_global = self.rng.random() < 0.1
+                yield Notification(
+                    title=self.random_text(4),
+                    content=self.random_text(25),
+                    notification_type=self.rng.choice(NOTIFICATION_TYPES),
+                    club_id=None if is_global else self.rng.choices(club_ids, cum_weights=club_weights)[0],
+                    created_by_id=user_ids[0],
+                    is_active=self.rng.random() > 0.1,
+                    created_at=self.random_past(),
+                )
+
+        with explicit_timestamps(created_at):
+            ids = self.in_batches(Notification, notifications())
+        if not ids:
+            return
+        created = Notification.objects.filter(pk__range=(min(ids), max(ids)))
+        for notification in created.filter(club__isnull=False).order_by('pk').iterator():
+            fan_out_notification(notification)
+        # Жалпы хабарландыруларды әр пайдаланушыға таратсақ, жол саны users × notifications болады:
+        # орнына жаңа пайдаланушы алатын шектеулі терезе (соңғы FEED_BACKFILL_LIMIT) жазылады
+        for start in range(0, len(user_ids), self.batch_size):
+            backfill_global_feed(user_ids[start:start + self.batch_size])
+        feed_items = UserFeedItem.objects.filter(notification__in=created).count()
+        self.stdout.write(f'{UserFeedItem._meta.verbose_name_plural}: {feed_items}')
+
+    def create_messages(self, count, user_ids):
+        sent_at = Message._meta.get_field('sent_at')
+
+        def messages():
+            for _ in range(count):
+                sender_id, receiver_id = self.rng.sample(user_ids, 2)
+                yield Message(
+                    sender_id=sender_id,
+                    receiver_id=receiver_id,
+                    subject=self.random_text(3),
+                    content=self.random_text(15),
+                    is_read=self.rng.random() < 0.8,
+                    sent_at=self.random_past(),
+                )
+
+        with explicit_timestamps(sent_at):
+            self.in_batches(Message, messages())
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+from clubs.models import Club
+
+class Command(BaseCommand):
+    help = 'Клубтардың мүшелер санағышын Membership кестесі бойынша тексеру және қайта құру'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Тек тексеру, ештеңе өзгертпеу')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        clubs = Club.objects.annotate(
+            actual=Count('members', filter=Q(members__status='approved'))
+        ).only('id', 'name', 'members_count').order_by('pk')
+
+        drifted = []
+        for club in clubs.iterator(chunk_size=options['batch_size']):
+            if club.members_count != club.actual:
+                if options['verbosity'] > 0:
+                    self.stdout.write(f'{club.name} (#{club.pk}): {club.members_count} -> {club.actual}')
+                club.members_count = club.actual
+                drifted.append(club)
+
+        if options['check']:
+            if drifted:
+                raise CommandError(f'{len(drifted)} клубтың санағышы сәйкес емес')
+            self.stdout.write(self.style.SUCCESS('Барлық санағыштар дұрыс'))
+            return
+
+        Club.objects.bulk_update(drifted, ['members_count'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{len(drifted)} клубтың санағышы жаңартылды'))
@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from .jobs import enqueue
+from .models import Membership, adjust_member_count
+from .pubsub import publish, user_topic
+from .snapshots import invalidate_user_snapshot
+from users.backends import invalidate_cached_users
+
+STATUS_LABELS = dict(Membership.STATUS_CHOICES)
+
+def status_counts(club):
+    """Клуб мүшеліктерінің мәртебелер бойынша саны, бір агрегат сұрауымен"""
+    return Membership.objects.filter(club=club).aggregate(**{
+        status: Count('pk', filter=Q(status=status)) for status in STATUS_LABELS
+    })
+
+def publish_decisions(club, user_ids, status):
+    for user_id in user_ids:
+        publish(user_topic(user_id), {
+            'type': 'membership',
+            'club_id': club.pk,
+            'club': club.name,
+            'status': status,
+            'status_display': STATUS_LABELS[status],
+        })
+
+def promote_members(user_ids):
+    """Қабылданған қарапайым пайдаланушыларды бір UPDATE-пен 'member' рөліне көтеру"""
+    promoted = get_user_model().objects.filter(pk__in=user_ids, role='user').update(role='member')
+    if promoted:
+        # UPDATE post_save жібермейді: сессиядағы кэштелген рөлді қолмен ескірту
+        invalidate_cached_users(*user_ids)
+    return promoted
+
+def lock_memberships(club, ids, statuses):
+    queryset = Membership.objects.filter(club=club, status__in=statuses)
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    return list(queryset.select_for_update().values_list('pk', 'user_id', 'status'))
+
+def approve_memberships(club, ids=None, notes=''):
+    """Таңдалған өтініштерді (ids=None болса, барлық күтудегілерді) бір UPDATE-пен қабылдау"""
+    statuses = ('pending', 'rejected') if ids is not None else ('pending',)
+    with transaction.atomic():
+        rows = lock_memberships(club, ids, statuses)
+        if not rows:
+            return 0
+        user_ids = [user_id for _, user_id, _ in rows]
+        Membership.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(
+            status='approved',
+            approved_at=timezone.now(),
+            notes=notes,
+        )
+        adjust_member_count(club.pk, len(rows))
+        promote_members(user_ids)
+        enqueue('feed.backfill_members', user_ids=user_ids, club_id=club.pk)
+    invalidate_user_snapshot(*user_ids)
+    publish_decisions(club, user_ids, 'approved')
+    return len(rows)
+
+def reject_memberships(club, ids, notes=''):
+    """Таңдалған өтініштерді бір UPDATE-пен қабылдамау; клуб лидері шығарылмайды.
+
+    (өзгертілгендер саны, олардың ішінде бұрын қабылданғандар саны) қайтарады.
+    """
+    with transaction.atomic():
+        rows = [
+            row for row in lock_memberships(club, ids, ('pending', 'approved'))
+            if row[1] != club.leader_id
+        ]
+        if not rows:
+            return 0, 0
+        user_ids = [user_id for _, user_id, _ in rows]
+        removed = [user_id for _, user_id, status in rows if status == 'approved']
+        Membership.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(status='rejected', notes=notes)
+        if removed:
+            adjust_member_count(club.pk, -len(removed))
+            enqueue('feed.remove_members', user_ids=removed, club_id=club.pk)
+    invalidate_user_snapshot(*user_ids)
+    publish_decisions(club, user_ids, 'rejected')
+    return len(rows), len(removed)
@@ -0,0 +1,75 @@
+import threading
+from collections import defaultdict, deque
+
+SAMPLE_SIZE = 1000
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+class ViewMetrics:
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self.requests = 0
+        self.budget_violations = 0
+        self.wall_ms = deque(maxlen=sample_size)
+        self.db_ms = deque(maxlen=sample_size)
+        self.template_ms = deque(maxlen=sample_size)
+        self.queries = deque(maxlen=sample_size)
+
+    def summary(self):
+        return {
+            'requests': self.requests,
+            'budget_violations': self.budget_violations,
+            'p50': percentile(self.wall_ms, 0.50),
+            'p95': percentile(self.wall_ms, 0.95),
+            'p99': percentile(self.wall_ms, 0.99),
+            'db_p95': percentile(self.db_ms, 0.95),
+            'template_p95': percentile(self.template_ms, 0.95),
+            'queries_p50': percentile(self.queries, 0.50),
+            'queries_max': max(self.queries, default=0),
+        }
+
+class MetricsRegistry:
+    """Процесс ішіндегі көрініс метрикаларының жинағы"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = defaultdict(ViewMetrics)
+        self.fragments = defaultdict(lambda: {'hits': 0, 'misses': 0, 'bypassed': 0})
+
+    def record(self, view_name, wall_ms, db_ms, template_ms, queries, over_budget=False):
+        with self.lock:
+            metrics = self.views[view_name]
+            metrics.requests += 1
+            metrics.budget_violations += int(over_budget)
+            metrics.wall_ms.append(wall_ms)
+            metrics.db_ms.append(db_ms)
+            metrics.template_ms.append(template_ms)
+            metrics.queries.append(queries)
+
+    def record_fragment(self, name, outcome):
+        with self.lock:
+            self.fragments[name][outcome] += 1
+
+    def snapshot(self):
+        with self.lock:
+            rows = [{'view': name, **metrics.summary()} for name, metrics in self.views.items()]
+        return sorted(rows, key=lambda row: row['p95'], reverse=True)
+
+    def fragment_snapshot(self):
+        with self.lock:
+            rows = [{'fragment': name, **counts} for name, counts in self.fragments.items()]
+        for row in rows:
+            lookups = row['hits'] + row['misses']
+            row['hit_rate'] = row['hits'] / lookups * 100 if lookups else 0
+        return sorted(rows, key=lambda row: row['fragment'])
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+            self.fragments.clear()
+
+registry = MetricsRegistry()
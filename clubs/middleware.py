@@ -0,0 +1,195 @@
+import contextvars
+import logging
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.template.backends.django import Template
+from .assets import scan_static_root
+from .metrics import registry
+from .routers import RoutingState, current_routing, replica_aliases
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = {'queries': 30, 'wall_ms': 500}
+
+current_timings = contextvars.ContextVar('request_timings', default=None)
+# Ішкі рендерлер (render_to_string, inclusion тегтері) сыртқысының уақытына кіреді
+template_depth = contextvars.ContextVar('template_depth', default=0)
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - start) * 1000
+
+def instrument_template_rendering():
+    """Шаблон рендерлеу уақытын ағымдағы сұрауға жазу үшін Template.render-ді орау"""
+    if getattr(Template.render, 'instrumented', False):
+        return
+    original_render = Template.render
+
+    def render(self, context=None, request=None):
+        timings = current_timings.get()
+        if timings is None:
+            return original_render(self, context, request)
+        depth = template_depth.get()
+        token = template_depth.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            template_depth.reset(token)
+            if not depth:
+                timings.template_ms += (time.perf_counter() - start) * 1000
+
+    render.instrumented = True
+    Template.render = render
+
+class RequestMetricsMiddleware:
+    """Әр көрініс үшін SQL саны, DB/шаблон/жалпы уақытын өлшеу.
+
+    ``REQUEST_METRICS_ENABLED`` өшірулі болса, Django бұл middleware-ді
+    тізбектен толығымен алып тастайды.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.budgets = getattr(settings, 'REQUEST_METRICS_BUDGETS', {})
+        self.default_budget = getattr(settings, 'REQUEST_METRICS_DEFAULT_BUDGET', DEFAULT_BUDGET)
+        instrument_template_rendering()
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else 'unresolved'
+        over_budget = self.check_budget(view_name, timings, wall_ms)
+        registry.record(view_name, wall_ms, timings.db_ms, timings.template_ms, timings.queries, over_budget)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timings.db_ms:.1f};desc="{timings.queries} queries"',
+            f'tpl;dur={timings.template_ms:.1f}',
+            f'total;dur={wall_ms:.1f}',
+        ])
+        return response
+
+    def check_budget(self, view_name, timings, wall_ms):
+        budget = {**self.default_budget, **self.budgets.get(view_name, {})}
+        over_budget = timings.queries > budget['queries'] or wall_ms > budget['wall_ms']
+        if over_budget:
+            logger.warning(
+                '%s бюджеттен асты: %d сұрау (шек %d), %.1f мс (шек %d)',
+                view_name, timings.queries, budget['queries'], wall_ms, budget['wall_ms'],
+            )
+        return over_budget
+
+class StaticAssetsMiddleware:
+    """STATIC_ROOT файлдарын процесс ішінде беру.
+
+    Хэштелген файлдар бір жылдық immutable кэшпен, клиент қабылдаса
+    алдын ала сығылған .br/.gz нұсқасымен беріледі. Индекс іске қосылғанда
+    бір рет құрылады, сондықтан collectstatic-тен кейін процесті қайта
+    іске қосу керек.
+    """
+
+    immutable_cache = 'public, max-age=31536000, immutable'
+    default_cache = 'public, max-age=60'
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'STATIC_SERVE', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.strip('/') + '/'
+        self.assets = scan_static_root(settings.STATIC_ROOT)
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            asset = self.assets.get(request.path_info[len(self.prefix):])
+            if asset is not None:
+                return self.serve(request, asset)
+        return self.get_response(request)
+
+    def serve(self, request, asset):
+        path, size, encoding = asset.variant(request.headers.get('Accept-Encoding', ''))
+        etag = asset.etag_for(encoding)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            if request.method == 'HEAD':
+                response = HttpResponse(content_type=asset.content_type)
+            else:
+                response = FileResponse(open(path, 'rb'), content_type=asset.content_type)
+            response['Content-Length'] = size
+            if encoding:
+                response['Content-Encoding'] = encoding
+            response['Last-Modified'] = asset.last_modified
+        response['ETag'] = etag
+        response['Cache-Control'] = self.immutable_cache if asset.immutable else self.default_cache
+        if asset.encodings:
+            response['Vary'] = 'Accept-Encoding'
+        return response
+
+class ReplicaRoutingMiddleware:
+    """Репликадан оқуды басқару.
+
+    Оқулар тек replica_safe көріністерде репликаға кетеді. Сұрау бірдеңе жазса,
+    браузерге REPLICA_PIN_SECONDS мерзімді cookie қойылады: сол уақыт ішінде
+    пайдаланушы өз жазбаларын негізгі базадан оқиды.
+    """
+
+    cookie_name = 'replica_pin'
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+    def __call__(self, request):
+        state = RoutingState(pinned=self.is_pinned(request))
+        token = current_routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        if state.wrote:
+            response.set_cookie(
+                self.cookie_name, str(time.time() + self.pin_seconds),
+                max_age=self.pin_seconds, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = current_routing.get()
+        if state is not None:
+            state.replica_allowed = getattr(view_func, 'replica_safe', False)
+
+    def is_pinned(self, request):
+        try:
+            return float(request.COOKIES.get(self.cookie_name, 0)) > time.time()
+        except ValueError:
+            return False
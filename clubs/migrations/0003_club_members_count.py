@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-18 02:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_members_count(apps, schema_editor):
+    Club = apps.get_model('clubs', 'Club')
+    Membership = apps.get_model('clubs', 'Membership')
+    approved = Membership.objects.filter(
+        club=OuterRef('pk'), status='approved'
+    ).order_by().values('club').annotate(total=Count('pk')).values('total')
+    Club.objects.update(members_count=Coalesce(Subquery(approved), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0002_alter_club_options_alter_event_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='members_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Мүшелер саны'),
+        ),
+        migrations.RunPython(populate_members_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 6.0 on 2026-10-18 02:56
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+FORWARD_SQL = [
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'clubs_search') THEN
+            CREATE TEXT SEARCH CONFIGURATION clubs_search (COPY = simple);
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'unaccent') THEN
+                CREATE EXTENSION IF NOT EXISTS unaccent;
+                ALTER TEXT SEARCH CONFIGURATION clubs_search
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+            END IF;
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION clubs_club_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('clubs_search', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('clubs_search', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER clubs_club_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF name, description, search_vector ON clubs_club
+        FOR EACH ROW EXECUTE FUNCTION clubs_club_search_vector_update()
+    """,
+    'CREATE INDEX clubs_club_search_vector_gin ON clubs_club USING gin (search_vector)',
+    'UPDATE clubs_club SET search_vector = NULL',
+]
+
+REVERSE_SQL = [
+    'DROP INDEX IF EXISTS clubs_club_search_vector_gin',
+    'DROP TRIGGER IF EXISTS clubs_club_search_vector_trigger ON clubs_club',
+    'DROP FUNCTION IF EXISTS clubs_club_search_vector_update()',
+    'DROP TEXT SEARCH CONFIGURATION IF EXISTS clubs_search',
+]
+
+
+def run_on_postgresql(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_club_members_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(run_on_postgresql(FORWARD_SQL), run_on_postgresql(REVERSE_SQL)),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 6.0 on 2026-10-18 03:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_club_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='club',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name'], name='club_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='club',
+            index=models.Index(fields=['category', 'name'], name='club_category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['club', 'date'], name='event_club_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date'], name='event_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['user', 'status'], name='membership_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['club', 'status'], name='membership_club_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['club', '-applied_at'], name='membership_club_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['receiver', 'is_read'], name='message_receiver_read_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['receiver', '-sent_at', '-id'], name='message_receiver_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['sender', '-sent_at', '-id'], name='message_sender_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='notification_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['club', '-created_at'], name='notification_club_active_idx'),
+        ),
+    ]
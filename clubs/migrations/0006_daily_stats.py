@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-18 03:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0005_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Күні')),
+                ('users_total', models.PositiveIntegerField(default=0, verbose_name='Пайдаланушылар саны')),
+                ('new_users', models.PositiveIntegerField(default=0, verbose_name='Жаңа пайдаланушылар')),
+                ('new_memberships', models.PositiveIntegerField(default=0, verbose_name='Жаңа өтініштер')),
+                ('new_notifications', models.PositiveIntegerField(default=0, verbose_name='Хабарландырулар')),
+                ('new_events', models.PositiveIntegerField(default=0, verbose_name='Іс-шаралар')),
+            ],
+            options={
+                'verbose_name': 'Платформаның күндік статистикасы',
+                'verbose_name_plural': 'Платформаның күндік статистикасы',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyClubStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Күні')),
+                ('members_total', models.PositiveIntegerField(default=0, verbose_name='Мүшелер саны')),
+                ('new_applications', models.PositiveIntegerField(default=0, verbose_name='Жаңа өтініштер')),
+                ('new_approvals', models.PositiveIntegerField(default=0, verbose_name='Бекітілген өтініштер')),
+                ('new_notifications', models.PositiveIntegerField(default=0, verbose_name='Хабарландырулар')),
+                ('new_events', models.PositiveIntegerField(default=0, verbose_name='Іс-шаралар')),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='clubs.club', verbose_name='Клуб')),
+            ],
+            options={
+                'verbose_name': 'Клубтың күндік статистикасы',
+                'verbose_name_plural': 'Клубтардың күндік статистикасы',
+                'ordering': ['club', 'date'],
+                'unique_together': {('club', 'date')},
+            },
+        ),
+    ]
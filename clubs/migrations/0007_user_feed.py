@@ -0,0 +1,55 @@
+# Generated by Django 6.0 on 2026-10-18 03:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_feed(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Membership = apps.get_model('clubs', 'Membership')
+    Notification = apps.get_model('clubs', 'Notification')
+    UserFeedItem = apps.get_model('clubs', 'UserFeedItem')
+    active_user_ids = list(User.objects.filter(is_active=True).values_list('pk', flat=True))
+
+    for notification in Notification.objects.filter(is_active=True).select_related('club').iterator():
+        if notification.club_id is None:
+            user_ids = active_user_ids
+        else:
+            user_ids = set(Membership.objects.filter(
+                club_id=notification.club_id, status='approved'
+            ).values_list('user_id', flat=True))
+            if notification.club.leader_id:
+                user_ids.add(notification.club.leader_id)
+        UserFeedItem.objects.bulk_create([
+            UserFeedItem(user_id=user_id, notification_id=notification.pk, created_at=notification.created_at)
+            for user_id in user_ids
+        ], batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0006_daily_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserFeedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(verbose_name='Жасалған уақыты')),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_items', to='clubs.notification', verbose_name='Хабарландыру')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_items', to=settings.AUTH_USER_MODEL, verbose_name='Пайдаланушы')),
+            ],
+            options={
+                'verbose_name': 'Лента жазбасы',
+                'verbose_name_plural': 'Лента жазбалары',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['user', '-created_at', '-id'], name='feed_user_created_idx')],
+                'unique_together': {('user', 'notification')},
+            },
+        ),
+        migrations.RunPython(populate_feed, migrations.RunPython.noop),
+    ]
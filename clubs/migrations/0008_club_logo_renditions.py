@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0007_user_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='logo_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Логотип нұсқалары'),
+        ),
+    ]
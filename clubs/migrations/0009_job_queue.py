@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-18 14:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0008_club_logo_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Тапсырма')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Параметрлер')),
+                ('status', models.CharField(choices=[('queued', 'Кезекте'), ('running', 'Орындалуда'), ('done', 'Орындалды'), ('failed', 'Сәтсіз')], default='queued', max_length=10, verbose_name='Мәртебесі')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Әрекеттер саны')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5, verbose_name='Ең көп әрекет')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Орындау уақыты')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Құрылған уақыты')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Басталған уақыты')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Аяқталған уақыты')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Жұмысшы')),
+                ('last_error', models.TextField(blank=True, verbose_name='Соңғы қате')),
+            ],
+            options={
+                'verbose_name': 'Фондық тапсырма',
+                'verbose_name_plural': 'Фондық тапсырмалар',
+                'ordering': ['run_at', 'id'],
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['run_at', 'id'], name='job_queued_run_at_idx'), models.Index(fields=['status', '-finished_at'], name='job_status_finished_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-18 16:05
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_attendees_count(apps, schema_editor):
+    Event = apps.get_model('clubs', 'Event')
+    EventAttendance = apps.get_model('clubs', 'EventAttendance')
+    seats = EventAttendance.objects.filter(
+        event=OuterRef('pk'), status__in=['registered', 'attended', 'absent']
+    ).order_by().values('event').annotate(total=Count('pk')).values('total')
+    Event.objects.update(attendees_count=Coalesce(Subquery(seats), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0009_job_queue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendees_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Қатысушылар саны'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Бос қалдырсаңыз, шектеусіз', null=True, verbose_name='Орын саны'),
+        ),
+        migrations.RunPython(populate_attendees_count, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='eventattendance',
+            name='status',
+            field=models.CharField(choices=[('registered', 'Тіркелген'), ('waitlisted', 'Күту тізімінде'), ('attended', 'Қатысқан'), ('absent', 'Қатыспаған')], default='registered', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='eventattendance',
+            index=models.Index(fields=['event', 'status', 'registered_at'], name='attendance_event_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.CheckConstraint(condition=models.Q(('capacity__isnull', True), ('attendees_count__lte', models.F('capacity')), _connector='OR'), name='event_attendees_within_capacity'),
+        ),
+    ]
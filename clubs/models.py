@@ -1,4 +1,6 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F
 from django.conf import settings
 from django.utils import timezone
 
@@ -19,7 +21,10 @@ class Club(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Құрылған уақыты")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Жаңартылған уақыты")
     logo = models.ImageField(upload_to='club_logos/', blank=True, null=True, verbose_name="Логотип")
+    logo_renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Логотип нұсқалары")
     is_active = models.BooleanField(default=True, verbose_name="Белсенді")
+    members_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Мүшелер саны")
+    search_vector = SearchVectorField(null=True, editable=False)
     
     leader = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -34,12 +39,25 @@ class Club(models.Model):
         ordering = ['name']
         verbose_name = "Клуб"
         verbose_name_plural = "Клубтар"
+        indexes = [
+            models.Index(fields=['name'], condition=models.Q(is_active=True), name='club_active_name_idx'),
+            models.Index(fields=['category', 'name'], name='club_category_name_idx'),
+        ]
     
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        # Санағышты тек adjust_member_count өзгертеді: өңдеу кезінде ескі мәнмен қайта жазбау
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'members_count'
+            ]
+        super().save(*args, **kwargs)
+    
     def member_count(self):
-        return self.members.filter(status='approved').count()
+        return self.members_count
     
     def get_active_members(self):
         return self.members.filter(status='approved').select_related('user')
@@ -63,10 +81,26 @@ class Membership(models.Model):
         ordering = ['-applied_at']
         verbose_name = "Мүшелік"
         verbose_name_plural = "Мүшеліктер"
+        indexes = [
+            models.Index(fields=['user', 'status'], name='membership_user_status_idx'),
+            models.Index(fields=['club', 'status'], name='membership_club_status_idx'),
+            models.Index(
+                fields=['club', '-applied_at'],
+                condition=models.Q(status='approved'),
+                name='membership_club_approved_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.club.name} ({self.get_status_display()})"
 
+def adjust_member_count(club_id, delta):
+    """Клубтың мүшелер санағышын F() арқылы өзгерту"""
+    if delta:
+        from .fragments import bump_club_version
+        Club.objects.filter(pk=club_id).update(members_count=F('members_count') + delta)
+        bump_club_version('members', club_id)
+
 class Notification(models.Model):
     NOTIFICATION_TYPES = (
         ('announcement', 'Хабарландыру'),
@@ -88,16 +122,43 @@ class Notification(models.Model):
         ordering = ['-created_at']
         verbose_name = "Хабарландыру"
         verbose_name_plural = "Хабарландырулар"
+        indexes = [
+            models.Index(fields=['-created_at'], condition=models.Q(is_active=True), name='notification_active_idx'),
+            models.Index(
+                fields=['club', '-created_at'],
+                condition=models.Q(is_active=True),
+                name='notification_club_active_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.title
 
+class UserFeedItem(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='feed_items', verbose_name="Пайдаланушы")
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='feed_items', verbose_name="Хабарландыру")
+    created_at = models.DateTimeField(verbose_name="Жасалған уақыты")
+    
+    class Meta:
+        unique_together = ('user', 'notification')
+        ordering = ['-created_at', '-id']
+        verbose_name = "Лента жазбасы"
+        verbose_name_plural = "Лента жазбалары"
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='feed_user_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.notification_id}"
+
 class Event(models.Model):
     title = models.CharField(max_length=200, verbose_name="Іс-шара аты")
     description = models.TextField(verbose_name="Сипаттама")
     club = models.ForeignKey(Club, on_delete=models.CASCADE, related_name='events', verbose_name="Клуб")
     date = models.DateTimeField(verbose_name="Күні мен уақыты")
     location = models.CharField(max_length=200, verbose_name="Орын")
+    capacity = models.PositiveIntegerField(null=True, blank=True, verbose_name="Орын саны", help_text="Бос қалдырсаңыз, шектеусіз")
+    attendees_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Қатысушылар саны")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Құрылған уақыты")
     attendees = models.ManyToManyField(settings.AUTH_USER_MODEL, through='EventAttendance', blank=True, verbose_name="Қатысушылар")
     
@@ -105,19 +166,43 @@ class Event(models.Model):
         ordering = ['date']
         verbose_name = "Іс-шара"
         verbose_name_plural = "Іс-шаралар"
+        indexes = [
+            models.Index(fields=['club', 'date'], name='event_club_date_idx'),
+            models.Index(fields=['date'], name='event_date_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(capacity__isnull=True) | models.Q(attendees_count__lte=F('capacity')),
+                name='event_attendees_within_capacity',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.club.name}"
     
+    def save(self, *args, **kwargs):
+        # Санағышты тек rsvp-тегі шартты UPDATE өзгертеді: өңдеу кезінде ескі мәнмен қайта жазбау
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'attendees_count'
+            ]
+        super().save(*args, **kwargs)
+    
     def attendee_count(self):
-        return self.attendees.count()
+        return self.attendees_count
+    
+    def is_full(self):
+        return self.capacity is not None and self.attendees_count >= self.capacity
 
 class EventAttendance(models.Model):
     ATTENDANCE_CHOICES = (
         ('registered', 'Тіркелген'),
+        ('waitlisted', 'Күту тізімінде'),
         ('attended', 'Қатысқан'),
         ('absent', 'Қатыспаған'),
     )
+    SEAT_STATUSES = ('registered', 'attended', 'absent')
     
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -128,6 +213,9 @@ class EventAttendance(models.Model):
         unique_together = ('event', 'user')
         verbose_name = "Іс-шараға қатысу"
         verbose_name_plural = "Іс-шараға қатысулар"
+        indexes = [
+            models.Index(fields=['event', 'status', 'registered_at'], name='attendance_event_status_idx'),
+        ]
 
 class Message(models.Model):
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='sent_messages', verbose_name="Жіберуші")
@@ -141,6 +229,82 @@ class Message(models.Model):
         ordering = ['-sent_at']
         verbose_name = "Хабар"
         verbose_name_plural = "Хабарлар"
+        indexes = [
+            models.Index(fields=['receiver', 'is_read'], name='message_receiver_read_idx'),
+            models.Index(fields=['receiver', '-sent_at', '-id'], name='message_receiver_sent_idx'),
+            models.Index(fields=['sender', '-sent_at', '-id'], name='message_sender_sent_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.sender} -> {self.receiver}: {self.subject}"
+
+class DailyClubStats(models.Model):
+    club = models.ForeignKey(Club, on_delete=models.CASCADE, related_name='daily_stats', verbose_name="Клуб")
+    date = models.DateField(verbose_name="Күні")
+    members_total = models.PositiveIntegerField(default=0, verbose_name="Мүшелер саны")
+    new_applications = models.PositiveIntegerField(default=0, verbose_name="Жаңа өтініштер")
+    new_approvals = models.PositiveIntegerField(default=0, verbose_name="Бекітілген өтініштер")
+    new_notifications = models.PositiveIntegerField(default=0, verbose_name="Хабарландырулар")
+    new_events = models.PositiveIntegerField(default=0, verbose_name="Іс-шаралар")
+    
+    class Meta:
+        unique_together = ('club', 'date')
+        ordering = ['club', 'date']
+        verbose_name = "Клубтың күндік статистикасы"
+        verbose_name_plural = "Клубтардың күндік статистикасы"
+    
+    def __str__(self):
+        return f"{self.club_id} - {self.date}"
+
+class DailyPlatformStats(models.Model):
+    date = models.DateField(unique=True, verbose_name="Күні")
+    users_total = models.PositiveIntegerField(default=0, verbose_name="Пайдаланушылар саны")
+    new_users = models.PositiveIntegerField(default=0, verbose_name="Жаңа пайдаланушылар")
+    new_memberships = models.PositiveIntegerField(default=0, verbose_name="Жаңа өтініштер")
+    new_notifications = models.PositiveIntegerField(default=0, verbose_name="Хабарландырулар")
+    new_events = models.PositiveIntegerField(default=0, verbose_name="Іс-шаралар")
+    
+    class Meta:
+        ordering = ['date']
+        verbose_name = "Платформаның күндік статистикасы"
+        verbose_name_plural = "Платформаның күндік статистикасы"
     
     def __str__(self):
-        return f"{self.sender} -> {self.receiver}: {self.subject}"
\ No newline at end of file
+        return str(self.date)
+
+class Job(models.Model):
+    STATUS_CHOICES = (
+        ('queued', 'Кезекте'),
+        ('running', 'Орындалуда'),
+        ('done', 'Орындалды'),
+        ('failed', 'Сәтсіз'),
+    )
+    
+    name = models.CharField(max_length=100, verbose_name="Тапсырма")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Параметрлер")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued', verbose_name="Мәртебесі")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Әрекеттер саны")
+    max_attempts = models.PositiveSmallIntegerField(default=5, verbose_name="Ең көп әрекет")
+    run_at = models.DateTimeField(default=timezone.now, verbose_name="Орындау уақыты")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Құрылған уақыты")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Басталған уақыты")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Аяқталған уақыты")
+    worker = models.CharField(max_length=100, blank=True, verbose_name="Жұмысшы")
+    last_error = models.TextField(blank=True, verbose_name="Соңғы қате")
+    
+    class Meta:
+        ordering = ['run_at', 'id']
+        verbose_name = "Фондық тапсырма"
+        verbose_name_plural = "Фондық тапсырмалар"
+        indexes = [
+            models.Index(
+                fields=['run_at', 'id'],
+                condition=models.Q(status='queued'),
+                name='job_queued_run_at_idx',
+            ),
+            models.Index(fields=['status', '-finished_at'], name='job_status_finished_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
+
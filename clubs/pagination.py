@@ -0,0 +1,68 @@
+import base64
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+class KeysetPage:
+    def __init__(self, items, next_cursor):
+        self.object_list = items
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+def encode_cursor(timestamp, pk):
+    raw = f'{timestamp.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Курсорды (уақыт, id) жұбына айналдыру, қате болса None"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, pk = base64.urlsafe_b64decode(padded).decode().split('|')
+        timestamp = parse_datetime(timestamp)
+        if timestamp is None:
+            return None
+        return timestamp, int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def keyset_page(queryset, cursor=None, per_page=20, field='sent_at'):
+    """(field, id) бойынша кему ретімен курсорлы беттеу"""
+    queryset = queryset.order_by(f'-{field}', '-id')
+
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        timestamp, pk = position
+        queryset = queryset.filter(
+            Q(**{f'{field}__lt': timestamp}) | Q(**{field: timestamp, 'id__lt': pk})
+        )
+
+    items = list(queryset[:per_page + 1])
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+    return KeysetPage(items, next_cursor)
+
+class CountedPaginator(Paginator):
+    """Жалпы саны алдын ала белгілі Paginator: қосымша COUNT сұрауы жоқ"""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.known_count = count
+
+    @cached_property
+    def count(self):
+        return self.known_count
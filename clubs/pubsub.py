@@ -0,0 +1,184 @@
+import asyncio
+import json
+import logging
+import threading
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_TOPIC = 'global'
+SUBSCRIPTION_QUEUE_SIZE = getattr(settings, 'PUBSUB_QUEUE_SIZE', 100)
+# Бұл брокерлер оқиғаны тек өз процесіне таратады: WSGI мен тапсырма жұмысшыларындағы
+# жарияланымдар ASGI процесіндегі SSE жазылушыларына жетпейді
+PROCESS_LOCAL_BROKERS = {'clubs.pubsub.LocalBroker'}
+
+def user_topic(user_id):
+    return f'user:{user_id}'
+
+def club_topic(club_id):
+    return f'club:{club_id}'
+
+class Subscription:
+    """Бір SSE қосылымының тақырыптары мен оқиғалар кезегі"""
+
+    def __init__(self, broker, topics):
+        self.broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+        self.topics = set()
+        for topic in topics:
+            self.add(topic)
+
+    def add(self, topic):
+        if topic not in self.topics:
+            self.topics.add(topic)
+            self.broker.attach(topic, self)
+
+    def discard(self, topic):
+        if topic in self.topics:
+            self.topics.remove(topic)
+            self.broker.detach(topic, self)
+
+    def put(self, event):
+        """Кез келген ағыннан шақыруға болады: оқиға жазылушының циклына беріледі"""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning('Жазылушы кезегі толы, оқиға тасталды: %s', event.get('type'))
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        for topic in list(self.topics):
+            self.discard(topic)
+
+class LocalBroker:
+    """Бір процесс ішіндегі жазылушыларға оқиғаларды тарату"""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics):
+        return Subscription(self, topics)
+
+    def attach(self, topic, subscription):
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+
+    def detach(self, topic, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(topic)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def publish(self, topic, event):
+        self.dispatch(topic, event)
+
+    def dispatch(self, topic, event, loop=None):
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            if loop is None or subscription.loop is loop:
+                subscription.put(event)
+
+class PostgresBroker(LocalBroker):
+    """pg_notify арқылы барлық процестерге тарату.
+
+    Әр оқиғалар циклы бір LISTEN қосылымын ұстайды да, келген оқиғаны
+    өз жазылушыларына таратады.
+    """
+
+    channel = 'clubs_events'
+    reconnect_delay = 5
+
+    def __init__(self, alias='default'):
+        super().__init__()
+        self.alias = alias
+        self._listeners = {}
+
+    def publish(self, topic, event):
+        payload = json.dumps({'topic': topic, 'event': event}, cls=DjangoJSONEncoder)
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    def subscribe(self, topics):
+        loop = asyncio.get_running_loop()
+        listener = self._listeners.get(loop)
+        if listener is None or listener.done():
+            self._listeners[loop] = loop.create_task(self.listen(loop))
+        return super().subscribe(topics)
+
+    def connection_params(self):
+        db = settings.DATABASES[self.alias]
+        params = {
+            'dbname': db['NAME'],
+            'user': db.get('USER'),
+            'password': db.get('PASSWORD'),
+            'host': db.get('HOST'),
+            'port': db.get('PORT'),
+        }
+        return {key: value for key, value in params.items() if value}
+
+    async def listen(self, loop):
+        import psycopg
+
+        while True:
+            try:
+                conn = await psycopg.AsyncConnection.connect(autocommit=True, **self.connection_params())
+                async with conn:
+                    await conn.execute(f'LISTEN {self.channel}')
+                    async for notify in conn.notifies():
+                        try:
+                            message = json.loads(notify.payload)
+                        except ValueError:
+                            continue
+                        self.dispatch(message['topic'], message['event'], loop=loop)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('LISTEN қосылымы үзілді, %s секундтан кейін қайта қосыламыз', self.reconnect_delay)
+                await asyncio.sleep(self.reconnect_delay)
+
+def ensure_shared_broker():
+    """SSE процесс-жергілікті брокермен іске қосылса, бірден тоқтату (DEBUG-тен басқа кезде).
+
+    Әйтпесе ағындар ашылады, бірақ басқа процестердегі оқиғалар оларға ешқашан келмейді.
+    """
+    backend = getattr(settings, 'PUBSUB_BACKEND', 'clubs.pubsub.LocalBroker')
+    if backend in PROCESS_LOCAL_BROKERS and not settings.DEBUG:
+        raise ImproperlyConfigured(
+            f'SSE ағыны ортақ брокерді талап етеді, ал PUBSUB_BACKEND = {backend}. '
+            "'clubs.pubsub.PostgresBroker' орнатыңыз."
+        )
+
+_broker = None
+_broker_lock = threading.Lock()
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = getattr(settings, 'PUBSUB_BACKEND', 'clubs.pubsub.LocalBroker')
+                _broker = import_string(backend)()
+    return _broker
+
+def publish(topic, event):
+    """Транзакция сәтті аяқталғаннан кейін оқиғаны жариялау"""
+    def send():
+        try:
+            get_broker().publish(topic, event)
+        except Exception:
+            logger.exception('Оқиғаны жариялау сәтсіз аяқталды: %s', topic)
+    transaction.on_commit(send)
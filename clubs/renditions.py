@@ -0,0 +1,42 @@
+import os
+from PIL import Image, ImageOps
+
+FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+def rendition_name(source_name, width, fmt):
+    directory, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+    return f'renditions/{directory}/{stem}-{width}.{FORMATS[fmt][1]}'
+
+def flatten(image):
+    """JPEG мөлдірлікті қолдамайды: ақ фонға салу"""
+    if image.mode == 'RGB':
+        return image
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+    return background
+
+def render_renditions(media_root, source_name, widths):
+    """Суреттің тұрақты енді WebP/JPEG нұсқаларын жасау.
+
+    Жеке процесте орындалады, сондықтан тек Pillow мен файл жолдарын қолданады.
+    """
+    with Image.open(os.path.join(media_root, source_name)) as source:
+        image = ImageOps.exif_transpose(source)
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+
+        renditions = {'width': image.width, 'height': image.height, 'webp': {}, 'jpeg': {}}
+        for width in sorted({min(width, image.width) for width in widths}):
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt, (pil_format, _, options) in FORMATS.items():
+                name = rendition_name(source_name, width, fmt)
+                path = os.path.join(media_root, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                frame = flatten(resized) if pil_format == 'JPEG' else resized
+                frame.save(path, pil_format, **options)
+                renditions[fmt][str(width)] = name
+    return renditions
@@ -0,0 +1,182 @@
+from datetime import datetime, time, timedelta
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from .models import Club, Membership, Notification, Event, DailyClubStats, DailyPlatformStats
+from users.models import CustomUser
+
+PLATFORM_FIELDS = ['users_total', 'new_users', 'new_memberships', 'new_notifications', 'new_events']
+CLUB_FIELDS = ['members_total', 'new_applications', 'new_approvals', 'new_notifications', 'new_events']
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+def date_range(start, end):
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+def counts_by_day(queryset, field, start, end, *group_by):
+    """[start, end] аралығындағы жазбаларды күн (және group_by) бойынша санау"""
+    rows = queryset.filter(**{
+        f'{field}__gte': day_start(start),
+        f'{field}__lt': day_start(end + timedelta(days=1)),
+    }).order_by().annotate(day=TruncDate(field)).values('day', *group_by).annotate(total=Count('id'))
+    return {(row['day'], *(row[key] for key in group_by)): row['total'] for row in rows}
+
+def get_watermark():
+    return DailyPlatformStats.objects.order_by('-date').values_list('date', flat=True).first()
+
+def first_activity_date():
+    first_joined = CustomUser.objects.aggregate(first=Min('date_joined'))['first']
+    return timezone.localdate(first_joined) if first_joined else timezone.localdate()
+
+def rollup(since=None, until=None):
+    """Күндік статистиканы соңғы өңделген күннен бастап толтыру.
+
+    Соңғы өңделген күн қайта есептеледі, себебі ол толық болмауы мүмкін.
+    Клуб мүшелерінің саны қазіргі қабылданған мүшеліктерден шығарылады,
+    сондықтан шыққан мүшелер санды алдыңғы жолдардан қайта ұлғайтпайды;
+    бүгінгі жол ``Club.members_count`` санағышымен түзетіледі.
+    """
+    today = timezone.localdate()
+    until = min(until or today, today)
+    if since is None:
+        since = get_watermark() or first_activity_date()
+    if since > until:
+        return 0, 0
+
+    days = date_range(since, until)
+    platform_rows = rollup_platform(days)
+    club_rows = rollup_clubs(days, today)
+    return platform_rows, club_rows
+
+def rollup_platform(days):
+    start, end = days[0], days[-1]
+    new_users = counts_by_day(CustomUser.objects.all(), 'date_joined', start, end)
+    new_memberships = counts_by_day(Membership.objects.all(), 'applied_at', start, end)
+    new_notifications = counts_by_day(Notification.objects.all(), 'created_at', start, end)
+    new_events = counts_by_day(Event.objects.all(), 'created_at', start, end)
+
+    previous = DailyPlatformStats.objects.filter(date__lt=start).order_by('-date').first()
+    users_total = previous.users_total if previous else CustomUser.objects.filter(date_joined__lt=day_start(start)).count()
+
+    rows = []
+    for day in days:
+        users_total += new_users.get((day,), 0)
+        rows.append(DailyPlatformStats(
+            date=day,
+            users_total=users_total,
+            new_users=new_users.get((day,), 0),
+            new_memberships=new_memberships.get((day,), 0),
+            new_notifications=new_notifications.get((day,), 0),
+            new_events=new_events.get((day,), 0),
+        ))
+    DailyPlatformStats.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['date'], update_fields=PLATFORM_FIELDS,
+    )
+    return len(rows)
+
+def approved_members():
+    """Қазіргі мүшелер және олардың қабылданған уақыты"""
+    return Membership.objects.filter(status='approved').annotate(joined_at=Coalesce('approved_at', 'applied_at'))
+
+def rollup_clubs(days, today):
+    start, end = days[0], days[-1]
+    applications = counts_by_day(Membership.objects.all(), 'applied_at', start, end, 'club_id')
+    approvals = counts_by_day(approved_members(), 'joined_at', start, end, 'club_id')
+    notifications = counts_by_day(Notification.objects.exclude(club=None), 'created_at', start, end, 'club_id')
+    events = counts_by_day(Event.objects.all(), 'created_at', start, end, 'club_id')
+
+    clubs = Club.objects.all()
+    if end != today:
+        clubs = clubs.filter(pk__in={key[1] for counts in (applications, approvals, notifications, events) for key in counts})
+    # Жойылған мүшеліктер із қалдырмайды: алдыңғы жолға бекітулерді қосу шыққандарды
+    # ескермей санды өсіре береді, сондықтан бастапқы мән қазіргі мүшелерден алынады
+    clubs = clubs.order_by().annotate(
+        previous_total=Subquery(
+            approved_members().filter(club=OuterRef('pk'), joined_at__lt=day_start(start))
+            .order_by().values('club').annotate(total=Count('id')).values('total')
+        ),
+    ).values_list('pk', 'previous_total', 'members_count')
+
+    rows = []
+    for club_id, previous_total, members_count in clubs:
+        members_total = previous_total or 0
+        for day in days:
+            key = (day, club_id)
+            members_total += approvals.get(key, 0)
+            active = any(key in counts for counts in (applications, approvals, notifications, events))
+            if day == today and members_total != members_count:
+                members_total = members_count
+                active = True
+            if not active:
+                continue
+            rows.append(DailyClubStats(
+                club_id=club_id,
+                date=day,
+                members_total=members_total,
+                new_applications=applications.get(key, 0),
+                new_approvals=approvals.get(key, 0),
+                new_notifications=notifications.get(key, 0),
+                new_events=events.get(key, 0),
+            ))
+    DailyClubStats.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['club', 'date'], update_fields=CLUB_FIELDS,
+        batch_size=1000,
+    )
+    return len(rows)
+
+def platform_series(days=30):
+    """Соңғы ``days`` күндегі платформа көрсеткіштері"""
+    end = timezone.localdate()
+    labels = date_range(end - timedelta(days=days - 1), end)
+    rows = {row.date: row for row in DailyPlatformStats.objects.filter(date__gte=labels[0])}
+    previous = DailyPlatformStats.objects.filter(date__lt=labels[0]).order_by('-date').first()
+
+    users_total = previous.users_total if previous else 0
+    series = {field: [] for field in PLATFORM_FIELDS}
+    for day in labels:
+        row = rows.get(day)
+        if row:
+            users_total = row.users_total
+        series['users_total'].append(users_total)
+        for field in PLATFORM_FIELDS[1:]:
+            series[field].append(getattr(row, field) if row else 0)
+
+    weeks = sorted({day - timedelta(days=day.weekday()) for day in labels})
+    weekly = {field: [0] * len(weeks) for field in ('new_notifications', 'new_events')}
+    for index, day in enumerate(labels):
+        week = weeks.index(day - timedelta(days=day.weekday()))
+        for field in weekly:
+            weekly[field][week] += series[field][index]
+
+    return {
+        'labels': [day.isoformat() for day in labels],
+        **series,
+        'weeks': [week.isoformat() for week in weeks],
+        'weekly_notifications': weekly['new_notifications'],
+        'weekly_events': weekly['new_events'],
+    }
+
+def club_member_series(clubs, days=30):
+    """Берілген клубтардың мүшелер санының күндік қатары"""
+    end = timezone.localdate()
+    labels = date_range(end - timedelta(days=days - 1), end)
+    clubs = list(clubs.annotate(
+        previous_total=Subquery(
+            DailyClubStats.objects.filter(club=OuterRef('pk'), date__lt=labels[0])
+            .order_by('-date').values('members_total')[:1]
+        ),
+    ))
+    rows = {}
+    for row in DailyClubStats.objects.filter(club__in=[club.pk for club in clubs], date__gte=labels[0]):
+        rows[row.club_id, row.date] = row.members_total
+
+    datasets = []
+    for club in clubs:
+        members_total = club.previous_total or 0
+        data = []
+        for day in labels:
+            members_total = rows.get((club.pk, day), members_total)
+            data.append(members_total)
+        datasets.append({'label': club.name, 'data': data})
+    return {'labels': [day.isoformat() for day in labels], 'datasets': datasets}
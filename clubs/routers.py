@@ -0,0 +1,76 @@
+import contextvars
+import random
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Сессияны кэш өткізіп алғанда репликадан ескі нұсқасын оқу пайдаланушыны шығарып жіберер еді
+PRIMARY_ONLY_APPS = {'sessions'}
+
+current_routing = contextvars.ContextVar('db_routing', default=None)
+
+class RoutingState:
+    """Бір сұраудың (немесе replica_reads блогының) оқу маршруты"""
+
+    def __init__(self, replica_allowed=False, pinned=False):
+        self.replica_allowed = replica_allowed
+        self.pinned = pinned
+        self.wrote = False
+        self.alias = None
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+def replica_safe(view):
+    """Көрініс ескіруі мүмкін (бірнеше секунд) деректерді репликадан оқи алады"""
+    view.replica_safe = True
+    return view
+
+@contextmanager
+def replica_reads():
+    """Сұраудан тыс кодта (командалар, тапсырмалар) оқуды репликаға жіберу"""
+    token = current_routing.set(RoutingState(replica_allowed=True))
+    try:
+        yield
+    finally:
+        current_routing.reset(token)
+
+def read_alias():
+    state = current_routing.get()
+    replicas = replica_aliases()
+    if (
+        not replicas or state is None or not state.replica_allowed or state.pinned or state.wrote
+        # Транзакция ішіндегі оқулар (select_for_update т.б.) өз жазбаларын көруі керек
+        or connections[DEFAULT_DB_ALIAS].in_atomic_block
+    ):
+        return DEFAULT_DB_ALIAS
+    if state.alias is None:
+        # Бір сұрау ішінде бір репликада қалу: беттің бөліктері бір-біріне сәйкес болады
+        state.alias = random.choice(replicas)
+    return state.alias
+
+class ReplicaRouter:
+    """Оқуларды DATABASE_REPLICAS-қа, жазуларды default-қа жіберу"""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Репликалар default-тың көшірмесі: олардан оқылған объектілерді байланыстыруға болады
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,95 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from .fragments import bump_club_version
+from .models import Event, EventAttendance
+from .pubsub import publish, user_topic
+
+def attendance_status(event, user):
+    return EventAttendance.objects.filter(event=event, user=user).values_list('status', flat=True).first()
+
+def claim_seat(event_id):
+    """Бос орын болса, санағышты шартты UPDATE-пен арттыру.
+
+    WHERE attendees_count < capacity тексеруі мен арттыру бір сұрауда орындалады,
+    сондықтан қатар тіркелулер орын санынан асып кетпейді.
+    """
+    return Event.objects.filter(pk=event_id).filter(
+        Q(capacity__isnull=True) | Q(attendees_count__lt=F('capacity'))
+    ).update(attendees_count=F('attendees_count') + 1) == 1
+
+def register_attendance(event, user):
+    """Іс-шараға тіркеу: орын болса 'registered', болмаса 'waitlisted' қайтарады"""
+    status = attendance_status(event, user)
+    if status:
+        return status
+    try:
+        with transaction.atomic():
+            status = 'registered' if claim_seat(event.pk) else 'waitlisted'
+            EventAttendance.objects.create(event=event, user=user, status=status)
+    except IntegrityError:
+        # Сол пайдаланушының қатар жіберілген сұрауы бізден бұрын тіркеліп үлгерді
+        return attendance_status(event, user)
+    if status == 'waitlisted':
+        # Біз кезекке тұрғанша біреу бас тартқан болуы мүмкін
+        fill_from_waitlist(event)
+    return status
+
+def cancel_attendance(event, user):
+    """Тіркеуді болдырмау; босаған орынға кезектегі бірінші адам көтеріледі.
+
+    Болдырылған жазбаның бұрынғы мәртебесін, жазба жоқ болса None қайтарады.
+    """
+    with transaction.atomic():
+        # Іс-шара жолын құлыптау: босаған орынды жаңа тіркелуші емес, кезектегі адам алады
+        event = Event.objects.select_for_update().get(pk=event.pk)
+        attendance = EventAttendance.objects.filter(event=event, user=user).first()
+        if attendance is None:
+            return None
+        EventAttendance.objects.filter(pk=attendance.pk).delete()
+        if attendance.status in EventAttendance.SEAT_STATUSES:
+            free_seat(event)
+    return attendance.status
+
+def free_seat(event, count=1):
+    """Құлыпталған іс-шарадағы орындарды босатып, оларды кезектегілерге беру"""
+    Event.objects.filter(pk=event.pk).update(attendees_count=F('attendees_count') - count)
+    event.attendees_count -= count
+    promote_waitlisted(event)
+
+def release_seat(event_id, count=1):
+    """Жазбалары басқа жолмен өшірілген (мысалы, пайдаланушымен бірге) орындарды босату"""
+    with transaction.atomic():
+        event = Event.objects.select_for_update().filter(pk=event_id).first()
+        if event is not None:
+            free_seat(event, count)
+
+def promote_waitlisted(event):
+    """Құлыпталған іс-шараның бос орындарына кезектегілерді тіркеу ретімен көтеру"""
+    waitlist = EventAttendance.objects.filter(event=event, status='waitlisted').order_by('registered_at', 'id')
+    if event.capacity is not None:
+        free = event.capacity - event.attendees_count
+        if free <= 0:
+            return []
+        waitlist = waitlist[:free]
+    rows = list(waitlist.values_list('pk', 'user_id'))
+    if not rows:
+        return []
+    user_ids = [user_id for _, user_id in rows]
+    EventAttendance.objects.filter(pk__in=[pk for pk, _ in rows]).update(status='registered')
+    Event.objects.filter(pk=event.pk).update(attendees_count=F('attendees_count') + len(rows))
+    event.attendees_count += len(rows)
+    bump_club_version('events', event.club_id)
+    for user_id in user_ids:
+        publish(user_topic(user_id), {
+            'type': 'rsvp',
+            'event_id': event.pk,
+            'event': event.title,
+            'status': 'registered',
+        })
+    return user_ids
+
+def fill_from_waitlist(event):
+    """Іс-шараны құлыптап, бос орындарды кезектен толтыру (мысалы, орын саны өскенде)"""
+    with transaction.atomic():
+        event = Event.objects.select_for_update().get(pk=event.pk)
+        return promote_waitlisted(event)
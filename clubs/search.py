@@ -0,0 +1,43 @@
+import re
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q
+
+SEARCH_CONFIG = 'clubs_search'
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+
+def supports_full_text():
+    return connection.vendor == 'postgresql'
+
+def build_search_query(text):
+    """Әр сөзді префикс ретінде іздейтін tsquery құру"""
+    terms = re.findall(r'\w+', text)
+    if not terms:
+        return None
+    raw = ' & '.join(f'{term}:*' for term in terms)
+    return SearchQuery(raw, config=SEARCH_CONFIG, search_type='raw')
+
+def search_clubs(queryset, text):
+    """Клубтарды іздеу: PostgreSQL-де tsvector бойынша рейтингпен, басқа базаларда icontains"""
+    if not supports_full_text():
+        return queryset.filter(
+            Q(name__icontains=text) |
+            Q(description__icontains=text)
+        )
+
+    query = build_search_query(text)
+    if query is None:
+        return queryset.none()
+
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query),
+        name_headline=SearchHeadline(
+            'name', query, config=SEARCH_CONFIG, highlight_all=True,
+            start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+        ),
+        description_headline=SearchHeadline(
+            'description', query, config=SEARCH_CONFIG, max_words=25, min_words=10,
+            start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+        ),
+    ).order_by('-rank', 'name')
@@ -0,0 +1,165 @@
+from collections import Counter, defaultdict
+from weakref import WeakKeyDictionary
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .calendars import forget_token
+from .facets import bump_catalog_version
+from .fragments import bump_club_version
+from .images import sync_renditions
+from .jobs import enqueue
+from .models import Club, Event, EventAttendance, Membership, Message, Notification, adjust_member_count
+from .pubsub import GLOBAL_TOPIC, club_topic, publish, user_topic
+from .rsvp import fill_from_waitlist, release_seat
+from .snapshots import invalidate_user_snapshot
+
+# QuerySet.delete() жолдары: origin -> {flush: commit-тен кейін бір рет өңделетін тізім}
+_pending_batches = WeakKeyDictionary()
+
+def origin_model(origin):
+    """Жоюды бастаған модель: origin дана да, QuerySet те болуы мүмкін"""
+    return getattr(origin, 'model', type(origin))
+
+def defer_batched(origin, using, flush, item):
+    """QuerySet.delete() жолдарын жинап, ``flush``-ты commit-тен кейін бір рет шақыру.
+
+    Жалғыз дананы жою кезінде ``flush`` бірден орындалады.
+    """
+    if getattr(origin, 'model', None) is None:
+        flush([item])
+        return
+    batches = _pending_batches.setdefault(origin, {})
+    batch = batches.get(flush)
+    if batch is None:
+        batch = batches[flush] = []
+        transaction.on_commit(lambda: flush(batches.pop(flush, batch)), using=using)
+    batch.append(item)
+
+def remove_memberships(rows):
+    """Жойылған мүшеліктер: санағышты клуб бойынша бір UPDATE-пен азайту"""
+    for club_id, removed in Counter(club_id for club_id, _ in rows).items():
+        adjust_member_count(club_id, -removed)
+
+def remove_member_feeds(rows):
+    """Жойылған мүшеліктер: әр клубқа бір ``feed.remove_members`` тапсырмасы"""
+    user_ids = defaultdict(list)
+    for club_id, user_id in rows:
+        user_ids[club_id].append(user_id)
+    for club_id, ids in user_ids.items():
+        enqueue('feed.remove_members', user_ids=ids, club_id=club_id)
+
+def release_seats(event_ids):
+    """Пайдаланушылармен бірге кеткен орындарды іс-шара бойынша босату"""
+    for event_id, count in Counter(event_ids).items():
+        release_seat(event_id, count)
+
+@receiver(pre_save, sender=Membership)
+def membership_status_changing(sender, instance, update_fields=None, **kwargs):
+    instance._previous_status = None
+    if instance.pk and (update_fields is None or 'status' in update_fields):
+        instance._previous_status = (
+            Membership.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        )
+    elif instance.pk:
+        instance._previous_status = instance.status
+
+@receiver(post_save, sender=Membership)
+def membership_saved(sender, instance, created, **kwargs):
+    # memberships.py жаппай UPDATE жасап, санағышты өзі түзетеді; мұнда жеке save() өтулері
+    was_approved = not created and getattr(instance, '_previous_status', None) == 'approved'
+    if instance.status == 'approved' and not was_approved:
+        adjust_member_count(instance.club_id, 1)
+        enqueue('feed.backfill_members', user_ids=[instance.user_id], club_id=instance.club_id)
+    elif was_approved and instance.status != 'approved':
+        adjust_member_count(instance.club_id, -1)
+        enqueue('feed.remove_members', user_ids=[instance.user_id], club_id=instance.club_id)
+    invalidate_user_snapshot(instance.user_id)
+
+@receiver(post_delete, sender=Membership)
+def membership_deleted(sender, instance, origin=None, using=None, **kwargs):
+    # Клуб немесе пайдаланушы жойылғанда лента жазбалары каскадпен бірге кетеді
+    model = origin_model(origin)
+    if instance.status == 'approved' and not issubclass(model, Club):
+        row = (instance.club_id, instance.user_id)
+        defer_batched(origin, using, remove_memberships, row)
+        if not issubclass(model, get_user_model()):
+            defer_batched(origin, using, remove_member_feeds, row)
+    invalidate_user_snapshot(instance.user_id)
+
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, **kwargs):
+    if created:
+        enqueue('feed.fan_out', notification_id=instance.pk)
+        if instance.is_active:
+            publish(club_topic(instance.club_id) if instance.club_id else GLOBAL_TOPIC, {
+                'type': 'notification',
+                'id': instance.pk,
+                'title': instance.title,
+                'notification_type': instance.notification_type,
+                'club_id': instance.club_id,
+            })
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        enqueue('feed.backfill_global', user_ids=[instance.pk])
+    else:
+        # Өшірілген пайдаланушының арнасы токен кэші біткенше ашық қалмауы үшін
+        forget_token(instance.calendar_token)
+        # Клуб карталары лидердің атын көрсетеді; кіру тек last_login-ді жаңартады
+        if not (update_fields and set(update_fields) <= {'last_login'}):
+            for club_id in Club.objects.filter(leader=instance).values_list('pk', flat=True):
+                bump_club_version('members', club_id)
+    sync_renditions(instance, 'profile_image')
+
+@receiver(pre_save, sender=Club)
+def club_leader_changing(sender, instance, **kwargs):
+    instance._previous_leader_id = None
+    if instance.pk:
+        instance._previous_leader_id = (
+            Club.objects.filter(pk=instance.pk).values_list('leader_id', flat=True).first()
+        )
+
+@receiver(post_save, sender=Club)
+def club_saved(sender, instance, **kwargs):
+    bump_catalog_version()
+    # Клуб атауы іс-шара карточкаларында және .ics арналарында көрсетіледі
+    bump_club_version('events', instance.pk)
+    sync_renditions(instance, 'logo')
+    previous_leader_id = getattr(instance, '_previous_leader_id', None)
+    if previous_leader_id != instance.leader_id:
+        if instance.leader_id:
+            enqueue('feed.backfill_members', user_ids=[instance.leader_id], club_id=instance.pk)
+        invalidate_user_snapshot(previous_leader_id, instance.leader_id)
+
+@receiver(post_delete, sender=Club)
+def club_deleted(sender, instance, **kwargs):
+    bump_catalog_version()
+    invalidate_user_snapshot(instance.leader_id)
+
+@receiver([post_save, post_delete], sender=Message)
+def message_changed(sender, instance, **kwargs):
+    invalidate_user_snapshot(instance.receiver_id)
+    publish(user_topic(instance.receiver_id), {'type': 'unread'})
+
+@receiver([post_save, post_delete], sender=Event)
+def event_changed(sender, instance, **kwargs):
+    bump_club_version('events', instance.club_id)
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, created, **kwargs):
+    if not created:
+        # Орын саны өскен немесе алынып тасталған болса, кезектегілерді көтеру
+        fill_from_waitlist(instance)
+
+@receiver([post_save, post_delete], sender=EventAttendance)
+def attendance_changed(sender, instance, **kwargs):
+    bump_club_version('events', instance.event.club_id)
+
+@receiver(post_delete, sender=EventAttendance)
+def attendance_deleted(sender, instance, origin=None, using=None, **kwargs):
+    # Пайдаланушы өшірілгенде каскадпен кеткен орынды санағыштан шығару
+    if issubclass(origin_model(origin), get_user_model()) and instance.status in EventAttendance.SEAT_STATUSES:
+        defer_batched(origin, using, release_seats, instance.event_id)
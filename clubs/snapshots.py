@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.cache import cache
+from .models import Club, Membership, Message
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_TIMEOUT = getattr(settings, 'USER_SNAPSHOT_TIMEOUT', 300)
+
+def snapshot_key(user_id):
+    return f'clubs:user_snapshot:v{SNAPSHOT_VERSION}:{user_id}'
+
+def build_user_snapshot(user_id):
+    """Пайдаланушының клубтары мен оқылмаған хабарлары туралы деректерді жинау"""
+    return {
+        'approved_club_ids': list(
+            Membership.objects.filter(user_id=user_id, status='approved')
+            .values_list('club_id', flat=True)
+        ),
+        'led_club_ids': list(Club.objects.filter(leader_id=user_id).values_list('pk', flat=True)),
+        'unread_messages': Message.objects.filter(receiver_id=user_id, is_read=False).count(),
+    }
+
+def get_user_snapshot(user_id):
+    """Кэштелген снапшотты алу, жоқ болса қайта құру"""
+    key = snapshot_key(user_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_user_snapshot(user_id)
+        cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+def invalidate_user_snapshot(*user_ids):
+    keys = [snapshot_key(user_id) for user_id in user_ids if user_id]
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,134 @@
+import logging
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import Club, Membership, Notification
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+STATISTICS_KEY = 'clubs:admin_statistics:v1'
+STATISTICS_LOCK_KEY = f'{STATISTICS_KEY}:lock'
+STATISTICS_TTL = getattr(settings, 'ADMIN_STATISTICS_TTL', 60)
+STATISTICS_STALE_TTL = 24 * 60 * 60
+STATISTICS_LOCK_TIMEOUT = 30
+# Кэш бос болғанда құлыпты ала алмаған сұраулар снапшотты осынша күтеді
+STATISTICS_WAIT = getattr(settings, 'ADMIN_STATISTICS_WAIT', 5)
+STATISTICS_POLL_INTERVAL = 0.1
+
+EMPTY_STATISTICS = {
+    'total_clubs': 0,
+    'active_clubs': 0,
+    'total_users': 0,
+    'total_memberships': 0,
+    'approved_memberships': 0,
+    'clubs_by_category': [],
+    'memberships_by_status': [],
+    'new_users_week': 0,
+    'new_memberships_week': 0,
+    'new_notifications_week': 0,
+    'admin_count': 0,
+    'leader_count': 0,
+    'member_count': 0,
+    'user_count': 0,
+    'total_by_roles': 0,
+}
+
+def compute_statistics():
+    """Барлық көрсеткіштерді бірнеше шартты агрегат сұрауымен есептеу"""
+    seven_days_ago = timezone.now() - timedelta(days=7)
+
+    club_totals = Club.objects.aggregate(
+        total_clubs=Count('id'),
+        active_clubs=Count('id', filter=Q(is_active=True)),
+    )
+    clubs_by_category = [
+        {'category': item['category'] or 'other', 'count': item['count']}
+        for item in Club.objects.order_by().values('category').annotate(count=Count('id')).order_by('-count')
+    ]
+
+    user_totals = CustomUser.objects.aggregate(
+        total_users=Count('id'),
+        new_users_week=Count('id', filter=Q(date_joined__gte=seven_days_ago)),
+        admin_count=Count('id', filter=Q(role='admin')),
+        leader_count=Count('id', filter=Q(role='leader')),
+        member_count=Count('id', filter=Q(role='member')),
+        user_count=Count('id', filter=Q(role='user')),
+    )
+
+    membership_totals = Membership.objects.aggregate(
+        total_memberships=Count('id'),
+        new_memberships_week=Count('id', filter=Q(applied_at__gte=seven_days_ago)),
+        **{status: Count('id', filter=Q(status=status)) for status, _ in Membership.STATUS_CHOICES},
+    )
+    status_counts = {status: membership_totals.pop(status) for status, _ in Membership.STATUS_CHOICES}
+
+    return {
+        **club_totals,
+        **user_totals,
+        **membership_totals,
+        'approved_memberships': status_counts['approved'],
+        'clubs_by_category': clubs_by_category,
+        'memberships_by_status': [
+            {'status': status, 'count': count}
+            for status, count in sorted(status_counts.items()) if count
+        ],
+        'new_notifications_week': Notification.objects.filter(created_at__gte=seven_days_ago).count(),
+        'total_by_roles': sum(user_totals[key] for key in ('admin_count', 'leader_count', 'member_count', 'user_count')),
+    }
+
+def refresh_statistics():
+    snapshot = {
+        'data': compute_statistics(),
+        'computed_at': timezone.now(),
+        'expires_at': time.time() + STATISTICS_TTL,
+    }
+    cache.set(STATISTICS_KEY, snapshot, STATISTICS_STALE_TTL)
+    return snapshot
+
+def wait_for_snapshot():
+    """Басқа процесс есептеп жатқан снапшотты күту; уақыт бітсе None"""
+    deadline = time.monotonic() + STATISTICS_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(STATISTICS_POLL_INTERVAL)
+        snapshot = cache.get(STATISTICS_KEY)
+        if snapshot is not None:
+            return snapshot
+        if not cache.get(STATISTICS_LOCK_KEY):
+            break
+    return None
+
+def get_statistics(fresh=False):
+    """Кэштелген статистиканы қайтару.
+
+    Мерзімі өткенде тек құлыпты алған бір процесс қайта есептейді, қалғандары
+    ескі снапшотты көрсетеді. Кэш бос болса, олар есептеу аяқталғанын біраз
+    күтеді, содан кейін бос "есептелуде" нәтижесін қайтарады. Есептеу сәтсіз
+    болса, соңғы сәтті нәтиже ``is_stale`` белгісімен қайтарылады.
+    """
+    snapshot = cache.get(STATISTICS_KEY)
+    if snapshot and not fresh and snapshot['expires_at'] > time.time():
+        return {**snapshot, 'is_stale': False, 'error': None}
+
+    error = None
+    acquired = cache.add(STATISTICS_LOCK_KEY, True, STATISTICS_LOCK_TIMEOUT)
+    if not acquired and snapshot is None:
+        snapshot = wait_for_snapshot()
+        if snapshot is not None:
+            return {**snapshot, 'is_stale': False, 'error': None}
+    if acquired:
+        try:
+            return {**refresh_statistics(), 'is_stale': False, 'error': None}
+        except DatabaseError as e:
+            logger.exception('Статистиканы есептеу сәтсіз аяқталды')
+            error = str(e)
+        finally:
+            cache.delete(STATISTICS_LOCK_KEY)
+
+    if snapshot is None:
+        return {'data': EMPTY_STATISTICS, 'computed_at': None, 'is_stale': True, 'error': error}
+    return {**snapshot, 'is_stale': True, 'error': error}
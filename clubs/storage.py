@@ -0,0 +1,17 @@
+import os
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from .assets import COMPRESSIBLE_EXTENSIONS, compress_file
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэштелген атаулармен қатар .gz/.br нұсқаларын алдын ала жазатын сақтау"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS) or not self.exists(name):
+                continue
+            for compressed in compress_file(self.path(name)):
+                yield name, os.path.relpath(compressed, self.location), True
@@ -0,0 +1,53 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from .models import Message
+from .pubsub import GLOBAL_TOPIC, club_topic, get_broker, user_topic
+from .snapshots import get_user_snapshot
+
+KEEPALIVE_SECONDS = getattr(settings, 'EVENT_STREAM_KEEPALIVE', 15)
+POLL_SECONDS = getattr(settings, 'EVENT_STREAM_POLL_SECONDS', 30)
+
+def sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+def user_event_poll(user_id):
+    """WSGI үшін қысқа жауап: ағымдағы күйді беріп, байланысты жабу.
+
+    Синхронды воркер шексіз ағынды ұстай алмайды, сондықтан браузер
+    retry уақытынан кейін қайта қосылып, сұрау арқылы жаңартып отырады.
+    """
+    snapshot = get_user_snapshot(user_id)
+    return [f'retry: {POLL_SECONDS * 1000}\n\n' + sse('unread', {'count': snapshot['unread_messages']})]
+
+async def user_event_stream(user_id):
+    """Пайдаланушыға арналған оқиғаларды SSE форматында беру"""
+    snapshot = await sync_to_async(get_user_snapshot)(user_id)
+    club_ids = set(snapshot['approved_club_ids']) | set(snapshot['led_club_ids'])
+    subscription = get_broker().subscribe(
+        [user_topic(user_id), GLOBAL_TOPIC] + [club_topic(club_id) for club_id in club_ids]
+    )
+    try:
+        yield 'retry: 5000\n\n' + sse('unread', {'count': snapshot['unread_messages']})
+        while True:
+            try:
+                event = await subscription.get(KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+
+            if event['type'] == 'unread':
+                count = await Message.objects.filter(receiver_id=user_id, is_read=False).acount()
+                yield sse('unread', {'count': count})
+                continue
+            if event['type'] == 'membership':
+                topic = club_topic(event['club_id'])
+                if event['status'] == 'approved':
+                    subscription.add(topic)
+                elif event['club_id'] not in snapshot['led_club_ids']:
+                    subscription.discard(topic)
+            yield sse(event['type'], event)
+    finally:
+        subscription.close()
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from .feed import backfill_global_feed, backfill_member_feed, fan_out_notification, remove_member_feed
+from .jobs import job
+from .models import Club, Membership, Notification
+
+def approved_user_ids(user_ids, club_id):
+    return set(Membership.objects.filter(
+        user_id__in=user_ids, club_id=club_id, status='approved'
+    ).values_list('user_id', flat=True))
+
+@job('feed.fan_out')
+def fan_out(notification_id):
+    notification = Notification.objects.filter(pk=notification_id).first()
+    if notification is not None:
+        fan_out_notification(notification)
+
+@job('feed.backfill_members')
+def backfill_members(user_ids, club_id):
+    # Кезекте тұрған кезде мүшелік қайтарылып алынуы мүмкін
+    eligible = approved_user_ids(user_ids, club_id)
+    leader_id = Club.objects.filter(pk=club_id).values_list('leader_id', flat=True).first()
+    if leader_id in user_ids:
+        eligible.add(leader_id)
+    if eligible:
+        backfill_member_feed(eligible, club_id)
+
+@job('feed.backfill_global')
+def backfill_global(user_ids):
+    existing = list(get_user_model().objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+    if existing:
+        backfill_global_feed(existing)
+
+@job('feed.remove_members')
+def remove_members(user_ids, club_id):
+    # Кезекте тұрған кезде қайта қабылданғандардың лентасын өшірмеу
+    remaining = set(user_ids) - approved_user_ids(user_ids, club_id)
+    if remaining:
+        remove_member_feed(remaining, club_id)
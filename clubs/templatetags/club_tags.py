@@ -1,24 +1,13 @@
 from django import template
+from django.forms.utils import flatatt
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
+from clubs.fragments import cached_fragment
 from clubs.models import Club
+from clubs.search import HIGHLIGHT_START, HIGHLIGHT_STOP
 
 register = template.Library()
 
-@register.filter(name='club_count')
-def club_count(clubs_or_page, category_id):
-    """Клубтар санын санаты бойынша есептеу"""
-    if not clubs_or_page:
-        return 0
-
-    if hasattr(clubs_or_page, 'object_list'):
-        clubs = clubs_or_page.object_list
-    else:
-        clubs = clubs_or_page
-    
-    if not hasattr(clubs, 'filter'):
-        return 0
-    
-    return clubs.filter(category=category_id).count()
-
 @register.filter(name='get_category_display')
 def get_category_display(category_id):
     """Санаттың көрінетін атауын алу"""
@@ -27,16 +16,68 @@ def get_category_display(category_id):
             return cat_name
     return category_id
 
+@register.filter(name='highlight')
+def highlight(value):
+    """Іздеу нәтижесіндегі сәйкестіктерді <mark> арқылы белгілеу"""
+    if not value:
+        return ''
+    value = escape(value)
+    value = value.replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>')
+    return mark_safe(value)
+
 @register.simple_tag
-def total_clubs_by_category(category_id):
-    """Жалпы клубтар санын санаты бойынша есептеу"""
-    return Club.objects.filter(category=category_id).count()
-
-@register.inclusion_tag('clubs/club_stats.html')
-def club_statistics():
-    """Клубтар статистикасы"""
-    return {
-        'total_clubs': Club.objects.count(),
-        'active_clubs': Club.objects.filter(is_active=True).count(),
-        'categories': Club.CATEGORY_CHOICES,
-    }
\ No newline at end of file
+def responsive_image(instance, field_name, sizes='100vw', **attrs):
+    """Сурет нұсқалары бар болса <picture> және srcset, әйтпесе түпнұсқа <img>
+
+    {% responsive_image club "logo" sizes="60px" alt=club.name class="rounded-circle" %}
+    """
+    image = getattr(instance, field_name)
+    if not image:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    renditions = getattr(instance, f'{field_name}_renditions', None) or {}
+    if renditions.get('source') != image.name or not renditions.get('jpeg'):
+        return format_html('<img src="{}"{}>', image.url, flatatt(attrs))
+
+    def srcset(fmt):
+        items = sorted(renditions[fmt].items(), key=lambda item: int(item[0]))
+        return ', '.join(f'{image.storage.url(name)} {width}w' for width, name in items)
+
+    largest = max(renditions['jpeg'], key=int)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}"{}></picture>',
+        srcset('webp'), sizes,
+        image.storage.url(renditions['jpeg'][largest]), srcset('jpeg'), sizes, flatatt(attrs),
+    )
+
+class CacheFragmentNode(template.Node):
+    def __init__(self, nodelist, name, parts):
+        self.nodelist = nodelist
+        self.name = name
+        self.parts = parts
+
+    def render(self, context):
+        return cached_fragment(
+            self.name.resolve(context),
+            [part.resolve(context) for part in self.parts],
+            lambda: self.nodelist.render(context),
+            request=context.get('request'),
+        )
+
+@register.tag('cachefragment')
+def do_cachefragment(parser, token):
+    """{% cachefragment "аты" club ... %} ... {% endcachefragment %}
+
+    Кілт объектілердің нұсқалары мен қараушының рөлінен құралады.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f'{bits[0]} тегіне фрагмент аты керек')
+    nodelist = parser.parse(('endcachefragment',))
+    parser.delete_first_token()
+    return CacheFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
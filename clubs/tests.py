@@ -1,3 +1,1014 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from .middleware import ReplicaRoutingMiddleware, StaticAssetsMiddleware
+from .models import Club, DailyClubStats, Event, EventAttendance, Job, Membership, Message, Notification, UserFeedItem
+from .routers import ReplicaRouter, replica_reads, replica_safe
+from .calendars import escape_text, fold
+from .facets import category_facets
+from .feed import fan_out_notification, user_feed
+from .fragments import bump_club_version, cached_fragment, fragment_key
+from .jobs import enqueue, requeue_stale_jobs
+from .memberships import approve_memberships, reject_memberships, status_counts
+from .pagination import CountedPaginator, keyset_page
+from .pubsub import ensure_shared_broker
+from .rollups import rollup
+from .statistics import STATISTICS_LOCK_KEY, compute_statistics, get_statistics
+from .tasks import backfill_members, remove_members
+from .rsvp import cancel_attendance, claim_seat, register_attendance
+from .snapshots import get_user_snapshot
 
-# Create your tests here.
+User = get_user_model()
+
+def create_event(capacity=None, **kwargs):
+    leader = User.objects.create_user('leader', 'leader@example.com')
+    club = Club.objects.create(name='Шахмат', description='Шахмат клубы', leader=leader)
+    kwargs.setdefault('date', timezone.now() + timedelta(days=7))
+    return Event.objects.create(
+        title='Турнир', description='Жыл сайынғы турнир', club=club,
+        location='Акт залы', capacity=capacity, **kwargs
+    )
+
+def create_users(count, prefix='user'):
+    return [User.objects.create_user(f'{prefix}{i}', f'{prefix}{i}@example.com') for i in range(count)]
+
+class RsvpTests(TestCase):
+    def setUp(self):
+        self.event = create_event(capacity=2)
+        self.users = create_users(4)
+
+    def statuses(self):
+        return dict(EventAttendance.objects.filter(event=self.event).values_list('user__username', 'status'))
+
+    def test_register_until_full_then_waitlist(self):
+        results = [register_attendance(self.event, user) for user in self.users]
+        self.assertEqual(results, ['registered', 'registered', 'waitlisted', 'waitlisted'])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 2)
+        self.assertTrue(self.event.is_full())
+
+    def test_stale_event_rows_do_not_oversell(self):
+        # Қатар сұраулардың әрқайсысы іс-шараны орын бос кезде оқыған
+        events = [Event.objects.get(pk=self.event.pk) for _ in self.users]
+        results = [register_attendance(event, user) for event, user in zip(events, self.users)]
+        self.assertEqual(results, ['registered', 'registered', 'waitlisted', 'waitlisted'])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 2)
+
+    def test_register_twice_keeps_single_row(self):
+        self.assertEqual(register_attendance(self.event, self.users[0]), 'registered')
+        self.assertEqual(register_attendance(self.event, self.users[0]), 'registered')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 1)
+
+    def test_cancel_promotes_first_waitlisted(self):
+        for user in self.users:
+            register_attendance(self.event, user)
+        self.assertEqual(cancel_attendance(self.event, self.users[0]), 'registered')
+        self.assertEqual(self.statuses(), {'user1': 'registered', 'user2': 'registered', 'user3': 'waitlisted'})
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 2)
+
+    def test_cancel_waitlisted_keeps_counter(self):
+        for user in self.users:
+            register_attendance(self.event, user)
+        self.assertEqual(cancel_attendance(self.event, self.users[3]), 'waitlisted')
+        self.assertIsNone(cancel_attendance(self.event, self.users[3]))
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 2)
+
+    def test_raising_capacity_fills_from_waitlist(self):
+        for user in self.users:
+            register_attendance(self.event, user)
+        self.event.capacity = 3
+        self.event.save()
+        self.assertEqual(self.statuses()['user2'], 'registered')
+        self.assertEqual(self.statuses()['user3'], 'waitlisted')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 3)
+
+    def test_saving_stale_instance_keeps_counter(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        register_attendance(self.event, self.users[0])
+        stale.title = 'Жаңа атау'
+        stale.save()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 1)
+
+    def test_deleting_user_frees_seat(self):
+        for user in self.users:
+            register_attendance(self.event, user)
+        self.users[1].delete()
+        self.assertEqual(self.statuses()['user2'], 'registered')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 2)
+
+    def test_bulk_deleting_users_frees_seats(self):
+        for user in self.users:
+            register_attendance(self.event, user)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(username__in=['user0', 'user1']).delete()
+        self.assertEqual(self.statuses(), {'user2': 'registered', 'user3': 'registered'})
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 2)
+
+class MembershipDeleteTests(TestCase):
+    def setUp(self):
+        self.club = create_event().club
+        self.users = create_users(3)
+        for user in self.users:
+            Membership.objects.create(user=user, club=self.club, status='approved')
+
+    def test_bulk_delete_batches_counter_and_feed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Membership.objects.filter(user__in=self.users[:2]).delete()
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.members_count, 1)
+        jobs = list(Job.objects.filter(name='feed.remove_members').values_list('payload', flat=True))
+        self.assertEqual(len(jobs), 1)
+        self.assertCountEqual(jobs[0]['user_ids'], [user.pk for user in self.users[:2]])
+
+    def test_bulk_deleting_users_skips_feed_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk__in=[user.pk for user in self.users]).delete()
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.members_count, 0)
+        self.assertFalse(Job.objects.filter(name='feed.remove_members').exists())
+
+    def test_saving_stale_club_keeps_counter(self):
+        stale = Club.objects.get(pk=self.club.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            Membership.objects.filter(user=self.users[0]).delete()
+        stale.description = 'Жаңа сипаттама'
+        stale.save()
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.members_count, 2)
+        self.assertEqual(self.club.description, 'Жаңа сипаттама')
+
+class MembershipStatusSaveTests(TestCase):
+    def setUp(self):
+        self.club = create_event().club
+        self.user = create_users(1)[0]
+        self.membership = Membership.objects.create(user=self.user, club=self.club)
+
+    def members_count(self):
+        self.club.refresh_from_db()
+        return self.club.members_count
+
+    def test_direct_status_saves_adjust_counter(self):
+        self.membership.status = 'approved'
+        self.membership.save()
+        self.assertEqual(self.members_count(), 1)
+        self.membership.notes = 'Белсенді'
+        self.membership.save()
+        self.membership.save(update_fields=['notes'])
+        self.assertEqual(self.members_count(), 1)
+        self.membership.status = 'rejected'
+        self.membership.save()
+        self.assertEqual(self.members_count(), 0)
+        jobs = Job.objects.filter(name__in=['feed.backfill_members', 'feed.remove_members'])
+        self.assertEqual(
+            [job.name for job in jobs.order_by('pk') if job.payload['user_ids'] == [self.user.pk]],
+            ['feed.backfill_members', 'feed.remove_members'],
+        )
+
+    def test_bulk_decisions_are_not_counted_twice(self):
+        approve_memberships(self.club)
+        self.assertEqual(self.members_count(), 1)
+        self.membership.refresh_from_db()
+        self.membership.save()
+        self.assertEqual(self.members_count(), 1)
+
+class StaleJobTests(TestCase):
+    def test_requeue_counts_attempts_and_fails_at_limit(self):
+        started = timezone.now() - timedelta(hours=1)
+        retry = Job.objects.create(name='feed.fan_out', status='running', started_at=started, attempts=1, max_attempts=3)
+        poison = Job.objects.create(name='feed.fan_out', status='running', started_at=started, attempts=3, max_attempts=3)
+        self.assertEqual(requeue_stale_jobs(), 1)
+        retry.refresh_from_db()
+        poison.refresh_from_db()
+        self.assertEqual(retry.status, 'queued')
+        self.assertEqual(poison.status, 'failed')
+        self.assertIsNotNone(poison.finished_at)
+
+    @override_settings(JOBS_MAX_ATTEMPTS=2, JOBS_STALE_TIMEOUT=30)
+    def test_settings_are_read_at_call_time(self):
+        queued = enqueue('feed.remove_members', user_ids=[], club_id=0)
+        self.assertEqual(queued.max_attempts, 2)
+        Job.objects.create(name='feed.fan_out', status='running', started_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(requeue_stale_jobs(), 1)
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_mode_runs_after_commit(self):
+        handler = mock.Mock()
+        with mock.patch.dict('clubs.jobs.handlers', {'feed.remove_members': handler}):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertIsNone(enqueue('feed.remove_members', user_ids=[1], club_id=2))
+        handler.assert_called_once_with(user_ids=[1], club_id=2)
+        self.assertFalse(Job.objects.exists())
+
+class RollupMembersTests(TestCase):
+    def test_members_total_accounts_for_removed_members(self):
+        club = create_event().club
+        users = create_users(4)
+        today = timezone.localdate()
+        approved = timezone.now() - timedelta(days=3)
+        for user in users[:3]:
+            Membership.objects.create(user=user, club=club, status='approved', approved_at=approved)
+        rollup(since=today - timedelta(days=3), until=today - timedelta(days=3))
+        with self.captureOnCommitCallbacks(execute=True):
+            Membership.objects.filter(user=users[0]).delete()
+        Membership.objects.create(user=users[3], club=club, status='approved', approved_at=approved + timedelta(days=2))
+        rollup(since=today - timedelta(days=2), until=today - timedelta(days=1))
+        totals = dict(DailyClubStats.objects.filter(club=club).values_list('date', 'members_total'))
+        self.assertEqual(totals[today - timedelta(days=1)], 3)
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.sender, self.receiver = create_users(2)
+        sent_at = timezone.now()
+        Message.objects.bulk_create([
+            # Бірдей уақыттағы хабарлар id бойынша ажыратылады
+            Message(sender=self.sender, receiver=self.receiver, subject=f'Хабар {i}', content='Мәтін',
+                    sent_at=sent_at - timedelta(minutes=i // 3))
+            for i in range(10)
+        ])
+
+    def test_pages_cover_every_row_once(self):
+        seen = []
+        cursor = None
+        while True:
+            page = keyset_page(Message.objects.all(), cursor, per_page=4)
+            seen.extend(message.pk for message in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        expected = list(Message.objects.order_by('-sent_at', '-id').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        first = keyset_page(Message.objects.all(), per_page=4)
+        for cursor in ('not-a-cursor', '!!!', 'MjAyNHwxMA'):
+            page = keyset_page(Message.objects.all(), cursor, per_page=4)
+            self.assertEqual([message.pk for message in page], [message.pk for message in first])
+
+    def test_counted_paginator_skips_count_query(self):
+        paginator = CountedPaginator(Message.objects.order_by('pk'), 4, count=10)
+        with self.assertNumQueries(1):
+            page = paginator.page(3)
+            self.assertEqual(len(page.object_list), 2)
+        self.assertEqual(paginator.num_pages, 3)
+
+    @mock.patch('clubs.views.INBOX_PAGE_SIZE', 4)
+    def test_inbox_marks_all_read(self):
+        cache.clear()
+        self.client.force_login(self.receiver)
+        self.assertEqual(get_user_snapshot(self.receiver.pk)['unread_messages'], 10)
+        response = self.client.get(reverse('inbox'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['received_messages'].has_next())
+        self.assertFalse(Message.objects.filter(receiver=self.receiver, is_read=False).exists())
+        self.assertEqual(get_user_snapshot(self.receiver.pk)['unread_messages'], 0)
+
+class FeedTests(TestCase):
+    def setUp(self):
+        self.club = create_event().club
+        self.leader = self.club.leader
+        self.member, self.applicant, self.outsider = create_users(3)
+        Membership.objects.create(user=self.member, club=self.club, status='approved')
+        Membership.objects.create(user=self.applicant, club=self.club, status='pending')
+
+    def notify(self, club=None, **kwargs):
+        return Notification.objects.create(title='Жаңалық', content='Мәтін', club=club, created_by=self.leader, **kwargs)
+
+    def feed_users(self, notification):
+        return set(UserFeedItem.objects.filter(notification=notification).values_list('user_id', flat=True))
+
+    def test_club_notification_reaches_members_and_leader(self):
+        notification = self.notify(self.club)
+        self.assertEqual(fan_out_notification(notification), 2)
+        self.assertEqual(self.feed_users(notification), {self.member.pk, self.leader.pk})
+        # Қайта тарату қайталанған жазба жасамайды
+        fan_out_notification(notification)
+        self.assertEqual(UserFeedItem.objects.filter(notification=notification).count(), 2)
+
+    def test_global_notification_reaches_active_users(self):
+        self.outsider.is_active = False
+        self.outsider.save()
+        notification = self.notify()
+        fan_out_notification(notification)
+        self.assertEqual(self.feed_users(notification), {self.leader.pk, self.member.pk, self.applicant.pk})
+
+    def test_user_feed_hides_inactive_notifications(self):
+        visible = self.notify(self.club)
+        hidden = self.notify(self.club, is_active=False)
+        fan_out_notification(visible)
+        fan_out_notification(hidden)
+        self.assertEqual(user_feed(self.member).notifications, [visible])
+
+    def test_backfill_and_removal_follow_membership(self):
+        notification = self.notify(self.club)
+        Membership.objects.filter(user=self.applicant).update(status='approved')
+        backfill_members([self.applicant.pk, self.outsider.pk], self.club.pk)
+        self.assertEqual(self.feed_users(notification), {self.applicant.pk})
+
+        Membership.objects.filter(user=self.applicant).update(status='rejected')
+        fan_out_notification(notification)
+        remove_members([self.applicant.pk, self.member.pk, self.leader.pk], self.club.pk)
+        # Әлі мүше болғандар мен лидердің лентасы сақталады
+        self.assertEqual(self.feed_users(notification), {self.member.pk, self.leader.pk})
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = create_event()
+        self.club = self.event.club
+
+    def render(self, *parts, request=None):
+        render = mock.Mock(return_value='<div>карта</div>')
+        cached_fragment('club_card', parts, render, request)
+        return render.called
+
+    def test_keys_depend_on_role(self):
+        keys = {fragment_key('club_card', [self.club], role) for role in ('anonymous', 'user', 'leader', 'admin')}
+        self.assertEqual(len(keys), 4)
+
+    def test_second_render_is_served_from_cache(self):
+        self.assertTrue(self.render(self.club))
+        self.assertFalse(self.render(self.club))
+
+    def test_version_bumps_invalidate_club_and_event_fragments(self):
+        for kind in ('members', 'events'):
+            self.render(self.club)
+            self.render(self.event)
+            with self.captureOnCommitCallbacks(execute=True):
+                bump_club_version(kind, self.club.pk)
+            self.assertTrue(self.render(self.club))
+            self.assertTrue(self.render(self.event))
+
+    def test_membership_and_club_changes_invalidate(self):
+        self.render(self.club)
+        member, = create_users(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Membership.objects.create(user=member, club=self.club, status='approved')
+        self.assertTrue(self.render(self.club))
+        self.club.refresh_from_db()
+        self.club.description = 'Жаңа сипаттама'
+        self.club.save()
+        self.assertTrue(self.render(self.club))
+
+    def test_leader_changes_invalidate(self):
+        self.render(self.club)
+        leader = self.club.leader
+        with self.captureOnCommitCallbacks(execute=True):
+            leader.save(update_fields=['last_login'])
+        self.assertFalse(self.render(self.club))
+        with self.captureOnCommitCallbacks(execute=True):
+            leader.username = 'renamed'
+            leader.save()
+        self.assertTrue(self.render(self.club))
+        other, = create_users(1)
+        # updated_at өзгермесе де жаңа лидер кілтке кіреді
+        Club.objects.filter(pk=self.club.pk).update(leader=other, updated_at=self.club.updated_at)
+        self.club.refresh_from_db()
+        self.assertTrue(self.render(self.club))
+
+    def test_only_admin_can_bypass_cache(self):
+        request = RequestFactory().get('/', {'nocache': '1'})
+        request.user = User.objects.create_user('admin', 'admin@example.com', role='admin')
+        self.assertTrue(self.render(self.club, request=request))
+        self.assertTrue(self.render(self.club, request=request))
+        request.user, = create_users(1)
+        self.assertTrue(self.render(self.club, request=request))
+        self.assertFalse(self.render(self.club, request=request))
+
+class CategoryFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for name, category, is_active in (
+            ('Шахмат', 'sports', True), ('Футбол', 'sports', True), ('Хор', 'art', True), ('Жабық', 'art', False),
+        ):
+            Club.objects.create(name=name, description='Сипаттама', category=category, is_active=is_active)
+
+    def counts(self, facets):
+        return {category['id']: category['count'] for category in facets['categories'] if category['count']}
+
+    def test_counts_per_category_and_cache(self):
+        with self.assertNumQueries(1):
+            facets = category_facets(Club.objects.filter(is_active=True), signature=('', True), selected='art')
+        self.assertEqual(self.counts(facets), {'sports': 2, 'art': 1})
+        self.assertEqual(facets['total'], 3)
+        self.assertEqual([category['id'] for category in facets['categories'] if category['selected']], ['art'])
+        with self.assertNumQueries(0):
+            category_facets(Club.objects.filter(is_active=True), signature=('', True))
+
+    def test_club_changes_invalidate_counts(self):
+        category_facets(Club.objects.all(), signature=('', False))
+        with self.captureOnCommitCallbacks(execute=True):
+            Club.objects.create(name='Би', description='Сипаттама', category='art')
+        self.assertEqual(self.counts(category_facets(Club.objects.all(), signature=('', False))), {'sports': 2, 'art': 3})
+
+    def test_club_list_counts_ignore_category_filter(self):
+        member, = create_users(1)
+        self.client.force_login(member)
+        response = self.client.get(reverse('club_list'), {'category': 'sports'})
+        self.assertEqual(self.counts(response.context['facets']), {'sports': 2, 'art': 1})
+        self.assertEqual(len(response.context['clubs']), 2)
+
+        admin = User.objects.create_user('admin', 'admin@example.com', role='admin')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('club_list'))
+        self.assertEqual(self.counts(response.context['facets']), {'sports': 2, 'art': 2})
+
+class MembershipDecisionTests(TestCase):
+    def setUp(self):
+        self.club = create_event().club
+        self.leader = self.club.leader
+        self.users = create_users(4)
+        self.pending = [
+            Membership.objects.create(user=user, club=self.club, status='pending') for user in self.users[:3]
+        ]
+        self.leader_membership = Membership.objects.create(user=self.leader, club=self.club, status='approved')
+        self.club.refresh_from_db()
+
+    def members_count(self):
+        self.club.refresh_from_db()
+        return self.club.members_count
+
+    def test_approve_selected_updates_counter_and_roles(self):
+        approved = approve_memberships(self.club, [self.pending[0].pk, self.pending[1].pk], 'Қош келдіңіз')
+        self.assertEqual(approved, 2)
+        self.assertEqual(self.members_count(), 3)
+        self.assertEqual(status_counts(self.club), {'pending': 1, 'approved': 3, 'rejected': 0})
+        self.assertEqual(set(User.objects.filter(role='member').values_list('pk', flat=True)), {
+            self.users[0].pk, self.users[1].pk,
+        })
+        self.assertTrue(Job.objects.filter(name='feed.backfill_members').exists())
+        # Қайта қабылдау санағышты екі рет арттырмайды
+        self.assertEqual(approve_memberships(self.club, [self.pending[0].pk]), 0)
+        self.assertEqual(self.members_count(), 3)
+
+    def test_approve_all_skips_rejected(self):
+        Membership.objects.filter(pk=self.pending[2].pk).update(status='rejected')
+        self.assertEqual(approve_memberships(self.club), 2)
+        self.assertEqual(self.members_count(), 3)
+        self.assertEqual(Membership.objects.get(pk=self.pending[2].pk).status, 'rejected')
+
+    def test_reject_keeps_leader_and_decrements_counter(self):
+        approve_memberships(self.club, [self.pending[0].pk])
+        ids = [self.pending[0].pk, self.pending[1].pk, self.leader_membership.pk]
+        self.assertEqual(reject_memberships(self.club, ids), (2, 1))
+        self.assertEqual(self.members_count(), 1)
+        self.assertEqual(Membership.objects.get(pk=self.leader_membership.pk).status, 'approved')
+        self.assertTrue(Job.objects.filter(name='feed.remove_members').exists())
+
+    def test_other_clubs_are_untouched(self):
+        other = Club.objects.create(name='Би', description='Би клубы')
+        foreign = Membership.objects.create(user=self.users[3], club=other, status='pending')
+        self.assertEqual(approve_memberships(self.club, [foreign.pk]), 0)
+        self.assertEqual(Membership.objects.get(pk=foreign.pk).status, 'pending')
+
+    def test_view_requires_leader_or_admin(self):
+        url = reverse('manage_memberships', args=[self.club.pk])
+        self.client.force_login(self.users[3])
+        response = self.client.post(url, {'action': 'approve_all'})
+        self.assertRedirects(response, reverse('club_detail', args=[self.club.pk]), fetch_redirect_response=False)
+        self.assertEqual(self.members_count(), 1)
+
+        self.client.force_login(self.leader)
+        self.client.post(url, {'action': 'approve', 'membership_ids': [str(self.pending[0].pk), 'x']})
+        self.assertEqual(self.members_count(), 2)
+        response = self.client.get(url)
+        self.assertEqual(response.context['counts'], {'pending': 2, 'approved': 2, 'rejected': 0})
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.club = create_event().club
+        self.leader = self.club.leader
+        self.admin = User.objects.create_user('admin', 'admin@example.com', role='admin')
+        self.approved, self.pending = create_users(2)
+        Membership.objects.create(user=self.approved, club=self.club, status='approved', approved_at=timezone.now())
+        Membership.objects.create(user=self.pending, club=self.club, status='pending')
+        Message.objects.create(sender=self.approved, receiver=self.leader, subject='Сұрақ <1>', content='Құпия мәтін')
+        Message.objects.create(sender=self.pending, receiver=self.admin, subject='Өтініш', content='Мәтін')
+
+    def download(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content), response
+
+    def csv_rows(self, url, **params):
+        content, response = self.download(url, **params)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment; filename=', response['Content-Disposition'])
+        return list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+
+    def test_membership_export_filters_by_status(self):
+        self.client.force_login(self.leader)
+        url = reverse('export_memberships', args=[self.club.pk])
+        rows = self.csv_rows(url)
+        self.assertEqual(rows[0][:3], ['user_id', 'username', 'email'])
+        self.assertEqual([row[1] for row in rows[1:]], ['user0', 'user1'])
+        rows = self.csv_rows(url, status='pending')
+        self.assertEqual([row[1] for row in rows[1:]], ['user1'])
+
+    def test_message_export_skips_content_and_filters_by_user(self):
+        self.client.force_login(self.admin)
+        rows = self.csv_rows(reverse('export_messages'), user='user0')
+        self.assertEqual(rows[0], ['id', 'sender', 'receiver', 'subject', 'sent_at', 'is_read'])
+        self.assertEqual([(row[1], row[2], row[5]) for row in rows[1:]], [('user0', 'leader', '0')])
+        self.assertNotIn('Құпия', str(rows))
+        tomorrow = (timezone.localdate() + timedelta(days=1)).isoformat()
+        self.assertEqual(len(self.csv_rows(reverse('export_messages'), since=tomorrow)), 1)
+
+    def test_xlsx_export_is_a_valid_workbook(self):
+        self.client.force_login(self.admin)
+        content, response = self.download(reverse('export_users'), format='xlsx', role='admin')
+        self.assertIn('spreadsheetml', response['Content-Type'])
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIn('xl/workbook.xml', archive.namelist())
+            sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        self.assertEqual(sheet.count('<row>'), 2)
+        self.assertIn('<t>admin@example.com</t>', sheet)
+
+        content, _ = self.download(reverse('export_messages'), format='xlsx')
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIn('Сұрақ &lt;1&gt;', archive.read('xl/worksheets/sheet1.xml').decode())
+
+    def test_exports_require_permissions(self):
+        self.client.force_login(self.approved)
+        for name in ('export_memberships', 'export_attendance'):
+            response = self.client.get(reverse(name, args=[self.club.pk]))
+            self.assertRedirects(response, reverse('club_detail', args=[self.club.pk]), fetch_redirect_response=False)
+        for name in ('export_users', 'export_messages'):
+            self.assertEqual(self.client.get(reverse(name)).status_code, 302)
+        self.client.force_login(self.admin)
+        self.download(reverse('export_attendance', args=[self.club.pk]))
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = create_event()
+        self.club = self.event.club
+        self.member, = create_users(1)
+        Membership.objects.create(user=self.member, club=self.club, status='approved')
+        self.url = reverse('user_calendar', args=[self.member.calendar_token])
+
+    def test_feed_lists_member_events_and_revalidates(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertContains(response, f'UID:event-{self.event.pk}@testserver')
+        self.assertContains(response, 'SUMMARY:Турнир')
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_event_changes_produce_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = 'Финал'
+            self.event.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'SUMMARY:Финал')
+
+    def test_unknown_or_inactive_owner_is_not_found(self):
+        self.assertEqual(self.client.get(reverse('user_calendar', args=['wrong-token'])).status_code, 404)
+        self.member.is_active = False
+        self.member.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_inactive_club_is_hidden_from_members(self):
+        Club.objects.filter(pk=self.club.pk).update(is_active=False)
+        url = reverse('club_calendar', args=[self.member.calendar_token, self.club.pk])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        admin = User.objects.create_user('admin', 'admin@example.com', role='admin')
+        url = reverse('club_calendar', args=[admin.calendar_token, self.club.pk])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(reverse('club_calendar', args=[admin.calendar_token, 0])).status_code, 404)
+
+    def test_reset_revokes_old_token(self):
+        self.client.get(self.url)
+        self.client.force_login(self.member)
+        self.client.post(reverse('reset_calendar_token'))
+        self.member.refresh_from_db()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get(reverse('user_calendar', args=[self.member.calendar_token])).status_code, 200)
+
+    def test_text_is_escaped_and_folded(self):
+        self.assertEqual(escape_text('a,b;c\\d\nе'), 'a\\,b\\;c\\\\d\\nе')
+        folded = fold('SUMMARY:' + 'ә' * 60)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in folded.split('\r\n')))
+        self.assertEqual(folded.replace('\r\n ', ''), 'SUMMARY:' + 'ә' * 60)
+
+class UserSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.club = create_event().club
+        self.user, self.sender = create_users(2)
+
+    def test_snapshot_is_cached(self):
+        get_user_snapshot(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_snapshot(self.user.pk)['unread_messages'], 0)
+
+    def test_messages_invalidate_snapshot(self):
+        get_user_snapshot(self.user.pk)
+        message = Message.objects.create(sender=self.sender, receiver=self.user, subject='Сәлем', content='Мәтін')
+        self.assertEqual(get_user_snapshot(self.user.pk)['unread_messages'], 1)
+        message.is_read = True
+        message.save()
+        self.assertEqual(get_user_snapshot(self.user.pk)['unread_messages'], 0)
+
+    def test_memberships_invalidate_snapshot(self):
+        get_user_snapshot(self.user.pk)
+        membership = Membership.objects.create(user=self.user, club=self.club, status='approved')
+        self.assertEqual(get_user_snapshot(self.user.pk)['approved_club_ids'], [self.club.pk])
+        membership.delete()
+        self.assertEqual(get_user_snapshot(self.user.pk)['approved_club_ids'], [])
+
+    def test_leader_change_invalidates_both_leaders(self):
+        previous = self.club.leader
+        get_user_snapshot(previous.pk)
+        get_user_snapshot(self.user.pk)
+        self.club.leader = self.user
+        self.club.save()
+        self.assertEqual(get_user_snapshot(previous.pk)['led_club_ids'], [])
+        self.assertEqual(get_user_snapshot(self.user.pk)['led_club_ids'], [self.club.pk])
+
+# cache.add тек атомар бэкендтерде (Redis, LocMem) бір процесті ғана өткізеді
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class StatisticsSnapshotTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cold_cache_is_computed_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.3)
+            return {'total_clubs': 7}
+
+        with mock.patch('clubs.statistics.compute_statistics', side_effect=compute):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda _: get_statistics(), range(8)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([result['data'] for result in results], [{'total_clubs': 7}] * 8)
+
+    def test_expired_snapshot_is_served_while_locked(self):
+        with mock.patch('clubs.statistics.compute_statistics', return_value={'total_clubs': 1}):
+            get_statistics()
+        cache.add(STATISTICS_LOCK_KEY, True)
+        with mock.patch('clubs.statistics.compute_statistics') as compute:
+            result = get_statistics(fresh=True)
+        compute.assert_not_called()
+        self.assertTrue(result['is_stale'])
+        self.assertEqual(result['data'], {'total_clubs': 1})
+
+    @mock.patch('clubs.statistics.STATISTICS_POLL_INTERVAL', 0.01)
+    def test_cold_cache_while_locked_returns_placeholder(self):
+        cache.add(STATISTICS_LOCK_KEY, True)
+        with mock.patch('clubs.statistics.compute_statistics') as compute, \
+                mock.patch('clubs.statistics.STATISTICS_WAIT', 0.05):
+            result = get_statistics()
+        compute.assert_not_called()
+        self.assertIsNone(result['computed_at'])
+        self.assertTrue(result['is_stale'])
+
+class ComputeStatisticsTests(TestCase):
+    def test_counts_match_rows(self):
+        club = create_event().club
+        Club.objects.create(name='Жабық', description='Белсенді емес', is_active=False)
+        users = create_users(3)
+        Membership.objects.create(user=users[0], club=club, status='approved')
+        Membership.objects.create(user=users[1], club=club, status='pending')
+        with self.assertNumQueries(5):
+            statistics = compute_statistics()
+        self.assertEqual(statistics['total_clubs'], 2)
+        self.assertEqual(statistics['active_clubs'], 1)
+        self.assertEqual(statistics['total_users'], 4)
+        self.assertEqual(statistics['user_count'], 4)
+        self.assertEqual(statistics['total_memberships'], 2)
+        self.assertEqual(statistics['approved_memberships'], 1)
+        self.assertEqual(statistics['memberships_by_status'], [
+            {'status': 'approved', 'count': 1}, {'status': 'pending', 'count': 1},
+        ])
+
+class ClubStatsSeriesTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', role='admin')
+        self.leader = User.objects.create_user('leader', 'leader@example.com', role='leader')
+        self.own = Club.objects.create(name='Шахмат', description='Шахмат клубы', leader=self.admin)
+        self.other = Club.objects.create(name='Би', description='Би клубы', leader=self.leader)
+        self.url = reverse('club_stats_series')
+
+    def labels(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [dataset['label'] for dataset in response.json()['datasets']]
+
+    def test_invalid_club_is_not_found(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(self.url, {'club': 'abc'}).status_code, 404)
+        self.assertEqual(self.client.get(self.url, {'club': self.other.pk + 100}).status_code, 404)
+
+    def test_admin_can_select_any_club(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(self.labels(self.client.get(self.url, {'club': self.other.pk})), ['Би'])
+
+    def test_without_club_shows_led_clubs(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(self.labels(self.client.get(self.url)), ['Шахмат'])
+        self.client.force_login(self.leader)
+        self.assertEqual(self.labels(self.client.get(self.url)), ['Би'])
+        self.assertEqual(self.client.get(self.url, {'club': self.own.pk}).status_code, 404)
+
+class RsvpViewTests(TestCase):
+    def setUp(self):
+        self.event = create_event(capacity=1)
+        self.member, self.outsider = create_users(2)
+        Membership.objects.create(user=self.member, club=self.event.club, status='approved')
+        self.url = reverse('event_rsvp', args=[self.event.pk])
+
+    def test_member_can_register_and_cancel(self):
+        self.client.force_login(self.member)
+        self.client.post(self.url, {'action': 'register'})
+        self.assertTrue(EventAttendance.objects.filter(event=self.event, user=self.member).exists())
+        self.client.post(self.url, {'action': 'cancel'})
+        self.assertFalse(EventAttendance.objects.filter(event=self.event, user=self.member).exists())
+
+    def test_outsider_cannot_register(self):
+        self.client.force_login(self.outsider)
+        response = self.client.post(self.url, {'action': 'register'})
+        self.assertRedirects(response, reverse('events'))
+        self.assertFalse(EventAttendance.objects.filter(event=self.event).exists())
+
+    def test_events_page_shows_own_status(self):
+        register_attendance(self.event, self.member)
+        self.client.force_login(self.member)
+        response = self.client.get(reverse('events'))
+        self.assertEqual(response.context['upcoming_events'][0].my_status, 'registered')
+        self.assertContains(response, '1 / 1 орын')
+
+class RsvpConcurrencyTests(TransactionTestCase):
+    """Орын алу шартты UPDATE-пен құлыпсыз жүреді, сондықтан SQLite-та да тексеріледі.
+
+    Транзакциядағы тіркелу мен бас тарту SQLite-тың ортақ жадтағы тест базасында
+    "table is locked" береді: олар нағыз қатар жазуы бар дерекқорда ғана жүреді.
+    """
+
+    CAPACITY = 5
+    USERS = 40
+
+    def setUp(self):
+        self.event = create_event(capacity=self.CAPACITY)
+        self.users = create_users(self.USERS)
+
+    def run_parallel(self, action, items):
+        def call(item):
+            try:
+                return action(item)
+            finally:
+                connection.close()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(call, items))
+
+    def attend_parallel(self, action, users):
+        return self.run_parallel(lambda user: action(Event.objects.get(pk=self.event.pk), user), users)
+
+    def test_parallel_seat_claims_never_exceed_capacity(self):
+        results = self.run_parallel(lambda _: claim_seat(self.event.pk), range(self.USERS))
+
+        self.assertEqual(results.count(True), self.CAPACITY)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, self.CAPACITY)
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_parallel_registrations_never_exceed_capacity(self):
+        results = self.attend_parallel(register_attendance, self.users)
+
+        self.assertEqual(results.count('registered'), self.CAPACITY)
+        self.assertEqual(results.count('waitlisted'), self.USERS - self.CAPACITY)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, self.CAPACITY)
+        seated = EventAttendance.objects.filter(event=self.event, status__in=EventAttendance.SEAT_STATUSES)
+        self.assertEqual(seated.count(), self.CAPACITY)
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_parallel_cancellations_promote_waitlist(self):
+        self.attend_parallel(register_attendance, self.users)
+        seated = list(
+            EventAttendance.objects.filter(event=self.event, status='registered').values_list('user_id', flat=True)
+        )
+        self.attend_parallel(cancel_attendance, [user for user in self.users if user.pk in seated])
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, self.CAPACITY)
+        registered = EventAttendance.objects.filter(event=self.event, status='registered')
+        self.assertEqual(registered.count(), self.CAPACITY)
+        self.assertEqual(
+            EventAttendance.objects.filter(event=self.event, status='waitlisted').count(),
+            self.USERS - 2 * self.CAPACITY,
+        )
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = create_event()
+        self.club = self.event.club
+        self.member, = create_users(1)
+        Membership.objects.create(user=self.member, club=self.club, status='approved', approved_at=timezone.now())
+        self.client.force_login(self.member)
+
+    def revalidate(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        return response['ETag']
+
+    def assert_not_modified(self, url, etag):
+        with mock.patch('clubs.views.render') as render:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        render.assert_not_called()
+
+    def assert_modified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_club_detail_skips_heavy_queries(self):
+        url = reverse('club_detail', args=[self.club.pk])
+        etag = self.revalidate(url)
+        with mock.patch.object(Club, 'get_active_members') as members, CaptureQueriesContext(connection) as queries:
+            self.assert_not_modified(url, etag)
+        members.assert_not_called()
+        self.assertFalse(any('"clubs_event"' in query['sql'] for query in queries.captured_queries))
+
+    def test_club_detail_changes_with_notifications_and_events(self):
+        url = reverse('club_detail', args=[self.club.pk])
+        etag = self.revalidate(url)
+        Notification.objects.create(title='Жиналыс', content='Ертең', club=self.club, created_by=self.club.leader)
+        self.assert_modified(url, etag)
+
+        etag = self.revalidate(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = 'Финал'
+            self.event.save()
+        self.assert_modified(url, etag)
+
+    def test_club_detail_depends_on_viewer(self):
+        url = reverse('club_detail', args=[self.club.pk])
+        etag = self.revalidate(url)
+        self.client.force_login(self.club.leader)
+        self.assert_modified(url, etag)
+
+    def test_pending_messages_are_rendered(self):
+        url = reverse('events')
+        etag = self.revalidate(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('event_rsvp', args=[self.event.pk]), {'action': 'register'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'тіркелдіңіз')
+        # Хабары бар бет кэштелмеуі керек, әйтпесе хабар қайта көрсетіледі
+        self.assertNotIn('ETag', response)
+        self.assert_not_modified(url, self.revalidate(url))
+
+    def test_events_changes_with_rsvp(self):
+        url = reverse('events')
+        etag = self.revalidate(url)
+        self.assert_not_modified(url, etag)
+        with self.captureOnCommitCallbacks(execute=True):
+            register_attendance(self.event, self.member)
+        self.assert_modified(url, etag)
+
+    def test_notifications_changes_with_feed(self):
+        url = reverse('notifications')
+        etag = self.revalidate(url)
+        self.assert_not_modified(url, etag)
+        notification = Notification.objects.create(title='Жаңалық', content='Мәтін', club=self.club, created_by=self.club.leader)
+        UserFeedItem.objects.create(user=self.member, notification=notification, created_at=notification.created_at)
+        self.assert_modified(url, etag)
+
+    def test_home_for_anonymous_visitor(self):
+        self.client.logout()
+        url = reverse('home')
+        etag = self.revalidate(url)
+        self.assert_not_modified(url, etag)
+        Club.objects.create(name='Жаңа клуб', description='Сипаттама')
+        self.assert_modified(url, etag)
+
+class StaticAssetsTests(SimpleTestCase):
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        data = b'body { color: red; }' * 50
+        with open(os.path.join(root.name, 'site.css'), 'wb') as f:
+            f.write(data)
+        with open(os.path.join(root.name, 'site.css.gz'), 'wb') as f:
+            f.write(gzip.compress(data))
+        with self.settings(STATIC_SERVE=True, STATIC_ROOT=root.name, STATIC_URL='/static/'):
+            self.middleware = StaticAssetsMiddleware(lambda request: HttpResponse(status=404))
+
+    def get(self, **headers):
+        return self.middleware(RequestFactory().get('/static/site.css', headers=headers))
+
+    def test_etag_differs_per_encoding(self):
+        identity = self.get()
+        compressed = self.get(accept_encoding='gzip, br')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Encoding', identity)
+        self.assertNotEqual(identity['ETag'], compressed['ETag'])
+        self.assertEqual(compressed['Vary'], 'Accept-Encoding')
+
+    def test_not_modified_only_for_matching_representation(self):
+        identity_etag = self.get()['ETag']
+        self.assertEqual(self.get(if_none_match=identity_etag).status_code, 304)
+        response = self.get(if_none_match=identity_etag, accept_encoding='gzip')
+        self.assertEqual(response.status_code, 200)
+        response = self.get(if_none_match=f'"other", {response["ETag"]}', accept_encoding='gzip')
+        self.assertEqual(response.status_code, 304)
+
+class SharedBrokerCheckTests(SimpleTestCase):
+    @override_settings(DEBUG=False, PUBSUB_BACKEND='clubs.pubsub.LocalBroker')
+    def test_local_broker_is_refused_outside_debug(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ensure_shared_broker()
+        with self.settings(DEBUG=True):
+            ensure_shared_broker()
+        with self.settings(PUBSUB_BACKEND='clubs.pubsub.PostgresBroker'):
+            ensure_shared_broker()
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def run_request(self, view, cookies=None, write=False):
+        aliases = {}
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            aliases['read'] = self.router.db_for_read(Club)
+            if write:
+                self.router.db_for_write(Club)
+                aliases['after_write'] = self.router.db_for_read(Club)
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        request = self.factory.get('/')
+        request.COOKIES.update(cookies or {})
+        return middleware(request), aliases
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Club), 'default')
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Club), 'replica')
+            self.assertEqual(self.router.db_for_read(Session), 'default')
+        self.assertEqual(self.router.db_for_write(Club), 'default')
+
+    def test_only_replica_safe_views_read_from_replica(self):
+        _, aliases = self.run_request(replica_safe(lambda request: None))
+        self.assertEqual(aliases['read'], 'replica')
+        _, aliases = self.run_request(lambda request: None)
+        self.assertEqual(aliases['read'], 'default')
+
+    def test_write_pins_following_reads_to_primary(self):
+        view = replica_safe(lambda request: None)
+        response, aliases = self.run_request(view, write=True)
+        self.assertEqual(aliases['after_write'], 'default')
+        cookie = response.cookies[ReplicaRoutingMiddleware.cookie_name]
+
+        _, aliases = self.run_request(view, cookies={cookie.key: cookie.value})
+        self.assertEqual(aliases['read'], 'default')
+        expired = str(time.time() - 1)
+        _, aliases = self.run_request(view, cookies={cookie.key: expired})
+        self.assertEqual(aliases['read'], 'replica')
+
+    def test_reads_inside_transaction_use_primary(self):
+        with replica_reads(), mock.patch.object(connections['default'], 'in_atomic_block', True):
+            self.assertEqual(self.router.db_for_read(Club), 'default')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertIs(self.router.allow_migrate('replica', 'clubs'), False)
+        self.assertIsNone(self.router.allow_migrate('default', 'clubs'))
@@ -4,11 +4,14 @@ from . import views
 urlpatterns = [
     path('clubs/', views.club_list, name='club_list'),
     path('clubs/create/', views.club_create, name='club_create'),
+    path('clubs/stats/', views.club_stats_series, name='club_stats_series'),
     path('clubs/<int:pk>/', views.club_detail, name='club_detail'),
     path('clubs/<int:pk>/update/', views.club_update, name='club_update'),
     path('clubs/<int:pk>/delete/', views.club_delete, name='club_delete'),
     path('clubs/<int:pk>/apply/', views.apply_membership, name='apply_membership'),
     path('clubs/<int:pk>/manage-memberships/', views.manage_memberships, name='manage_memberships'),
+    path('clubs/<int:pk>/memberships/export/', views.export_memberships, name='export_memberships'),
+    path('clubs/<int:pk>/attendance/export/', views.export_attendance, name='export_attendance'),
     
     path('notifications/', views.notifications, name='notifications'),
     path('notification/create/', views.create_notification, name='create_notification'),
@@ -16,10 +19,16 @@ urlpatterns = [
     path('events/', views.events, name='events'),
     path('event/create/', views.create_event, name='create_event'),
     path('event/create/<int:pk>/', views.create_event, name='create_event_for_club'),
+    path('event/<int:pk>/rsvp/', views.event_rsvp, name='event_rsvp'),
     
     path('my-clubs/', views.my_clubs, name='my_clubs'),
     
     path('messages/', views.inbox, name='inbox'),
+    path('messages/sent/', views.inbox_sent, name='inbox_sent'),
     path('messages/send/', views.send_message, name='send_message'),
     path('messages/<int:message_id>/', views.message_detail, name='message_detail'),
+    
+    path('events/stream/', views.event_stream, name='event_stream'),
+    path('calendar/<str:token>.ics', views.user_calendar, name='user_calendar'),
+    path('calendar/<str:token>/clubs/<int:pk>.ics', views.club_calendar, name='club_calendar'),
 ]
\ No newline at end of file
@@ -0,0 +1,112 @@
+import hashlib
+from functools import wraps
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max, Min, OuterRef, Q, Subquery
+from django.middleware.csrf import get_token
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from .fragments import club_versions, get_versions, version_key
+from .models import Club, Event, EventAttendance, Membership, Notification, UserFeedItem
+from .snapshots import get_user_snapshot
+
+def viewer_fingerprint(request):
+    """base.html-ге әсер ететін қараушы күйі: рөл, клубтар, оқылмаған хабарлар, CSRF құпиясы"""
+    get_token(request)
+    csrf = request.META.get('CSRF_COOKIE', '')
+    user = request.user
+    if not user.is_authenticated:
+        return ('anonymous', csrf)
+    snapshot = get_user_snapshot(user.pk)
+    return (
+        user.pk, user.username, user.role, user.is_superuser, csrf,
+        snapshot['unread_messages'], sorted(snapshot['approved_club_ids']), sorted(snapshot['led_club_ids']),
+    )
+
+def make_etag(*parts):
+    # Әлсіз ETag: бет мағынасы бойынша бірдей, ал денесін GZipMiddleware немесе прокси
+    # әр кодтауда әртүрлі сығады, күшті ETag әр байт-нұсқаға бөлек болуы керек еді
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return 'W/' + quote_etag(digest)
+
+def conditional_page(validator):
+    """Көріністі орындамас бұрын validator(request, ...) арзан саусақ ізін тексеру.
+
+    ETag сәйкес келсе, ауыр сұраулар мен рендерсіз 304 қайтарылады. validator None
+    қайтарса немесе көрсетілмеген flash-хабарлар болса, көрініс әдеттегідей орындалады.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or len(get_messages(request)):
+                return view(request, *args, **kwargs)
+            fingerprint = validator(request, *args, **kwargs)
+            if fingerprint is None:
+                return view(request, *args, **kwargs)
+
+            etag = make_etag(request.get_full_path(), viewer_fingerprint(request), fingerprint)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response['ETag'] = etag
+            # Браузер әр жолы тексерсін: бет жеке және тез өзгереді
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
+
+def home_validator(request):
+    clubs = list(Club.objects.filter(is_active=True).values_list('pk', 'updated_at', 'members_count')[:6])
+    notifications = list(
+        Notification.objects.filter(is_active=True).order_by('-created_at').values_list('pk', flat=True)[:5]
+    )
+    events = list(
+        Event.objects.filter(date__gte=timezone.now()).order_by('date').values_list('pk', 'club_id')[:3]
+    )
+    keys = [version_key('events', club_id) for _, club_id in events]
+    return clubs, notifications, events, sorted(get_versions(keys).items())
+
+def club_detail_validator(request, pk):
+    user_status = Membership.objects.filter(club=OuterRef('pk'), user=request.user).values('status')[:1]
+    notifications = Notification.objects.filter(
+        club=OuterRef('pk'), is_active=True
+    ).order_by().values('club').annotate(state=Max('created_at')).values('state')
+    active_notifications = Notification.objects.filter(
+        club=OuterRef('pk'), is_active=True
+    ).order_by().values('club').annotate(total=Count('pk')).values('total')
+    members = Membership.objects.filter(
+        club=OuterRef('pk'), status='approved'
+    ).order_by().values('club').annotate(latest=Max('approved_at')).values('latest')
+    club = Club.objects.filter(pk=pk).values_list(
+        'updated_at', 'is_active', 'leader_id', 'members_count',
+    ).annotate(
+        user_status=Subquery(user_status),
+        latest_member=Subquery(members),
+        latest_notification=Subquery(notifications),
+        active_notifications=Subquery(active_notifications),
+    ).first()
+    if club is None:
+        return None
+    versions = club_versions(pk)
+    return club, versions['members'], versions['events']
+
+def notifications_validator(request):
+    return tuple(UserFeedItem.objects.filter(
+        user=request.user, notification__is_active=True
+    ).aggregate(latest=Max('created_at'), total=Count('pk')).values())
+
+def events_validator(request):
+    snapshot = get_user_snapshot(request.user.pk)
+    club_ids = sorted(set(snapshot['approved_club_ids']) | set(snapshot['led_club_ids']))
+    state = Event.objects.filter(club_id__in=club_ids).aggregate(
+        # Келесі іс-шара өткенде бет "жуықтағы" және "өткен" бөліктері арасында ауысады
+        next_event=Min('date', filter=Q(date__gte=timezone.now())),
+        total=Count('pk'),
+    )
+    attendance = EventAttendance.objects.filter(user=request.user).aggregate(
+        latest=Max('registered_at'), total=Count('pk')
+    )
+    versions = get_versions([version_key('events', club_id) for club_id in club_ids])
+    return club_ids, tuple(state.values()), tuple(attendance.values()), sorted(versions.items())
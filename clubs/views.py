@@ -1,12 +1,35 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
-from datetime import timedelta
-from .models import Club, Membership, Notification, Event, Message
+from .calendars import calendar_response, resolve_token
+from .models import Club, Membership, Notification, Event, EventAttendance, Message
+from .exports import export_response
+from .facets import category_facets
+from .feed import user_feed
 from .forms import ClubForm, MembershipForm, NotificationForm, EventForm, MessageForm
-from users.models import CustomUser
+from .jobs import queue_stats, retry_failed_jobs
+from .memberships import approve_memberships, reject_memberships, status_counts
+from .metrics import registry as metrics_registry
+from .pagination import CountedPaginator, keyset_page
+from .pubsub import publish, user_topic
+from .rollups import club_member_series, platform_series
+from .routers import replica_safe
+from .rsvp import cancel_attendance, register_attendance
+from .search import search_clubs
+from .statistics import get_statistics
+from .snapshots import get_user_snapshot, invalidate_user_snapshot
+from .streams import user_event_poll, user_event_stream
+from .validators import club_detail_validator, conditional_page, events_validator, home_validator, notifications_validator
+
+INBOX_PAGE_SIZE = 20
+NOTIFICATIONS_PAGE_SIZE = 20
+MEMBERSHIPS_PAGE_SIZE = 25
 
 def is_admin(user):
     return user.is_authenticated and user.is_admin()
@@ -14,10 +37,11 @@ def is_admin(user):
 def is_leader(user):
     return user.is_authenticated and (user.is_leader() or user.is_admin())
 
+@conditional_page(home_validator)
 def home(request):
     clubs = Club.objects.filter(is_active=True)[:6]
-    notifications = Notification.objects.filter(is_active=True).order_by('-created_at')[:5]
-    upcoming_events = Event.objects.filter(date__gte=timezone.now()).order_by('date')[:3]
+    notifications = Notification.objects.filter(is_active=True).select_related('club').order_by('-created_at')[:5]
+    upcoming_events = Event.objects.filter(date__gte=timezone.now()).select_related('club').order_by('date')[:3]
     
     context = {
         'clubs': clubs,
@@ -26,25 +50,26 @@ def home(request):
     }
     return render(request, 'clubs/home.html', context)
 
+@replica_safe
 @login_required
 def club_list(request):
     search_query = request.GET.get('search', '')
     category_filter = request.GET.get('category', '')
     
-    clubs = Club.objects.all()
+    clubs = Club.objects.select_related('leader')
+    active_only = not request.user.is_admin()
     
     if search_query:
-        clubs = clubs.filter(
-            Q(name__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
+        clubs = search_clubs(clubs, search_query)
+    
+    if active_only:
+        clubs = clubs.filter(is_active=True)
+    
+    facets = category_facets(clubs, signature=(search_query, active_only), selected=category_filter)
     
     if category_filter:
         clubs = clubs.filter(category=category_filter)
     
-    if not request.user.is_admin():
-        clubs = clubs.filter(is_active=True)
-    
     categories = Club.CATEGORY_CHOICES
     
     from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
@@ -61,6 +86,7 @@ def club_list(request):
     return render(request, 'clubs/club_list.html', {
         'clubs': clubs,
         'categories': categories,
+        'facets': facets,
         'search_query': search_query,
         'category_filter': category_filter,
     })
@@ -80,6 +106,7 @@ def club_create(request):
     return render(request, 'clubs/club_form.html', {'form': form, 'action': 'Құру'})
 
 @login_required
+@conditional_page(club_detail_validator)
 def club_detail(request, pk):
     club = get_object_or_404(Club, pk=pk)
     
@@ -171,44 +198,63 @@ def manage_memberships(request, pk):
         messages.error(request, 'Сізде бұл клубты басқару құқығы жоқ')
         return redirect('club_detail', pk=pk)  
     
-    pending_memberships = Membership.objects.filter(club=club, status='pending')
-    approved_memberships = Membership.objects.filter(club=club, status='approved')
-    rejected_memberships = Membership.objects.filter(club=club, status='rejected')
-    
     if request.method == 'POST':
-        membership_id = request.POST.get('membership_id')
         action = request.POST.get('action')
         notes = request.POST.get('notes', '')
+        ids = [int(pk) for pk in request.POST.getlist('membership_ids') if pk.isdigit()]
+        if request.POST.get('membership_id', '').isdigit():
+            ids.append(int(request.POST['membership_id']))
+        
+        if action == 'approve_all':
+            approved = approve_memberships(club, None, notes)
+            messages.success(request, f'Барлық күтудегі өтініштер қабылданды: {approved}')
+        elif action == 'approve' and ids:
+            approved = approve_memberships(club, ids, notes)
+            messages.success(request, f'{approved} мүшелік қабылданды!')
+        elif action == 'reject' and ids:
+            rejected, _ = reject_memberships(club, ids, notes)
+            messages.success(request, f'{rejected} мүшелік қабылданбады деп таңдалды!')
+        else:
+            messages.warning(request, 'Ешбір өтініш таңдалмады')
         
-        if membership_id and action:
-            membership = get_object_or_404(Membership, id=membership_id, club=club)
-            
-            if action == 'approve':
-                membership.status = 'approved'
-                membership.approved_at = timezone.now()
-                membership.notes = notes
-                membership.save()
-                
-                user = membership.user
-                if user.role == 'user':
-                    user.role = 'member'
-                    user.save()
-                
-                messages.success(request, f'{membership.user.username} мүшелігі қабылданды!')
-                
-            elif action == 'reject':
-                membership.status = 'rejected'
-                membership.notes = notes
-                membership.save()
-                messages.success(request, f'{membership.user.username} мүшелігі қабылданбады деп таңдалды!')
+        query = request.GET.urlencode()
+        return redirect(f'{request.path}?{query}' if query else request.path)
+    
+    counts = status_counts(club)
+    memberships = Membership.objects.filter(club=club).select_related('user')
+    lists = {}
+    for status, ordering in (('pending', 'applied_at'), ('approved', '-approved_at'), ('rejected', '-applied_at')):
+        paginator = CountedPaginator(
+            memberships.filter(status=status).order_by(ordering, 'pk'), MEMBERSHIPS_PAGE_SIZE, counts[status]
+        )
+        lists[f'{status}_memberships'] = paginator.get_page(request.GET.get(f'{status}_page'))
     
     return render(request, 'clubs/manage_memberships.html', {
         'club': club,
-        'pending_memberships': pending_memberships,
-        'approved_memberships': approved_memberships,
-        'rejected_memberships': rejected_memberships,
+        'counts': counts,
+        **lists,
     })
 
+@login_required
+def export_memberships(request, pk):
+    club = get_object_or_404(Club, pk=pk)
+    if not (request.user == club.leader or request.user.is_admin()):
+        messages.error(request, 'Сізде бұл клубты басқару құқығы жоқ')
+        return redirect('club_detail', pk=pk)
+    
+    params = {'club': club.pk, 'status': request.GET.get('status', '')}
+    return export_response(request, 'memberships', params, f'club-{club.pk}-members')
+
+@login_required
+def export_attendance(request, pk):
+    club = get_object_or_404(Club, pk=pk)
+    if not (request.user == club.leader or request.user.is_admin()):
+        messages.error(request, 'Сізде бұл клубты басқару құқығы жоқ')
+        return redirect('club_detail', pk=pk)
+    
+    params = {'club': club.pk, 'event': request.GET.get('event', '')}
+    return export_response(request, 'attendance', params, f'club-{club.pk}-attendance')
+
 @login_required
 def create_notification(request):
     user_clubs = Club.objects.filter(
@@ -274,22 +320,19 @@ def my_clubs(request):
         'pending_applications': pending_applications,
     })
 
+@replica_safe
 @login_required
+@conditional_page(notifications_validator)
 def notifications(request):
-    user_clubs = Club.objects.filter(
-        Q(leader=request.user) | 
-        Q(members__user=request.user, members__status='approved')
-    ).distinct()
-    
-    all_notifications = Notification.objects.filter(
-        Q(club__in=user_clubs) | Q(club=None)
-    ).filter(is_active=True).order_by('-created_at')
+    feed = user_feed(request.user, cursor=request.GET.get('cursor'), per_page=NOTIFICATIONS_PAGE_SIZE)
     
     return render(request, 'clubs/notifications.html', {
-        'notifications': all_notifications,
+        'notifications': feed.notifications,
+        'feed': feed,
     })
 
 @login_required
+@conditional_page(events_validator)
 def events(request):
     user_clubs = Club.objects.filter(
         Q(leader=request.user) | 
@@ -299,18 +342,56 @@ def events(request):
     upcoming_events = Event.objects.filter(
         club__in=user_clubs,
         date__gte=timezone.now()
-    ).order_by('date')
+    ).select_related('club').order_by('date')
     
     past_events = Event.objects.filter(
         club__in=user_clubs,
         date__lt=timezone.now()
-    ).order_by('-date')[:10]
+    ).select_related('club').order_by('-date')[:10]
+    
+    upcoming_events = list(upcoming_events)
+    my_statuses = dict(EventAttendance.objects.filter(
+        user=request.user, event__in=[event.pk for event in upcoming_events]
+    ).values_list('event_id', 'status'))
+    for event in upcoming_events:
+        event.my_status = my_statuses.get(event.pk)
     
     return render(request, 'clubs/events.html', {
         'upcoming_events': upcoming_events,
         'past_events': past_events,
     })
 
+@login_required
+def event_rsvp(request, pk):
+    event = get_object_or_404(Event.objects.select_related('club'), pk=pk)
+    if request.method != 'POST':
+        return redirect('events')
+    
+    club = event.club
+    allowed = (
+        request.user.is_admin() or request.user == club.leader or
+        Membership.objects.filter(user=request.user, club=club, status='approved').exists()
+    )
+    if not allowed:
+        messages.error(request, 'Іс-шараға тек клуб мүшелері тіркеле алады')
+        return redirect('events')
+    if event.date < timezone.now():
+        messages.error(request, 'Бұл іс-шара өтіп кеткен')
+        return redirect('events')
+    
+    if request.POST.get('action') == 'cancel':
+        if cancel_attendance(event, request.user):
+            messages.success(request, f'"{event.title}" іс-шарасына тіркелу болдырылмады')
+        else:
+            messages.warning(request, 'Сіз бұл іс-шараға тіркелмегенсіз')
+    else:
+        status = register_attendance(event, request.user)
+        if status == 'waitlisted':
+            messages.info(request, f'"{event.title}" іс-шарасында бос орын жоқ. Сіз күту тізіміне қосылдыңыз')
+        else:
+            messages.success(request, f'Сіз "{event.title}" іс-шарасына тіркелдіңіз!')
+    return redirect('events')
+
 @login_required
 def send_message(request):
     if request.method == 'POST':
@@ -328,19 +409,65 @@ def send_message(request):
 
 @login_required
 def inbox(request):
-    received_messages = Message.objects.filter(receiver=request.user).order_by('-sent_at')
-    sent_messages = Message.objects.filter(sender=request.user).order_by('-sent_at')
+    received_messages = keyset_page(
+        Message.objects.filter(receiver=request.user).select_related('sender'),
+        cursor=request.GET.get('cursor'),
+        per_page=INBOX_PAGE_SIZE,
+    )
     
-    unread_messages = received_messages.filter(is_read=False)
-    for message in unread_messages:
-        message.is_read = True
-        message.save()
+    marked = Message.objects.filter(receiver=request.user, is_read=False).update(is_read=True)
+    if marked:
+        invalidate_user_snapshot(request.user.pk)
+        publish(user_topic(request.user.pk), {'type': 'unread'})
     
     return render(request, 'clubs/inbox.html', {
         'received_messages': received_messages,
+    })
+
+@login_required
+def inbox_sent(request):
+    sent_messages = keyset_page(
+        Message.objects.filter(sender=request.user).select_related('receiver'),
+        cursor=request.GET.get('cursor'),
+        per_page=INBOX_PAGE_SIZE,
+    )
+    
+    return render(request, 'clubs/inbox_sent.html', {
         'sent_messages': sent_messages,
     })
 
+@login_required
+async def event_stream(request):
+    user = await request.auser()
+    if isinstance(request, ASGIRequest):
+        stream = user_event_stream(user.pk)
+    else:
+        # WSGI-де async генератор ешқашан аяқталмай, воркерді мәңгі ұстап қалады
+        stream = await sync_to_async(user_event_poll)(user.pk)
+    return StreamingHttpResponse(
+        stream,
+        content_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+def user_calendar(request, token):
+    owner = resolve_token(token)
+    if owner is None:
+        raise Http404('Күнтізбе табылмады')
+    snapshot = get_user_snapshot(owner[0])
+    club_ids = set(snapshot['approved_club_ids']) | set(snapshot['led_club_ids'])
+    return calendar_response(request, 'clubs', 'Менің клубтарым', club_ids)
+
+def club_calendar(request, token, pk):
+    owner = resolve_token(token)
+    if owner is None:
+        raise Http404('Күнтізбе табылмады')
+    club = Club.objects.filter(pk=pk).values_list('name', 'is_active').first()
+    user_id, role, is_superuser = owner
+    if club is None or not (club[1] or role == 'admin' or is_superuser):
+        raise Http404('Клуб табылмады')
+    return calendar_response(request, f'club-{pk}', club[0], [pk])
+
 @login_required
 def message_detail(request, message_id):
     message = get_object_or_404(Message, id=message_id)
@@ -357,83 +484,79 @@ def message_detail(request, message_id):
 
 
 
+@replica_safe
 @login_required
 @user_passes_test(is_admin)
 def admin_statistics(request):
+    statistics = get_statistics(fresh=request.GET.get('fresh') == '1')
+    
+    context = {
+        **statistics['data'],
+        'computed_at': statistics['computed_at'],
+        'is_stale': statistics['is_stale'],
+        'statistics_error': statistics['error'],
+    }
+    return render(request, 'admin/statistics.html', context)
+
+def series_days(request):
     try:
+        days = int(request.GET.get('days', 30))
+    except ValueError:
+        days = 30
+    return max(7, min(days, 365))
 
-        total_clubs = Club.objects.count()
-        active_clubs = Club.objects.filter(is_active=True).count()
-        total_users = CustomUser.objects.count()
-        total_memberships = Membership.objects.count()
-        approved_memberships = Membership.objects.filter(status='approved').count()
-
-        clubs_by_category = Club.objects.values('category').annotate(count=Count('id')).order_by('-count')
-
-        categories_data = []
-        for item in clubs_by_category:
-            category_data = {
-                'category': item['category'] if item['category'] else 'other',
-                'count': item['count']
-            }
-            categories_data.append(category_data)
-        
+@replica_safe
+@login_required
+@user_passes_test(is_admin)
+def admin_statistics_trends(request):
+    return JsonResponse(platform_series(series_days(request)))
 
-        memberships_by_status = Membership.objects.values('status').annotate(
-            count=Count('id')
-        ).order_by('status')
-        
+@replica_safe
+@login_required
+@user_passes_test(is_leader)
+def club_stats_series(request):
+    club_id = request.GET.get('club')
+    if club_id:
+        # Әкімші кез келген клубты, лидер тек өз клубын сұрай алады
+        clubs = Club.objects.all() if request.user.is_admin() else Club.objects.filter(leader=request.user)
+        try:
+            clubs = clubs.filter(pk=int(club_id))
+        except ValueError:
+            raise Http404('Клуб табылмады')
+        if not clubs.exists():
+            raise Http404('Клуб табылмады')
+    else:
+        # Басқару тақтасының графигі ?club= жібермейді және "менің клубтарым" қатарын күтеді:
+        # әкімшіге де тек өзі басқаратын клубтар, әйтпесе барлық клубтың қатары бір жауапқа жүктеледі
+        clubs = Club.objects.filter(leader=request.user)
+    
+    return JsonResponse(club_member_series(clubs, series_days(request)))
 
-        seven_days_ago = timezone.now() - timedelta(days=7)
-        new_users_week = CustomUser.objects.filter(date_joined__gte=seven_days_ago).count()
-        new_memberships_week = Membership.objects.filter(applied_at__gte=seven_days_ago).count()
-        new_notifications_week = Notification.objects.filter(created_at__gte=seven_days_ago).count()
+@login_required
+@user_passes_test(is_admin)
+def request_metrics(request):
+    if request.method == 'POST':
+        metrics_registry.reset()
+        messages.success(request, 'Метрикалар тазартылды')
+        return redirect('request_metrics')
+    
+    return render(request, 'admin/metrics.html', {
+        'metrics': metrics_registry.snapshot(),
+        'fragments': metrics_registry.fragment_snapshot(),
+        'metrics_enabled': settings.REQUEST_METRICS_ENABLED,
+    })
 
-        admin_count = CustomUser.objects.filter(role='admin').count()
-        leader_count = CustomUser.objects.filter(role='leader').count()
-        member_count = CustomUser.objects.filter(role='member').count()
-        user_count = CustomUser.objects.filter(role='user').count()
-        
+@login_required
+@user_passes_test(is_admin)
+def job_queue(request):
+    if request.method == 'POST':
+        retried = retry_failed_jobs()
+        messages.success(request, f'{retried} сәтсіз тапсырма кезекке қайта қойылды')
+        return redirect('job_queue')
+    
+    return render(request, 'admin/jobs.html', {'stats': queue_stats()})
 
-        total_by_roles = admin_count + leader_count + member_count + user_count
-        
-        context = {
-            'total_clubs': total_clubs,
-            'active_clubs': active_clubs,
-            'total_users': total_users,
-            'total_memberships': total_memberships,
-            'approved_memberships': approved_memberships,
-            'clubs_by_category': categories_data,
-            'memberships_by_status': list(memberships_by_status),
-            'new_users_week': new_users_week,
-            'new_memberships_week': new_memberships_week,
-            'new_notifications_week': new_notifications_week,
-            'admin_count': admin_count,
-            'leader_count': leader_count,
-            'member_count': member_count,
-            'user_count': user_count,
-            'total_by_roles': total_by_roles,  
-        }
-        
-    except Exception as e:
-
-        print(f"Статистика қатесі: {e}")
-        context = {
-            'total_clubs': 0,
-            'active_clubs': 0,
-            'total_users': 0,
-            'total_memberships': 0,
-            'approved_memberships': 0,
-            'clubs_by_category': [],
-            'memberships_by_status': [],
-            'new_users_week': 0,
-            'new_memberships_week': 0,
-            'new_notifications_week': 0,
-            'admin_count': 0,
-            'leader_count': 0,
-            'member_count': 0,
-            'user_count': 0,
-            'total_by_roles': 0,
-        }
-    
-    return render(request, 'admin/statistics.html', context)
\ No newline at end of file
+@login_required
+@user_passes_test(is_admin)
+def export_messages(request):
+    return export_response(request, 'messages', request.GET, 'messages')
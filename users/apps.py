@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from . import signals, tasks  # noqa: F401
+        from .backends import ensure_shared_cache
+        ensure_shared_cache()
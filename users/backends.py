@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+USER_CACHE_VERSION = 1
+USER_CACHE_TIMEOUT = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 15 * 60)
+# Бұл кэштер әр процеске жеке: бір воркердегі инвалидация басқаларына жетпейді
+PROCESS_LOCAL_CACHES = {'django.core.cache.backends.locmem.LocMemCache'}
+
+def ensure_shared_cache():
+    """CachedModelBackend процесс-жергілікті кэшпен іске қосылса, бірден тоқтату.
+
+    Әйтпесе өшірілген немесе рөлі өзгерген пайдаланушы басқа воркерлерде
+    AUTH_USER_CACHE_TIMEOUT бойы ескі құқықтарымен қалады.
+    """
+    if 'users.backends.CachedModelBackend' not in settings.AUTHENTICATION_BACKENDS:
+        return
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            f'CachedModelBackend ортақ кэшті талап етеді, ал CACHES["default"] = {backend}. '
+            'Redis/Memcached орнатыңыз немесе ModelBackend қолданыңыз.'
+        )
+
+def user_cache_key(user_id):
+    return f'users:auth_user:v{USER_CACHE_VERSION}:{user_id}'
+
+def invalidate_cached_users(*user_ids):
+    """Кэштелген пайдаланушыларды өшіру: қазір және транзакция аяқталғанда.
+
+    Екінші өшіру commit-ке дейін ескі жолды қайта кэштеп үлгерген сұрауларға арналған.
+    """
+    keys = [user_cache_key(user_id) for user_id in user_ids if user_id]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, бірақ әр сұраудағы сессия пайдаланушысын кэштен жүктейді"""
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
@@ -1,6 +1,6 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
-from .models import CustomUser
+from .models import CustomUser, UserImport
 
 class CustomUserCreationForm(UserCreationForm):
     email = forms.EmailField(required=True, label='Электрондық пошта')
@@ -37,4 +37,18 @@ class AdminUserUpdateForm(forms.ModelForm):
     class Meta:
         model = CustomUser
         fields = ['username', 'email', 'first_name', 'last_name', 
-                  'student_id', 'phone', 'role', 'is_active', 'is_staff', 'profile_image']
\ No newline at end of file
+                  'student_id', 'phone', 'role', 'is_active', 'is_staff', 'profile_image']
+
+class UserImportForm(forms.ModelForm):
+    class Meta:
+        model = UserImport
+        fields = ['file', 'membership_status', 'dry_run']
+        help_texts = {
+            'file': 'CSV немесе XLSX: username, email, first_name, last_name, student_id, phone, role, password, clubs',
+        }
+    
+    def clean_file(self):
+        file = self.cleaned_data['file']
+        if not file.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError('Тек CSV немесе XLSX файлдары қабылданады')
+        return file
@@ -0,0 +1,20 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Бұл модуль модельдерді импорттамайды: spawn арқылы ашылған процесс
+# оны django.setup()-қа дейін жүктейді.
+
+def setup_worker():
+    import django
+    django.setup()
+
+def hash_passwords(passwords):
+    from django.contrib.auth.hashers import make_password
+    return [make_password(password) for password in passwords]
+
+def create_hash_executor(workers):
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=setup_worker,
+    )
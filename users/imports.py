@@ -0,0 +1,231 @@
+import csv
+import io
+import os
+from collections import defaultdict
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from clubs.jobs import enqueue
+from clubs.models import Club, Membership, adjust_member_count
+from .hashing import create_hash_executor, hash_passwords
+from .models import CustomUser
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+IMPORT_CHUNK_SIZE = getattr(settings, 'USER_IMPORT_CHUNK_SIZE', 1000)
+IMPORT_HASH_WORKERS = getattr(settings, 'USER_IMPORT_HASH_WORKERS', os.cpu_count() or 2)
+IMPORT_MAX_ERRORS = getattr(settings, 'USER_IMPORT_MAX_ERRORS', 1000)
+
+TEXT_FIELDS = ('username', 'email', 'first_name', 'last_name', 'student_id', 'phone')
+ROLES = {role for role, _ in CustomUser.ROLE_CHOICES}
+
+def read_rows(file, filename):
+    """Файл жолдарын (жол нөмірі, {баған: мән}) түрінде бір-бірлеп оқу"""
+    file = getattr(file, 'file', file)
+    if filename.lower().endswith('.xlsx'):
+        if openpyxl is None:
+            raise ValueError('XLSX файлдарын оқу үшін openpyxl орнатыңыз немесе CSV жүктеңіз')
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell or '').strip().lower() for cell in next(rows, ())]
+        for line, values in enumerate(rows, start=2):
+            if any(value not in (None, '') for value in values):
+                yield line, {
+                    name: '' if value is None else str(value).strip()
+                    for name, value in zip(header, values) if name
+                }
+        workbook.close()
+        return
+
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding='utf-8-sig', newline=''))
+    if reader.fieldnames:
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    for row in reader:
+        if any(row.values()):
+            yield reader.line_num, {name: (value or '').strip() for name, value in row.items() if name}
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+class ImportReport:
+    def __init__(self):
+        self.total_rows = 0
+        self.created = 0
+        self.memberships = 0
+        self.errors = []
+        self.error_count = 0
+
+    def add_error(self, line, username, message):
+        self.error_count += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({'line': line, 'username': username, 'error': message})
+
+class UserImporter:
+    """CSV/XLSX жолдарынан пайдаланушыларды бумалап құру.
+
+    Әр буманы тексеру екі сұрауды алады, парольдер процестер пулында
+    хэштеледі, пайдаланушылар мен мүшеліктер bulk_create арқылы жазылады.
+    """
+
+    def __init__(self, dry_run=False, membership_status='approved',
+                 chunk_size=IMPORT_CHUNK_SIZE, workers=IMPORT_HASH_WORKERS):
+        self.dry_run = dry_run
+        self.membership_status = membership_status
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.report = ImportReport()
+        self.seen_usernames = set()
+        self.seen_emails = set()
+        self.club_ids = {}
+        for pk, name in Club.objects.values_list('pk', 'name'):
+            self.club_ids[str(pk)] = pk
+            self.club_ids[name.strip().lower()] = pk
+
+    def run(self, rows, progress=None):
+        executor = None if self.dry_run else create_hash_executor(self.workers)
+        try:
+            for chunk in chunked(rows, self.chunk_size):
+                self.report.total_rows += len(chunk)
+                valid = self.validate_chunk(chunk)
+                if valid and not self.dry_run:
+                    self.hash_chunk(valid, executor)
+                    self.save_chunk(valid)
+                if progress:
+                    progress(self.report)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return self.report
+
+    def validate_chunk(self, chunk):
+        usernames = {row.get('username', '') for _, row in chunk}
+        emails = {CustomUser.objects.normalize_email(row.get('email', '')) for _, row in chunk}
+        taken_usernames = set(CustomUser.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_emails = set(CustomUser.objects.filter(email__in=emails).values_list('email', flat=True))
+
+        valid = []
+        for line, row in chunk:
+            errors, entry = self.validate_row(row, taken_usernames, taken_emails)
+            if errors:
+                self.report.add_error(line, row.get('username', ''), '; '.join(errors))
+                continue
+            self.seen_usernames.add(entry['user'].username)
+            self.seen_emails.add(entry['user'].email)
+            entry['line'] = line
+            valid.append(entry)
+        return valid
+
+    def validate_row(self, row, taken_usernames, taken_emails):
+        errors = []
+        values = {name: row.get(name, '') for name in TEXT_FIELDS}
+        values['email'] = CustomUser.objects.normalize_email(values['email'])
+        for name, value in values.items():
+            max_length = CustomUser._meta.get_field(name).max_length
+            if len(value) > max_length:
+                errors.append(f'{name}: {max_length} таңбадан аспауы керек')
+
+        username, email = values['username'], values['email']
+        if not username:
+            errors.append('username бос')
+        elif username in taken_usernames or username in self.seen_usernames:
+            errors.append(f'"{username}" пайдаланушы аты бос емес')
+        if not email:
+            errors.append('email бос')
+        else:
+            try:
+                validate_email(email)
+            except ValidationError:
+                errors.append(f'"{email}" дұрыс email емес')
+            if email in taken_emails or email in self.seen_emails:
+                errors.append(f'"{email}" email тіркелген')
+
+        role = row.get('role', '').lower() or 'user'
+        if role not in ROLES:
+            errors.append(f'белгісіз рөл "{role}"')
+
+        club_ids = []
+        for token in filter(None, (part.strip() for part in row.get('clubs', '').split(';'))):
+            club_id = self.club_ids.get(token.lower())
+            if club_id is None:
+                errors.append(f'клуб табылмады: "{token}"')
+            elif club_id not in club_ids:
+                club_ids.append(club_id)
+
+        if club_ids and role == 'user' and self.membership_status == 'approved':
+            role = 'member'
+        for name in ('student_id', 'phone'):
+            values[name] = values[name] or None
+        user = CustomUser(role=role, **values)
+
+        password = row.get('password', '')
+        if password and not errors:
+            try:
+                validate_password(password, user)
+            except ValidationError as error:
+                errors.extend(error.messages)
+        return errors, {'user': user, 'password': password, 'club_ids': club_ids}
+
+    def hash_chunk(self, valid, executor):
+        """Парольдерді процестер арасында бөліп хэштеу; пароль жоқтарға пайдаланылмайтын пароль"""
+        entries = [entry for entry in valid if entry['password']]
+        size = max(1, -(-len(entries) // self.workers))
+        batches = [[entry['password'] for entry in entries[start:start + size]] for start in range(0, len(entries), size)]
+        hashes = [value for batch in executor.map(hash_passwords, batches) for value in batch]
+        for entry, value in zip(entries, hashes):
+            entry['user'].password = value
+        for entry in valid:
+            if not entry['password']:
+                entry['user'].password = make_password(None)
+
+    def save_chunk(self, valid):
+        try:
+            with transaction.atomic():
+                users = CustomUser.objects.bulk_create([entry['user'] for entry in valid])
+        except IntegrityError:
+            # Тексеру мен жазу арасында басқа сұрау сол атауды алып қойған
+            users = []
+            for entry in valid:
+                try:
+                    with transaction.atomic():
+                        entry['user'].save()
+                    users.append(entry['user'])
+                except IntegrityError:
+                    self.report.add_error(entry['line'], entry['user'].username, 'пайдаланушы аты немесе email бос емес')
+                    entry['user'].pk = None
+        valid = [entry for entry in valid if entry['user'].pk]
+        if not valid:
+            return
+        self.report.created += len(valid)
+
+        now = timezone.now()
+        approved = self.membership_status == 'approved'
+        memberships = [
+            Membership(
+                user_id=entry['user'].pk,
+                club_id=club_id,
+                status=self.membership_status,
+                approved_at=now if approved else None,
+            )
+            for entry in valid for club_id in entry['club_ids']
+        ]
+        with transaction.atomic():
+            Membership.objects.bulk_create(memberships, batch_size=self.chunk_size)
+            enqueue('feed.backfill_global', user_ids=[entry['user'].pk for entry in valid])
+            if approved:
+                members = defaultdict(list)
+                for membership in memberships:
+                    members[membership.club_id].append(membership.user_id)
+                for club_id, user_ids in members.items():
+                    adjust_member_count(club_id, len(user_ids))
+                    enqueue('feed.backfill_members', user_ids=user_ids, club_id=club_id)
+        self.report.memberships += len(memberships)
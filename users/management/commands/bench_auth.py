@@ -0,0 +1,99 @@
+import random
+import statistics
+import time
+import uuid
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from clubs.benchmark import sample_users
+from clubs.metrics import percentile
+
+SETUPS = {
+    'db': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+    },
+    'cached': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'AUTHENTICATION_BACKENDS': ['users.backends.CachedModelBackend'],
+    },
+}
+
+def auth_queries(queries):
+    """Сессия мен пайдаланушы жолын оқитын сұраулар саны"""
+    session = user = 0
+    for query in queries:
+        sql = query['sql']
+        if 'FROM "django_session"' in sql:
+            session += 1
+        elif sql.startswith('SELECT') and 'FROM "users_customuser" WHERE "users_customuser"."id" =' in sql:
+            user += 1
+    return session, user
+
+def isolated_caches():
+    """Әр өлшеуге жаңа KEY_PREFIX: ортақ кэшті тазаламай-ақ бос кэштен бастау"""
+    prefix = f'bench_auth:{uuid.uuid4().hex}'
+    return {
+        alias: {**config, 'KEY_PREFIX': f'{config.get("KEY_PREFIX", "")}{prefix}'}
+        for alias, config in settings.CACHES.items()
+    }
+
+class Command(BaseCommand):
+    help = 'Сессия мен пайдаланушыны ДҚ-дан және кэштен жүктеуді бірдей беттерде салыстыру'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--urls', default='dashboard,profile,events,notifications,my_clubs')
+        parser.add_argument('--role', default='member')
+        parser.add_argument('--samples', type=int, default=3, help='Неше пайдаланушы')
+        parser.add_argument('--iterations', type=int, default=20, help='Әр URL-ді неше рет сұрау')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        users = sample_users(options['role'], options['samples'], random.Random(options['seed']))
+        if not users:
+            raise CommandError('Пайдаланушы табылмады: алдымен seed_bench арқылы деректер жасаңыз')
+        urls = [reverse(name.strip()) for name in options['urls'].split(',') if name.strip()]
+
+        results = {}
+        for name, overrides in SETUPS.items():
+            with override_settings(
+                ALLOWED_HOSTS=['testserver'], REQUEST_METRICS_ENABLED=False, CACHES=isolated_caches(), **overrides,
+            ):
+                results[name] = self.measure(users, urls, options['iterations'])
+
+        self.stdout.write(f'{"баптау":<8} {"p50 мс":>8} {"p95 мс":>8} {"SQL":>6} {"сессия":>7} {"user":>6}')
+        for name, row in results.items():
+            self.stdout.write(
+                f'{name:<8} {row["p50"]:>8.2f} {row["p95"]:>8.2f} {row["queries"]:>6} {row["session"]:>7} {row["user"]:>6}'
+            )
+        baseline, current = results['db'], results['cached']
+        saved = baseline['queries'] - current['queries']
+        change = (current['p50'] - baseline['p50']) / baseline['p50'] * 100 if baseline['p50'] else 0
+        self.stdout.write(self.style.SUCCESS(f'Сұрау сайын {saved} SQL аз, p50 өзгерісі {change:+.1f}%'))
+
+    def measure(self, users, urls, iterations):
+        latency, totals, sessions, user_loads = [], [], [], []
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            for url in urls:
+                client.get(url)
+                for _ in range(iterations):
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        client.get(url)
+                        latency.append((time.perf_counter() - start) * 1000)
+                    session, user_load = auth_queries(queries.captured_queries)
+                    totals.append(len(queries))
+                    sessions.append(session)
+                    user_loads.append(user_load)
+        return {
+            'p50': percentile(latency, 0.50),
+            'p95': percentile(latency, 0.95),
+            'queries': statistics.median(totals),
+            'session': statistics.median(sessions),
+            'user': statistics.median(user_loads),
+        }
@@ -0,0 +1,52 @@
+import csv
+import time
+from django.core.management.base import BaseCommand, CommandError
+from users.imports import IMPORT_CHUNK_SIZE, IMPORT_HASH_WORKERS, UserImporter, read_rows
+
+class Command(BaseCommand):
+    help = 'CSV/XLSX файлынан пайдаланушыларды бумалап импорттау'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='username,email,first_name,last_name,student_id,phone,role,password,clubs бағандары бар файл')
+        parser.add_argument('--dry-run', action='store_true', help='Тек тексеру, ештеңе жазбау')
+        parser.add_argument('--membership-status', choices=['approved', 'pending'], default='approved')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument('--workers', type=int, default=IMPORT_HASH_WORKERS, help='Пароль хэштейтін процестер саны')
+        parser.add_argument('--errors', help='Қателер есебін жазатын CSV файл')
+
+    def handle(self, *args, **options):
+        importer = UserImporter(
+            dry_run=options['dry_run'],
+            membership_status=options['membership_status'],
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+        )
+        started = time.monotonic()
+
+        def progress(report):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{report.total_rows} жол өңделді, {report.created} құрылды, {report.error_count} қате')
+
+        try:
+            with open(options['path'], 'rb') as f:
+                report = importer.run(read_rows(f, options['path']), progress)
+        except (OSError, ValueError) as error:
+            raise CommandError(str(error))
+
+        if options['errors']:
+            with open(options['errors'], 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=['line', 'username', 'error'])
+                writer.writeheader()
+                writer.writerows(report.errors)
+        elif options['verbosity'] > 0:
+            for error in report.errors[:50]:
+                self.stdout.write(f'{error["line"]}-жол ({error["username"]}): {error["error"]}')
+
+        elapsed = time.monotonic() - started
+        summary = (
+            f'{report.total_rows} жол, {report.created} пайдаланушы, {report.memberships} мүшелік, '
+            f'{report.error_count} қате, {elapsed:.1f} с'
+        )
+        if options['dry_run']:
+            summary = f'Тексеру: {summary} (ештеңе жазылған жоқ)'
+        self.stdout.write(self.style.WARNING(summary) if report.error_count else self.style.SUCCESS(summary))
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Сурет нұсқалары'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-18 15:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_profile_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='imports/', verbose_name='Файл')),
+                ('dry_run', models.BooleanField(default=False, verbose_name='Тек тексеру')),
+                ('membership_status', models.CharField(choices=[('approved', 'Бірден қабылдау'), ('pending', 'Өтініш ретінде')], default='approved', max_length=10, verbose_name='Клуб мүшелігі')),
+                ('status', models.CharField(choices=[('pending', 'Кезекте'), ('running', 'Орындалуда'), ('done', 'Аяқталды'), ('failed', 'Сәтсіз')], default='pending', max_length=10, verbose_name='Мәртебесі')),
+                ('total_rows', models.PositiveIntegerField(default=0, verbose_name='Жолдар саны')),
+                ('created_count', models.PositiveIntegerField(default=0, verbose_name='Құрылған пайдаланушылар')),
+                ('memberships_count', models.PositiveIntegerField(default=0, verbose_name='Құрылған мүшеліктер')),
+                ('error_count', models.PositiveIntegerField(default=0, verbose_name='Қателер саны')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Қателер')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Құрылған уақыты')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Аяқталған уақыты')),
+                ('uploaded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='user_imports', to=settings.AUTH_USER_MODEL, verbose_name='Жүктеген')),
+            ],
+            options={
+                'verbose_name': 'Пайдаланушыларды импорттау',
+                'verbose_name_plural': 'Пайдаланушыларды импорттау',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-18 16:40
+
+import secrets
+
+from django.db import migrations, models
+
+import users.models
+
+
+def populate_calendar_tokens(apps, schema_editor):
+    CustomUser = apps.get_model('users', 'CustomUser')
+    accounts = list(CustomUser.objects.only('pk'))
+    for account in accounts:
+        account.calendar_token = secrets.token_urlsafe(24)
+    CustomUser.objects.bulk_update(accounts, ['calendar_token'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_user_import'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='calendar_token',
+            field=models.CharField(editable=False, max_length=64, null=True, verbose_name='Күнтізбе токені'),
+        ),
+        migrations.RunPython(populate_calendar_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='customuser',
+            name='calendar_token',
+            field=models.CharField(default=users.models.new_calendar_token, editable=False, max_length=64, unique=True, verbose_name='Күнтізбе токені'),
+        ),
+    ]
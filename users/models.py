@@ -1,7 +1,12 @@
+import secrets
+from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
 from django.utils import timezone
 
+def new_calendar_token():
+    return secrets.token_urlsafe(24)
+
 class CustomUserManager(BaseUserManager):
     def create_user(self, username, email, password=None, **extra_fields):
         if not email:
@@ -40,6 +45,8 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     student_id = models.CharField(max_length=20, blank=True, null=True, verbose_name="Студенттік номер")
     phone = models.CharField(max_length=15, blank=True, null=True, verbose_name="Телефон")
     profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True, verbose_name="Профиль суреті")
+    profile_image_renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Сурет нұсқалары")
+    calendar_token = models.CharField(max_length=64, unique=True, default=new_calendar_token, editable=False, verbose_name="Күнтізбе токені")
     
     is_active = models.BooleanField(default=True, verbose_name="Белсенді")
     is_staff = models.BooleanField(default=False, verbose_name="Қызметші")
@@ -70,4 +77,41 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     
     class Meta:
         verbose_name = "Пайдаланушы"
-        verbose_name_plural = "Пайдаланушылар"
\ No newline at end of file
+        verbose_name_plural = "Пайдаланушылар"
+        indexes = [
+            models.Index(fields=['role'], name='user_role_idx'),
+            models.Index(fields=['-date_joined'], name='user_date_joined_idx'),
+        ]
+
+class UserImport(models.Model):
+    STATUS_CHOICES = (
+        ('pending', 'Кезекте'),
+        ('running', 'Орындалуда'),
+        ('done', 'Аяқталды'),
+        ('failed', 'Сәтсіз'),
+    )
+    MEMBERSHIP_STATUS_CHOICES = (
+        ('approved', 'Бірден қабылдау'),
+        ('pending', 'Өтініш ретінде'),
+    )
+    
+    file = models.FileField(upload_to='imports/', verbose_name="Файл")
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='user_imports', verbose_name="Жүктеген")
+    dry_run = models.BooleanField(default=False, verbose_name="Тек тексеру")
+    membership_status = models.CharField(max_length=10, choices=MEMBERSHIP_STATUS_CHOICES, default='approved', verbose_name="Клуб мүшелігі")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name="Мәртебесі")
+    total_rows = models.PositiveIntegerField(default=0, verbose_name="Жолдар саны")
+    created_count = models.PositiveIntegerField(default=0, verbose_name="Құрылған пайдаланушылар")
+    memberships_count = models.PositiveIntegerField(default=0, verbose_name="Құрылған мүшеліктер")
+    error_count = models.PositiveIntegerField(default=0, verbose_name="Қателер саны")
+    errors = models.JSONField(default=list, blank=True, verbose_name="Қателер")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Құрылған уақыты")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Аяқталған уақыты")
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Пайдаланушыларды импорттау"
+        verbose_name_plural = "Пайдаланушыларды импорттау"
+    
+    def __str__(self):
+        return f"{self.file.name} ({self.get_status_display()})"
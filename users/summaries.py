@@ -0,0 +1,120 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from contextvars import copy_context
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from clubs.feed import user_feed
+from clubs.middleware import current_timings
+from clubs.models import Club, Membership, Notification, Event
+from clubs.snapshots import get_user_snapshot
+from .models import CustomUser
+
+# Тұрақты шағын пул: әр ағын бір ғана тұрақты DB қосылымын ұстайды (CONN_MAX_AGE),
+# сондықтан процесс ашатын қосылымдар саны осы санмен шектеледі.
+# 0 — сұраулар сұрау ағынында кезекпен орындалады (тесттер транзакцияны сол ағында ұстайды)
+QUERY_WORKERS = getattr(settings, 'DASHBOARD_QUERY_WORKERS', 4)
+query_executor = ThreadPoolExecutor(max_workers=max(QUERY_WORKERS, 1), thread_name_prefix='dashboard-query')
+
+def run_query(query):
+    """Сұрауды пул ағынында сол ағынның DB қосылымымен орындау"""
+    close_old_connections()
+    timings = current_timings.get()
+    try:
+        with connection.execute_wrapper(timings) if timings else nullcontext():
+            return query()
+    finally:
+        close_old_connections()
+
+def run_inline(queries):
+    """Сұрауларды ағымдағы ағын мен қосылымда кезекпен орындау"""
+    timings = current_timings.get()
+    with connection.execute_wrapper(timings) if timings else nullcontext():
+        return {name: query() for name, query in queries.items()}
+
+async def gather_queries(queries):
+    """Тәуелсіз сұрауларды бір мезгілде орындап, нәтижелерді сол кілттермен қайтару.
+
+    Django-ның async ORM-і барлық сұрауды бір ағында кезекпен орындайды,
+    сондықтан сұраулар query_executor пулының ағындарына таратылады.
+    """
+    if not getattr(settings, 'DASHBOARD_QUERY_WORKERS', QUERY_WORKERS):
+        return await sync_to_async(run_inline)(queries)
+    loop = asyncio.get_running_loop()
+    names = list(queries)
+    results = await asyncio.gather(*(
+        loop.run_in_executor(query_executor, copy_context().run, run_query, queries[name]) for name in names
+    ))
+    return dict(zip(names, results))
+
+class UserSummary:
+    """Қарапайым пайдаланушы дашбордының деректері"""
+
+    template = 'users/dashboard.html'
+
+    def __init__(self, user):
+        self.user = user
+
+    def upcoming_events(self):
+        snapshot = get_user_snapshot(self.user.pk)
+        club_ids = set(snapshot['approved_club_ids']) | set(snapshot['led_club_ids'])
+        return list(
+            Event.objects.filter(club_id__in=club_ids, date__gte=timezone.now())
+            .select_related('club').order_by('date')[:5]
+        )
+
+    def queries(self):
+        user = self.user
+        return {
+            'user_memberships': lambda: list(
+                Membership.objects.filter(user=user, status='approved').select_related('club')
+            ),
+            'pending_applications': lambda: list(
+                Membership.objects.filter(user=user, status='pending').select_related('club')
+            ),
+            'unread_messages': lambda: get_user_snapshot(user.pk)['unread_messages'],
+            'recent_notifications': lambda: user_feed(user, per_page=5).notifications,
+            'upcoming_events': self.upcoming_events,
+        }
+
+    async def context(self):
+        context = await gather_queries(self.queries())
+        context['upcoming_events_count'] = len(context['upcoming_events'])
+        return context
+
+class LeaderSummary(UserSummary):
+    """Лидерге арналған: өз клубтары, мүшелері мен іс-шаралары"""
+
+    def queries(self):
+        user = self.user
+        return {
+            **super().queries(),
+            'led_clubs': lambda: list(Club.objects.filter(leader=user)),
+            'total_members': lambda: Membership.objects.filter(club__leader=user, status='approved').count(),
+            'club_events': lambda: Event.objects.filter(club__leader=user).count(),
+        }
+
+class AdminSummary(UserSummary):
+    """Админге арналған: платформа бойынша жалпы көрсеткіштер"""
+
+    template = 'admin/dashboard.html'
+
+    def queries(self):
+        return {
+            **super().queries(),
+            'total_clubs': lambda: Club.objects.count(),
+            'total_users': lambda: CustomUser.objects.count(),
+            'pending_memberships_count': lambda: Membership.objects.filter(status='pending').count(),
+            'active_notifications': lambda: Notification.objects.filter(is_active=True).count(),
+            'recent_users': lambda: list(CustomUser.objects.order_by('-date_joined')[:5]),
+            'recent_clubs': lambda: list(Club.objects.select_related('leader').order_by('-created_at')[:5]),
+        }
+
+def summary_for(user):
+    if user.is_admin():
+        return AdminSummary(user)
+    if user.is_leader():
+        return LeaderSummary(user)
+    return UserSummary(user)
@@ -0,0 +1,39 @@
+from django.utils import timezone
+from clubs.jobs import job
+from .imports import UserImporter, read_rows
+from .models import UserImport
+
+@job('users.import')
+def import_users(import_id):
+    user_import = UserImport.objects.filter(pk=import_id, status='pending').first()
+    if user_import is None:
+        return
+    UserImport.objects.filter(pk=import_id).update(status='running')
+
+    def progress(report):
+        UserImport.objects.filter(pk=import_id).update(
+            total_rows=report.total_rows,
+            created_count=report.created,
+            memberships_count=report.memberships,
+            error_count=report.error_count,
+        )
+
+    importer = UserImporter(dry_run=user_import.dry_run, membership_status=user_import.membership_status)
+    try:
+        with user_import.file.open('rb') as f:
+            report = importer.run(read_rows(f, user_import.file.name), progress)
+    except ValueError as error:
+        importer.report.add_error(0, '', str(error))
+        status = 'failed'
+    else:
+        status = 'done'
+    report = importer.report
+    UserImport.objects.filter(pk=import_id).update(
+        status=status,
+        total_rows=report.total_rows,
+        created_count=report.created,
+        memberships_count=report.memberships,
+        error_count=report.error_count,
+        errors=report.errors,
+        finished_at=timezone.now(),
+    )
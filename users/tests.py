@@ -1,3 +1,196 @@
-from django.test import TestCase
+import io
+import tempfile
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from clubs.memberships import promote_members
+from clubs.models import Club, Event, Job, Membership, Message
+from .backends import CachedModelBackend, ensure_shared_cache
+from .imports import UserImporter, read_rows
+from .models import CustomUser, UserImport
+from .tasks import import_users
 
-# Create your tests here.
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+def csv_rows(text):
+    return read_rows(io.BytesIO(text.encode('utf-8-sig')), 'users.csv')
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, AUTH_PASSWORD_VALIDATORS=[])
+@mock.patch('users.imports.create_hash_executor', ThreadPoolExecutor)
+class UserImportTests(TestCase):
+    CSV = (
+        'Username,Email,First_name,Password,Role,Clubs\n'
+        'aliya,aliya@example.com,Әлия,Secret-123,,Шахмат\n'
+        'bolat,bolat@example.com,Болат,,leader,\n'
+        'taken,new@example.com,,,,\n'
+        'aliya,other@example.com,,,,\n'
+        'dana,not-an-email,,,,\n'
+        'erlan,erlan@example.com,,,wizard,Жоқ клуб\n'
+    )
+
+    def setUp(self):
+        CustomUser.objects.create_user('taken', 'taken@example.com')
+        self.club = Club.objects.create(name='Шахмат', description='Шахмат клубы')
+
+    def run_import(self, **kwargs):
+        return UserImporter(chunk_size=2, workers=2, **kwargs).run(csv_rows(self.CSV))
+
+    def assert_errors(self, report):
+        self.assertEqual(report.total_rows, 6)
+        self.assertEqual(report.error_count, 4)
+        errors = {error['line']: error['error'] for error in report.errors}
+        self.assertEqual(sorted(errors), [4, 5, 6, 7])
+        self.assertIn('"taken" пайдаланушы аты бос емес', errors[4])
+        self.assertIn('"aliya" пайдаланушы аты бос емес', errors[5])
+        self.assertIn('дұрыс email емес', errors[6])
+        self.assertIn('белгісіз рөл "wizard"', errors[7])
+        self.assertIn('клуб табылмады: "Жоқ клуб"', errors[7])
+
+    def test_dry_run_reports_errors_without_writing(self):
+        report = self.run_import(dry_run=True)
+        self.assert_errors(report)
+        self.assertEqual(report.created, 0)
+        self.assertEqual(CustomUser.objects.count(), 1)
+
+    def test_import_creates_users_and_memberships(self):
+        report = self.run_import()
+        self.assert_errors(report)
+        self.assertEqual((report.created, report.memberships), (2, 1))
+
+        aliya = CustomUser.objects.get(username='aliya')
+        self.assertTrue(aliya.check_password('Secret-123'))
+        self.assertEqual((aliya.first_name, aliya.role), ('Әлия', 'member'))
+        bolat = CustomUser.objects.get(username='bolat')
+        self.assertFalse(bolat.has_usable_password())
+        self.assertEqual(bolat.role, 'leader')
+
+        self.assertEqual(Membership.objects.get(user=aliya).status, 'approved')
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.members_count, 1)
+        self.assertTrue(Job.objects.filter(name='feed.backfill_members').exists())
+
+    def test_pending_memberships_keep_role_and_counter(self):
+        self.run_import(membership_status='pending')
+        aliya = CustomUser.objects.get(username='aliya')
+        self.assertEqual(aliya.role, 'user')
+        self.assertEqual(Membership.objects.get(user=aliya).status, 'pending')
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.members_count, 0)
+
+    def test_rerun_reports_duplicates(self):
+        self.run_import()
+        report = self.run_import()
+        self.assertEqual(report.created, 0)
+        self.assertEqual(report.error_count, 6)
+
+    def test_job_stores_report(self):
+        with tempfile.TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            user_import = UserImport.objects.create(
+                file=SimpleUploadedFile('users.csv', self.CSV.encode()), dry_run=True,
+            )
+            import_users(user_import.pk)
+        user_import.refresh_from_db()
+        self.assertEqual(user_import.status, 'done')
+        self.assertEqual((user_import.total_rows, user_import.error_count), (6, 4))
+        self.assertEqual([error['line'] for error in user_import.errors], [4, 5, 6, 7])
+        self.assertIsNotNone(user_import.finished_at)
+
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.backend = CachedModelBackend()
+        self.user = CustomUser.objects.create_user('aliya', 'aliya@example.com')
+
+    def test_user_is_served_from_cache(self):
+        self.backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.user.pk).role, 'user')
+
+    def test_save_and_role_promotion_invalidate(self):
+        self.backend.get_user(self.user.pk)
+        self.user.role = 'leader'
+        self.user.save()
+        self.assertEqual(self.backend.get_user(self.user.pk).role, 'leader')
+
+        other = CustomUser.objects.create_user('bolat', 'bolat@example.com')
+        self.backend.get_user(other.pk)
+        promote_members([other.pk])
+        self.assertEqual(self.backend.get_user(other.pk).role, 'member')
+
+    def test_deactivated_and_deleted_users_are_rejected(self):
+        self.backend.get_user(self.user.pk)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+        user_id = self.user.pk
+        self.user.delete()
+        self.assertIsNone(self.backend.get_user(user_id))
+
+    def test_session_requests_see_role_change(self):
+        self.client.force_login(self.user)
+        self.client.get('/')
+        CustomUser.objects.filter(pk=self.user.pk).update(role='admin')
+        self.assertEqual(self.client.get('/').wsgi_request.user.role, 'user')
+        self.user.role = 'admin'
+        self.user.save()
+        self.assertEqual(self.client.get('/').wsgi_request.user.role, 'admin')
+
+@override_settings(DASHBOARD_QUERY_WORKERS=0)
+class DashboardSummaryTests(TestCase):
+    def setUp(self):
+        self.leader = CustomUser.objects.create_user('leader', 'leader@example.com', role='leader')
+        self.club = Club.objects.create(name='Шахмат', description='Шахмат клубы', leader=self.leader)
+        other = Club.objects.create(name='Хор', description='Хор клубы')
+        self.member = CustomUser.objects.create_user('member', 'member@example.com', role='member')
+        for index in range(3):
+            user = CustomUser.objects.create_user(f'user{index}', f'user{index}@example.com')
+            Membership.objects.create(user=user, club=self.club, status='approved' if index else 'pending')
+        Membership.objects.create(user=self.member, club=self.club, status='approved')
+        Membership.objects.create(user=self.member, club=other, status='pending')
+        for days in (-1, 3):
+            Event.objects.create(
+                title='Турнир', description='Турнир', club=self.club, location='Зал',
+                date=timezone.now() + timedelta(days=days),
+            )
+        Message.objects.create(sender=self.leader, receiver=self.member, subject='Сәлем', content='Мәтін')
+
+    def dashboard(self, user):
+        self.client.force_login(user)
+        return self.client.get(reverse('dashboard')).context
+
+    def test_member_summary(self):
+        context = self.dashboard(self.member)
+        self.assertEqual([m.club for m in context['user_memberships']], [self.club])
+        self.assertEqual([m.club.name for m in context['pending_applications']], ['Хор'])
+        self.assertEqual(context['unread_messages'], 1)
+        self.assertEqual(context['upcoming_events_count'], 1)
+
+    def test_leader_summary(self):
+        context = self.dashboard(self.leader)
+        self.assertEqual(context['led_clubs'], [self.club])
+        self.assertEqual(context['total_members'], 3)
+        self.assertEqual(context['club_events'], 2)
+        self.assertEqual(context['upcoming_events_count'], 1)
+        self.assertEqual(context['unread_messages'], 0)
+
+    def test_admin_summary(self):
+        admin = CustomUser.objects.create_user('admin', 'admin@example.com', role='admin')
+        context = self.dashboard(admin)
+        self.assertEqual(context['total_clubs'], 2)
+        self.assertEqual(context['total_users'], 6)
+        self.assertEqual(context['pending_memberships_count'], 2)
+        self.assertEqual(context['recent_users'][0], admin)
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_process_local_cache_is_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ensure_shared_cache()
+        with self.settings(AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend']):
+            ensure_shared_cache()
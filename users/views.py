@@ -1,13 +1,18 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.contrib.auth.forms import AuthenticationForm
-from django.db.models import Q
-from django.utils import timezone
-from .models import CustomUser
-from .forms import CustomUserCreationForm, UserUpdateForm, AdminUserUpdateForm
-from clubs.models import Club, Membership, Message, Notification, Event
+from .models import CustomUser, UserImport, new_calendar_token
+from .forms import CustomUserCreationForm, UserUpdateForm, AdminUserUpdateForm, UserImportForm
+from .summaries import summary_for
+from clubs.calendars import forget_token
+from clubs.exports import export_response, filter_users
+from clubs.jobs import enqueue
+from clubs.models import Membership, Message
+from clubs.routers import replica_safe
 
 def is_admin(user):
     return user.is_authenticated and user.is_admin()
@@ -60,79 +65,11 @@ def user_logout(request):
     return redirect('home')
 
 @login_required
-def dashboard(request):
-    user = request.user
-    
-    user_memberships = Membership.objects.filter(user=user, status='approved')
-    pending_applications = Membership.objects.filter(user=user, status='pending')
-    unread_messages = Message.objects.filter(receiver=user, is_read=False).count()
-
-    user_clubs = Club.objects.filter(
-        Q(members__user=user, members__status='approved') |
-        Q(leader=user)
-    ).distinct()
-    
-    recent_notifications = Notification.objects.filter(
-        Q(club__in=user_clubs) | Q(club=None)
-    ).filter(is_active=True).order_by('-created_at')[:5]
-    
-    upcoming_events = Event.objects.filter(
-        club__in=user_clubs,
-        date__gte=timezone.now()
-    ).order_by('date')[:5]
-    
-    if user.is_admin():
-        total_clubs = Club.objects.count()
-        total_users = CustomUser.objects.count()
-        pending_memberships_count = Membership.objects.filter(status='pending').count()
-        active_notifications = Notification.objects.filter(is_active=True).count()
-        
-        context = {
-            'total_clubs': total_clubs,
-            'total_users': total_users,
-            'pending_memberships_count': pending_memberships_count,
-            'active_notifications': active_notifications,
-            'recent_users': CustomUser.objects.order_by('-date_joined')[:5],
-            'recent_clubs': Club.objects.order_by('-created_at')[:5],
-            'user_memberships': user_memberships,
-            'pending_applications': pending_applications,
-            'unread_messages': unread_messages,
-            'recent_notifications': recent_notifications,
-            'upcoming_events': upcoming_events,
-            'upcoming_events_count': upcoming_events.count(),
-        }
-        template = 'admin/dashboard.html'
-    
-    elif user.is_leader():
-        led_clubs = Club.objects.filter(leader=user)
-        total_members = Membership.objects.filter(club__leader=user, status='approved').count()
-        club_events = Event.objects.filter(club__leader=user).count()
-        
-        context = {
-            'led_clubs': led_clubs,
-            'total_members': total_members,
-            'club_events': club_events,
-            'user_memberships': user_memberships,
-            'pending_applications': pending_applications,
-            'unread_messages': unread_messages,
-            'recent_notifications': recent_notifications,
-            'upcoming_events': upcoming_events,
-            'upcoming_events_count': upcoming_events.count(),
-        }
-        template = 'users/dashboard.html'  
-    
-    else:
-        context = {
-            'user_memberships': user_memberships,
-            'pending_applications': pending_applications,
-            'unread_messages': unread_messages,
-            'recent_notifications': recent_notifications,
-            'upcoming_events': upcoming_events,
-            'upcoming_events_count': upcoming_events.count(),
-        }
-        template = 'users/dashboard.html'
-    
-    return render(request, template, context)
+async def dashboard(request):
+    user = await request.auser()
+    summary = summary_for(user)
+    context = await summary.context()
+    return await sync_to_async(render)(request, summary.template, context)
 
 @login_required
 def profile(request):
@@ -150,13 +87,24 @@ def profile(request):
     return render(request, 'users/profile.html', {
         'form': form,
         'user_memberships': user_memberships,
+        'calendar_url': request.build_absolute_uri(reverse('user_calendar', args=[request.user.calendar_token])),
     })
 
+@login_required
+def reset_calendar_token(request):
+    if request.method == 'POST':
+        forget_token(request.user.calendar_token)
+        request.user.calendar_token = new_calendar_token()
+        request.user.save(update_fields=['calendar_token'])
+        messages.success(request, 'Күнтізбе сілтемесі жаңартылды. Ескі сілтеме енді жұмыс істемейді')
+    return redirect('profile')
+
 @login_required
 @user_passes_test(is_admin)
-def admin_dashboard(request):
-    return dashboard(request)
+async def admin_dashboard(request):
+    return await dashboard(request)
 
+@replica_safe
 @login_required
 @user_passes_test(is_admin)
 def user_management(request):
@@ -164,24 +112,7 @@ def user_management(request):
     role_filter = request.GET.get('role', '')
     active_filter = request.GET.get('active', '')
     
-    users = CustomUser.objects.all()
-    
-    if search_query:
-        users = users.filter(
-            Q(username__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query)
-        )
-    
-    if role_filter:
-        users = users.filter(role=role_filter)
-    
-    if active_filter == 'active':
-        users = users.filter(is_active=True)
-    elif active_filter == 'inactive':
-        users = users.filter(is_active=False)
-    
+    users = filter_users(CustomUser.objects.all(), search_query, role_filter, active_filter)
     users = users.order_by('-date_joined')
     
     return render(request, 'admin/user_management.html', {
@@ -191,6 +122,11 @@ def user_management(request):
         'active_filter': active_filter,
     })
 
+@login_required
+@user_passes_test(is_admin)
+def export_users(request):
+    return export_response(request, 'users', request.GET, 'users')
+
 @login_required
 @user_passes_test(is_admin)
 def user_detail(request, user_id):
@@ -230,6 +166,33 @@ def create_user(request):
     
     return render(request, 'admin/create_user.html', {'form': form})
 
+@login_required
+@user_passes_test(is_admin)
+def import_users(request):
+    if request.method == 'POST':
+        form = UserImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            user_import = form.save(commit=False)
+            user_import.uploaded_by = request.user
+            user_import.save()
+            # Қайталау жартылай импортталған файлды қайта өңдеп, қателер шығарар еді
+            enqueue('users.import', max_attempts=1, import_id=user_import.pk)
+            messages.success(request, 'Файл жүктелді, импорт фондық режимде орындалады')
+            return redirect('import_detail', import_id=user_import.pk)
+    else:
+        form = UserImportForm()
+    
+    return render(request, 'admin/import_users.html', {
+        'form': form,
+        'imports': UserImport.objects.select_related('uploaded_by').defer('errors')[:20],
+    })
+
+@login_required
+@user_passes_test(is_admin)
+def import_detail(request, import_id):
+    user_import = get_object_or_404(UserImport, pk=import_id)
+    return render(request, 'admin/import_detail.html', {'user_import': user_import})
+
 @login_required
 @user_passes_test(is_admin)
 def delete_user(request, user_id):